@@ -0,0 +1,274 @@
+""" Benchmark suite for the Bintray client, running against the fake Bintray server
+
+    Measures requests per second and p50/p95/p99 latency per endpoint, throughput and peak
+    memory of uploads and downloads, and startup time.
+
+    Usage:
+
+        python -m benchmarks.run                # run and print results
+        python -m benchmarks.run --save         # store results as the new baseline
+        python -m benchmarks.run --compare      # compare with the baseline, exit 1 on regression
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from concurrent.futures import ThreadPoolExecutor
+
+from bintray.bintray import Bintray
+from bintray.fake_server import FakeBintray
+
+# Baseline stored with the repository
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Metrics where a higher value is better. Any other metric is better when lower
+HIGHER_IS_BETTER = ("requests_per_second", "bytes_per_second")
+
+SUBJECT = "benchmark"
+REPO = "generic"
+PACKAGE = "package"
+VERSION = "1.0"
+
+
+def percentile(samples, percent):
+    """ Compute a percentile by nearest rank
+
+    :param samples: list of values
+    :param percent: percentile, from 0 to 100
+    :return: value at the percentile
+    """
+    ordered = sorted(samples)
+    index = max(0, int(round(percent / 100.0 * len(ordered))) - 1)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def measure_requests(function, count, workers):
+    """ Call a function many times, measuring its throughput and latency
+
+    :param function: function(index) performing a single request
+    :param count: number of calls
+    :param workers: number of concurrent callers
+    :return: requests per second and latency percentiles in milliseconds
+    """
+    def timed(index):
+        start = time.perf_counter()
+        function(index)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        latencies = list(executor.map(timed, range(count)))
+    elapsed = time.perf_counter() - start
+    return {"requests_per_second": count / elapsed,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000}
+
+
+def measure_transfer(function, size):
+    """ Run a transfer once, measuring its throughput and peak memory allocated by Python
+
+        The fake server runs in the same process, so its allocations are part of the peak.
+
+    :param function: function() performing the transfer
+    :param size: amount of bytes transferred
+    :return: bytes per second and peak memory in bytes
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        function()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"bytes_per_second": size / elapsed, "peak_memory_bytes": peak}
+
+
+def bench_endpoints(bintray, server, count, workers):
+    """ Measure JSON endpoints
+
+    :param bintray: Bintray client
+    :param server: FakeBintray serving the client
+    :param count: number of requests per endpoint
+    :param workers: number of concurrent callers
+    :return: results per endpoint
+    """
+    for index in range(100):
+        server.add_file(SUBJECT, REPO, PACKAGE, VERSION, "files/{}.txt".format(index),
+                        b"x" * index)
+
+    def create_delete_package(index):
+        name = "temporary-{}".format(index)
+        bintray.create_package(SUBJECT, REPO, name)
+        bintray.delete_package(SUBJECT, REPO, name)
+
+    return {
+        "get_package": measure_requests(
+            lambda index: bintray.get_package(SUBJECT, REPO, PACKAGE), count, workers),
+        "get_version_files": measure_requests(
+            lambda index: bintray.get_version_files(SUBJECT, REPO, PACKAGE, VERSION),
+            count, workers),
+        "search_file_by_name": measure_requests(
+            lambda index: bintray.search_file_by_name("*.txt", SUBJECT, REPO), count,
+            workers),
+        "create_delete_package": measure_requests(create_delete_package, count // 2 or 1,
+                                                  workers),
+    }
+
+
+def bench_transfers(bintray, size):
+    """ Measure uploads and downloads of a single file
+
+    :param bintray: Bintray client
+    :param size: file size in bytes
+    :return: results per transfer mode
+    """
+    temp_dir = tempfile.mkdtemp()
+    local_file_path = os.path.join(temp_dir, "upload.bin")
+    with open(local_file_path, 'wb') as local_fd:
+        local_fd.write(os.urandom(size))
+    download_path = os.path.join(temp_dir, "download.bin")
+
+    results = {
+        "upload_content": measure_transfer(
+            lambda: bintray.upload_content(SUBJECT, REPO, PACKAGE, VERSION, "upload.bin",
+                                           local_file_path, override=True), size),
+        "download_content_stream": measure_transfer(
+            lambda: bintray.download_content(SUBJECT, REPO, "upload.bin", download_path,
+                                             stream=True), size),
+        "download_content_segments": measure_transfer(
+            lambda: bintray.download_content(SUBJECT, REPO, "upload.bin", download_path,
+                                             segments=4), size),
+    }
+    for path in (local_file_path, download_path):
+        os.remove(path)
+    os.rmdir(temp_dir)
+    return results
+
+
+def bench_startup():
+    """ Measure the time to import the client in a new interpreter, and to create a client
+
+    :return: startup times in milliseconds
+    """
+    start = time.perf_counter()
+    subprocess.check_call([sys.executable, "-c", "import bintray.bintray"])
+    import_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    Bintray().close()
+    client_ms = (time.perf_counter() - start) * 1000
+    return {"startup": {"import_ms": import_ms, "client_ms": client_ms}}
+
+
+def run(count=500, workers=4, size=32 * 1024 * 1024, latency=0.0, bandwidth=None):
+    """ Run all benchmarks against a new fake Bintray server
+
+    :param count: number of requests per endpoint
+    :param workers: number of concurrent callers
+    :param size: file size of transfers in bytes
+    :param latency: seconds added by the server to every request
+    :param bandwidth: maximum bytes per second of the server
+    :return: results per benchmark
+    """
+    results = bench_startup()
+    with FakeBintray(latency=latency, bandwidth=bandwidth) as server:
+        with Bintray(configuration=server.get_configuration(pool_maxsize=workers)) as bintray:
+            bintray._logger.disabled = True
+            results.update(bench_endpoints(bintray, server, count, workers))
+            results.update(bench_transfers(bintray, size))
+    return results
+
+
+def median_results(runs):
+    """ Merge the results of repeated runs, keeping the median of every metric
+
+    :param runs: list of results per benchmark
+    :return: results per benchmark
+    """
+    return {name: {metric: percentile([result[name][metric] for result in runs], 50)
+                   for metric in metrics}
+            for name, metrics in runs[0].items()}
+
+
+def compare(results, baseline, threshold):
+    """ Compare results with a baseline
+
+    :param results: results per benchmark
+    :param baseline: baseline results per benchmark
+    :param threshold: relative change considered a regression, e.g. 0.2 for 20%
+    :return: list of (benchmark, metric, baseline value, current value, relative change,
+             regression)
+    """
+    rows = []
+    for name, metrics in sorted(results.items()):
+        for metric, value in sorted(metrics.items()):
+            previous = baseline.get(name, {}).get(metric)
+            if not previous:
+                continue
+            change = (value - previous) / previous
+            if metric in HIGHER_IS_BETTER:
+                regression = change < -threshold
+            else:
+                regression = change > threshold
+            rows.append((name, metric, previous, value, change, regression))
+    return rows
+
+
+def _environment():
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "machine": platform.machine(), "cpu_count": os.cpu_count()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Bintray client")
+    parser.add_argument("--count", type=int, default=500, help="requests per endpoint")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent callers")
+    parser.add_argument("--size", type=int, default=32 * 1024 * 1024,
+                        help="file size of transfers in bytes")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds added by the server to every request")
+    parser.add_argument("--bandwidth", type=int, default=None,
+                        help="maximum bytes per second of the server")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs whose median is reported, to reduce noise")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file path")
+    parser.add_argument("--save", action="store_true", help="store results as the baseline")
+    parser.add_argument("--compare", action="store_true", help="compare with the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative change considered a regression")
+    args = parser.parse_args()
+
+    results = median_results([run(args.count, args.workers, args.size, args.latency,
+                                  args.bandwidth) for _ in range(max(1, args.repeat))])
+    for name, metrics in sorted(results.items()):
+        print("{:<28} {}".format(name, ", ".join("{}={:.2f}".format(metric, value)
+                                                 for metric, value in sorted(metrics.items()))))
+
+    if args.save:
+        with open(args.baseline, 'w') as baseline_fd:
+            json.dump({"environment": _environment(), "results": results}, baseline_fd,
+                      indent=2, sort_keys=True)
+        print("Baseline saved: {}".format(args.baseline))
+
+    if args.compare:
+        with open(args.baseline) as baseline_fd:
+            baseline = json.load(baseline_fd)
+        rows = compare(results, baseline["results"], args.threshold)
+        print("\nCompared with {} ({})".format(args.baseline, baseline["environment"]["platform"]))
+        for name, metric, previous, value, change, regression in rows:
+            print("{:<28} {:<20} {:>14.2f} {:>14.2f} {:>+8.1%}{}".format(
+                name, metric, previous, value, change, "  REGRESSION" if regression else ""))
+        if any(row[-1] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
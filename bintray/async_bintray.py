@@ -0,0 +1,398 @@
+""" Asynchronous Python Wrapper for Bintray API
+
+    https://bintray.com/docs/api
+"""
+import asyncio
+import functools
+import inspect
+import os
+import time
+
+from requests.utils import super_len
+
+from bintray.async_requester import AsyncRequester
+from bintray.bintray import Bintray
+from bintray.configuration import Configuration
+from bintray.streams import Digest, ProgressReader
+from bintray.utils import remove_file
+
+
+class AsyncBintray(Bintray):
+    """ Asynchronous Python Wrapper for Bintray API
+
+        Provides the same methods and signatures of Bintray, as coroutines:
+
+            async with AsyncBintray() as bintray:
+                packages = await asyncio.gather(*[bintray.get_package(subject, repo, package)
+                                                  for package in packages])
+
+        Paginated iterators (iter_*) return asynchronous generators:
+
+            async for package in bintray.iter_packages(subject, repo):
+                print(package["name"])
+
+        Requires aiohttp: pip install bintray-python[async]
+    """
+
+    @staticmethod
+    def _default_configuration():
+        """ Create the configuration used when none is passed, allowing more connections
+
+        :return: Configuration
+        """
+        return Configuration(pool_maxsize=100)
+
+    def _create_requester(self):
+        """ Create the asynchronous requester sending all HTTP requests of this client
+
+        :return: AsyncRequester
+        """
+        return AsyncRequester(self._username, self._password,
+                              base_urls=(self._api_url, self._download_url),
+                              **self._configuration.get_requester_arguments())
+
+    async def close(self):
+        """ Release all pooled connections held by this client
+        """
+        await self._requester.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _paginate(self, method, url, params=None, json=None, prefetch=False):
+        """ Iterate over all items of a paginated resource, requesting pages lazily
+
+        :param method: HTTP method
+        :param url: URL Address
+        :param params: URL parameters
+        :param json: JSON content
+        :param prefetch: request the next page while the current one is consumed
+        :return: asynchronous generator of items
+        """
+        params = dict(params or {})
+
+        def fetch(start_position):
+            params["start_pos"] = start_position
+            return self._requester.page(method, url, params=dict(params), json=json)
+
+        items, headers = await fetch(int(params.get("start_pos") or 0))
+        while True:
+            next_position = self._next_position(items, headers)
+            future = None
+            if prefetch and next_position is not None:
+                future = asyncio.ensure_future(fetch(next_position))
+            try:
+                for item in items:
+                    yield item
+            except BaseException:
+                if future:
+                    future.cancel()
+                raise
+            if next_position is None:
+                break
+            items, headers = await (future or fetch(next_position))
+
+    async def _upload(self, url, local_file_path, params=None, headers=None,
+                      progress_callback=None, checksums=False):
+        """ Upload content with PUT method
+
+        :param url: destination URL
+        :param local_file_path: file path, readable file object or iterable of bytes chunks
+        :param params: URL parameters
+        :param headers: Request headers
+        :param progress_callback: function(bytes_sent, total_bytes, bytes_per_second)
+        :param checksums: add SHA-1 and SHA-256 of the sent content to the response
+        :return: Request response
+        """
+        digest = Digest() if checksums else None
+        if isinstance(local_file_path, (str, os.PathLike)):
+            with open(local_file_path, 'rb') as file_content:
+                response = await self._upload_content(url, file_content, params, headers,
+                                                      progress_callback, digest)
+        else:
+            response = await self._upload_content(url, local_file_path, params, headers,
+                                                  progress_callback, digest)
+
+        self._logger.info("Upload successfully: {}".format(url))
+        if digest is not None:
+            self._add_checksums(response, digest)
+        return response
+
+    async def _upload_content(self, url, content, params, headers, progress_callback, digest):
+        """ Send upload content, adapting file objects and iterables to aiohttp
+
+        :param url: destination URL
+        :param content: readable file object, bytes or iterable of bytes chunks
+        :param params: URL parameters
+        :param headers: Request headers
+        :param progress_callback: function(bytes_sent, total_bytes, bytes_per_second)
+        :param digest: Digest fed with the content while it is sent
+        :return: Request response
+        """
+        data = self._track_upload(content, progress_callback, digest)
+        if isinstance(data, ProgressReader) and data.len is not None:
+            headers = dict(headers or {}, **{"Content-Length": str(super_len(data))})
+        elif not isinstance(data, bytes) and not hasattr(data, "read"):
+            data = _iterate_async(data)
+        return await self._requester.put(url, params=params, data=data, headers=headers)
+
+    async def upload_content_bulk(self, subject, repo, package, version, files,
+                                  remote_prefix=None, max_workers=8, publish=True,
+                                  override=False, explode=False, skip_unchanged=False):
+        """ Upload many files concurrently, with package and version information.
+
+        :param subject: username or organization
+        :param repo: repository name
+        :param package: package name
+        :param version: package version
+        :param files: local directory, or list of (local file path, remote file path)
+        :param remote_prefix: remote directory prepended to each remote file path
+        :param max_workers: maximum number of concurrent uploads
+        :param publish: publish after uploading all files
+        :param override: override remote files
+        :param explode: explode remote files
+        :param skip_unchanged: do not upload files with same SHA-1 of remote files
+        :return: per-file results, aggregate summary and publish response
+        """
+        files = self._collect_upload_files(files, remote_prefix)
+        semaphore = asyncio.Semaphore(max_workers)
+        remote_checksums = {}
+        local_checksums = {}
+        if skip_unchanged:
+            remote_checksums = await self._get_remote_checksums(subject, repo, package, version)
+            local_checksums = await asyncio.get_running_loop().run_in_executor(
+                None, self._get_local_checksums, files, remote_checksums)
+
+        async def upload(local_file_path, remote_file_path):
+            async with semaphore:
+                try:
+                    if self._is_unchanged(local_file_path, remote_file_path, local_checksums,
+                                          remote_checksums):
+                        return self._upload_result(local_file_path, remote_file_path,
+                                                   skipped=True)
+                    response = await self.upload_content(subject, repo, package, version,
+                                                         remote_file_path, local_file_path,
+                                                         publish=False, override=override,
+                                                         explode=explode)
+                except Exception as error:
+                    self._logger.warning("Could not upload {}: {}".format(local_file_path,
+                                                                          error))
+                    return self._upload_result(local_file_path, remote_file_path, error=error)
+                return self._upload_result(local_file_path, remote_file_path, response)
+
+        start = time.monotonic()
+        results = await asyncio.gather(*[upload(*paths) for paths in files])
+        summary = self._summarize_uploads(results, time.monotonic() - start)
+
+        publish_response = None
+        if publish and summary["total"] and not summary["failed"]:
+            publish_response = await self.publish_uploaded_content(subject, repo, package,
+                                                                   version)
+        return {"files": results, "summary": summary, "publish": publish_response}
+
+    async def _get_remote_checksums(self, subject, repo, package, version):
+        """ Retrieve SHA-1 checksums of all files in a version, including unpublished files
+
+            The listing decides which files are skipped, so it is always requested from the
+            server, bypassing the response cache.
+
+        :param subject: username or organization
+        :param repo: repository name
+        :param package: package name
+        :param version: package version
+        :return: dict with remote file path and SHA-1
+        """
+        url = "{}/packages/{}/{}/{}/versions/{}/files".format(self._api_url, subject, repo,
+                                                              package, version)
+        try:
+            files, _ = await self._requester.page("GET", url, params={"include_unpublished": 1})
+        except Exception as error:
+            self._logger.warning("Could not list version files: {}".format(error))
+            return {}
+        return self._checksums_by_path(files)
+
+    async def _download(self, url, local_file_path, params=None, stream=False, chunk_size=None,
+                        segments=1, resume=False, sha1=None, checksums=False):
+        """ Download a file to local storage, buffering or streaming its content
+
+        :param url: file URL
+        :param local_file_path: file name to be stored in local storage
+        :param params: URL parameters
+        :param stream: write content in bounded chunks instead of loading it in memory
+        :param chunk_size: amount of bytes written per chunk when streaming
+        :param segments: number of concurrent HTTP Range requests
+        :param resume: continue a previous interrupted download
+        :param sha1: expected SHA-1, used to verify the file and to look up the content store
+        :param checksums: add SHA-1 and SHA-256 of the downloaded content to the response
+        :return: request response
+        """
+        digest = self._create_download_digest(sha1, checksums)
+        if self._fetch_from_store(local_file_path, sha1):
+            response = self._content_store_response()
+            if checksums:
+                digest.update_file(local_file_path)
+                self._add_checksums(response, digest)
+            return response
+        if not resume:
+            remove_file(local_file_path)
+        if resume:
+            response = await self._download_resume(url, local_file_path, params=params,
+                                                   chunk_size=chunk_size, digest=digest)
+        elif segments > 1:
+            response = await self._download_segments(url, local_file_path, segments,
+                                                     params=params, chunk_size=chunk_size,
+                                                     digest=digest)
+        elif stream:
+            response = await self._requester.download_file(url, local_file_path, params=params,
+                                                            chunk_size=chunk_size, digest=digest)
+        else:
+            response, content = await self._requester.download(url, params=params)
+            with open(local_file_path, 'wb') as local_fd:
+                local_fd.write(content)
+            if digest is not None:
+                digest.update(content)
+
+        self._verify_download(local_file_path, sha1, digest)
+        self._logger.info("Download successfully: {}".format(url))
+        if checksums:
+            self._add_checksums(response, digest)
+        return response
+
+    async def _download_segments(self, url, local_file_path, segments, params=None,
+                                 chunk_size=None, digest=None):
+        """ Download a file splitting it into HTTP Range segments fetched concurrently
+
+        :param url: file URL
+        :param local_file_path: file name to be stored in local storage
+        :param segments: number of concurrent HTTP Range requests
+        :param params: URL parameters
+        :param chunk_size: amount of bytes written per chunk
+        :param digest: Digest fed with the downloaded content
+        :return: request response, with status 200 once the whole file is assembled
+        """
+        headers = await self._requester.head(url, params=params)
+        segments_path = local_file_path + Bintray.SEGMENTS_SUFFIX
+        plan = self._plan_segments(headers, segments_path, segments)
+        if not plan:
+            return await self._requester.download_file(url, local_file_path, params=params,
+                                                       chunk_size=chunk_size, digest=digest)
+
+        tasks = [asyncio.ensure_future(self._requester.download_file(
+                     url, segments_path, params=params, chunk_size=chunk_size,
+                     headers=range_headers, offset=offset))
+                 for offset, range_headers in plan]
+        try:
+            await asyncio.gather(*tasks)
+        except Exception:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            remove_file(segments_path)
+            raise
+        os.replace(segments_path, local_file_path)
+        if digest is not None:
+            await asyncio.get_running_loop().run_in_executor(None, digest.update_file,
+                                                             local_file_path)
+        return self._requester.create_response(200)
+
+    async def _download_resume(self, url, local_file_path, params=None, chunk_size=None,
+                               digest=None):
+        """ Download a file continuing from a partial local copy, when it is still valid
+
+        :param url: file URL
+        :param local_file_path: file name to be stored in local storage
+        :param params: URL parameters
+        :param chunk_size: amount of bytes written per chunk
+        :param digest: Digest fed with the downloaded content
+        :return: request response, with status 200 once the whole file is downloaded
+        """
+        headers = await self._requester.head(url, params=params)
+        state_path, size, offset, range_headers = self._plan_resume(url, headers,
+                                                                    local_file_path)
+        if digest is not None and offset:
+            digest.update_file(local_file_path, size=offset)
+        if offset and offset == size:
+            response = self._requester.create_response(200)
+        elif offset:
+            self._logger.info("Resume download from byte {}: {}".format(offset, url))
+            await self._requester.download_file(url, local_file_path, params=params,
+                                                chunk_size=chunk_size, headers=range_headers,
+                                                offset=offset, digest=digest)
+            response = self._requester.create_response(200)
+        else:
+            response = await self._requester.download_file(url, local_file_path, params=params,
+                                                           chunk_size=chunk_size, digest=digest)
+        os.remove(state_path)
+        return response
+
+    async def download_package_download_log_file(self, subject, repo, package, remote_log_name,
+                                                 local_log_name):
+        """ Download the package download log file specified by log_name
+
+        :param subject: repository owner
+        :param repo: repository name
+        :param package: package name
+        :param remote_log_name: log to be downloaded
+        :param local_log_name: log to be saved in local storage
+        """
+        url = "{}/packages/{}/{}/{}/logs/{}".format(self._api_url, subject, repo, package,
+                                                    remote_log_name)
+        content = await self._requester.download(url, add_status_code=False)
+        with open(local_log_name, 'wb') as local_fd:
+            local_fd.write(content)
+        self._logger.info("Download successfully")
+
+
+async def _iterate_async(iterable):
+    """ Adapt an iterable of bytes chunks to an asynchronous generator, as expected by aiohttp
+
+    :param iterable: iterable of bytes chunks
+    :return: asynchronous generator of bytes chunks
+    """
+    for chunk in iterable:
+        yield chunk
+
+
+class _DeferredLogger(object):
+    """ Logger recording messages, so they are only emitted once the request succeeded
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.records.append((name, args, kwargs))
+
+
+def _coroutine(method):
+    """ Wrap a Bintray method as a coroutine, awaiting the requester result
+
+        Bintray methods log their outcome before the requester result is awaited, so those
+        messages are deferred until the result is available, and dropped when it fails.
+
+    :param method: Bintray method
+    :return: coroutine function with the same name and signature
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        logger, self._logger = self._logger, _DeferredLogger()
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            deferred_logger, self._logger = self._logger, logger
+        if inspect.isawaitable(result):
+            result = await result
+        for name, log_args, log_kwargs in deferred_logger.records:
+            getattr(logger, name)(*log_args, **log_kwargs)
+        return result
+    return wrapper
+
+
+# iter_* methods return the asynchronous generator from AsyncBintray._paginate as they are
+for _name, _method in list(vars(Bintray).items()):
+    if not _name.startswith(("_", "iter_")) and inspect.isfunction(_method) and \
+            _name not in vars(AsyncBintray):
+        setattr(AsyncBintray, _name, _coroutine(_method))
@@ -0,0 +1,384 @@
+import asyncio
+import time
+
+import requests
+
+from requests.structures import CaseInsensitiveDict
+
+from bintray.json_backend import loads
+from bintray.requester import Requester
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncRequester(Requester):
+    """ Asynchronous version of Requester, based on aiohttp
+
+        Responses are converted to Requests responses, so status and error handling are shared
+        with Requester. Connections are pooled by a single aiohttp session, created on the first
+        request, inside the running event loop.
+    """
+
+    def __init__(self, username=None, api_key=None, pool_connections=10, pool_maxsize=10,
+                 keep_alive=True, retry=None, rate_limiter=None, cache=None, coalesce=False,
+                 wrap_responses=False, metrics=None, connect_timeout=Requester.CONNECT_TIMEOUT,
+                 read_timeout=Requester.READ_TIMEOUT, deadline=None, base_urls=None):
+        """ Initialize arguments for login
+
+        :param username: Bintray username
+        :param api_key: Bintray API Key
+        :param pool_connections: number of hosts with cached connections
+        :param pool_maxsize: maximum number of connections kept alive per host
+        :param keep_alive: reuse TCP/TLS connections between requests
+        :param retry: RetryPolicy applied to every request. Default: no retry
+        :param rate_limiter: RateLimiter applied to every request. Default: unlimited
+        :param cache: cache for GET responses e.g. MemoryCache. Default: no cache
+        :param coalesce: share a single HTTP call between concurrent identical GET requests
+        :param wrap_responses: return Response objects instead of updating JSON payloads
+        :param metrics: Metrics recording every request. Default: disabled
+        :param connect_timeout: seconds to wait for a connection, or None to wait forever
+        :param read_timeout: seconds to wait between bytes received, or None to wait forever
+        :param deadline: seconds available for each call, including retries. Default: none
+        :param base_urls: base URLs of the API and downloads, whose paths are removed before
+                          computing cache paths, rate limit families and metric templates
+        """
+        if aiohttp is None:
+            raise Exception("AsyncRequester requires aiohttp: pip install bintray-python[async]")
+        super(AsyncRequester, self).__init__(username, api_key, retry=retry,
+                                             rate_limiter=rate_limiter, cache=cache,
+                                             coalesce=coalesce, wrap_responses=wrap_responses,
+                                             metrics=metrics, connect_timeout=connect_timeout,
+                                             read_timeout=read_timeout, deadline=deadline,
+                                             base_urls=base_urls)
+        self._connector_args = {"limit": pool_connections * pool_maxsize,
+                                "limit_per_host": pool_maxsize,
+                                "force_close": not keep_alive}
+
+    @staticmethod
+    def _create_session(pool_connections, pool_maxsize, keep_alive):
+        """ The aiohttp session is only created inside the running event loop
+
+        :return: None
+        """
+        return None
+
+    def _get_session(self):
+        """ Retrieve the pooled aiohttp session, creating it on the first call
+
+        :return: aiohttp session
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(**self._connector_args))
+        return self._session
+
+    @staticmethod
+    def _get_remaining(expires):
+        """ Compute the time left before a deadline
+
+        :param expires: monotonic time of the deadline, or None
+        :return: seconds left, or None when there is no deadline
+        """
+        if expires is None:
+            return None
+        remaining = expires - time.monotonic()
+        if remaining <= 0:
+            raise asyncio.TimeoutError("Deadline exceeded")
+        return remaining
+
+    def _get_timeout(self, expires=None):
+        """ Retrieve the timeout of an attempt, as expected by aiohttp
+
+            The time left before the deadline bounds the whole attempt, including reading the
+            response body.
+
+        :param expires: monotonic time of the deadline, or None
+        :return: ClientTimeout
+        """
+        return aiohttp.ClientTimeout(total=self._get_remaining(expires),
+                                     sock_connect=self._connect_timeout,
+                                     sock_read=self._read_timeout)
+
+    def _get_authentication(self):
+        """ Retrieve Basic HTTP Authentication based on username and API key
+
+        :return: Basic Authentication handler
+        """
+        if not self._username or not self._password:
+            return None
+        return aiohttp.BasicAuth(self._username, self._password)
+
+    async def close(self):
+        """ Close all pooled connections
+        """
+        if self._session is not None:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    @staticmethod
+    def _convert_params(params):
+        """ Convert URL parameters to the types accepted by aiohttp
+
+        :param params: URL parameters
+        :return: URL parameters as strings
+        """
+        if not params:
+            return None
+        return {key: str(value) for key, value in params.items() if value is not None}
+
+    @staticmethod
+    async def _convert_response(response, read=True):
+        """ Convert an aiohttp response to a Requests response
+
+        :param response: aiohttp response
+        :param read: read the response body
+        :return: Requests response
+        """
+        converted = requests.Response()
+        converted.status_code = response.status
+        converted.reason = response.reason
+        converted.url = str(response.url)
+        converted.headers = CaseInsensitiveDict(response.headers)
+        converted.encoding = response.charset
+        converted._content = await response.read() if read else b""
+        return converted
+
+    async def _request(self, method, url, stream=False, **kwargs):
+        """ Send a request through the pooled session and validate its status
+
+        :param method: HTTP method
+        :param url: Web address
+        :param stream: return the aiohttp response without reading its body
+        :param kwargs: Extra arguments forwarded to aiohttp
+        :return: Requests response, or aiohttp response when streaming
+        """
+        kwargs["params"] = self._convert_params(kwargs.get("params"))
+        kwargs.pop("allow_redirects", None)
+        body = kwargs.get("data")
+        try:
+            position = body.tell()
+        except (AttributeError, OSError, ValueError):
+            position = None
+
+        start = time.perf_counter() if self._metrics is not None else None
+        expires = self._get_expiry()
+        attempt = 1
+        try:
+            while True:
+                if self._rate_limiter and not await self._rate_limiter.acquire_async(
+                        self._get_resource_url(url), self._get_remaining(expires)):
+                    raise asyncio.TimeoutError("Deadline exceeded")
+                try:
+                    response = await self._get_session().request(
+                        method, url, auth=self._get_authentication(),
+                        timeout=self._get_timeout(expires), **kwargs)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if not self._retry or not self._retry.can_retry(method, attempt) or \
+                            not self._rewind(body, position):
+                        raise
+                    delay = self._retry.get_delay(attempt)
+                    if not self._can_wait(expires, delay):
+                        raise
+                else:
+                    ok = response.status < 400
+                    if ok or not self._retry or \
+                            not self._retry.can_retry(method, attempt, response.status) or \
+                            not self._rewind(body, position):
+                        break
+                    delay = self._retry.get_delay(attempt, response.headers)
+                    if not self._can_wait(expires, delay):
+                        break
+                    response.release()
+                await asyncio.sleep(delay)
+                attempt += 1
+        except Exception as error:
+            if start is not None:
+                self._metrics.record(method, url, time.perf_counter() - start,
+                                     retries=attempt - 1, error=error,
+                                     resource_url=self._get_resource_url(url))
+            raise
+        if start is not None:
+            self._metrics.record(
+                method, url, time.perf_counter() - start, status_code=response.status,
+                bytes_sent=int(response.request_info.headers.get("Content-Length") or 0),
+                bytes_received=(response.content_length or 0) if method != "HEAD" else 0,
+                retries=attempt - 1, resource_url=self._get_resource_url(url))
+
+        if self._cache is not None and method not in ("GET", "HEAD"):
+            self._cache.invalidate(self._get_resource_url(url))
+        if ok and stream:
+            return response
+        try:
+            converted = await self._convert_response(response, read=method != "HEAD")
+        finally:
+            response.release()
+        if not ok:
+            self._raise_error("Could not {}".format(method), converted)
+        return converted
+
+    async def _get(self, url, params=None):
+        """ GET method, coalescing concurrent identical requests when enabled
+
+        :param url: Web address
+        :param params: URL params
+        :return: Requests response
+        """
+        if self._single_flight is None:
+            return await self._get_cached(url, params)
+        return await self._single_flight.do_async(self._cache_key(url, params), self._get_cached,
+                                                  url, params)
+
+    async def _get_cached(self, url, params=None):
+        """ GET method, served from the cache when a fresh entry is available
+
+            When the entry being revalidated disappears before its "304 Not Modified" arrives,
+            the GET is sent again without conditional headers.
+
+        :param url: Web address
+        :param params: URL params
+        :return: Requests response
+        """
+        if self._cache is None:
+            return await self._request("GET", url, params=params)
+        key, response, headers = self._lookup_cache(url, params)
+        if response is not None:
+            return response
+        response = await self._request("GET", url, params=params, headers=headers)
+        served = self._store_cache(key, url, response)
+        if served is None:
+            response = await self._request("GET", url, params=params)
+            served = self._store_cache(key, url, response)
+        return served if served is not None else response
+
+    async def get(self, url, params=None):
+        """ Forward GET method
+
+        :param url: Web address
+        :param params: URL params
+        :return: JSON answer
+        """
+        return self._add_status_code(await self._get(url, params))
+
+    async def page(self, method, url, params=None, json=None):
+        """ Request a single page of a paginated resource
+
+        :param method: HTTP method
+        :param url: URL Address
+        :param params: URL parameters
+        :param json: JSON content
+        :return: JSON answer, without status code, and response headers
+        """
+        response = await self._request(method, url, params=params, json=json)
+        return loads(response.content), response.headers
+
+    async def head(self, url, params=None):
+        """ Forward HEAD method
+
+        :param url: URL Address
+        :param params: URL parameters
+        :return: Response headers
+        """
+        response = await self._request("HEAD", url, params=params, allow_redirects=True)
+        return response.headers
+
+    async def download(self, url, params=None, add_status_code=True):
+        """ Just like GET method, but with content
+
+        :param url: URL Address
+        :param params: URL parameters
+        :param add_status_code: add JSON return code
+        :return: JSON response and content
+        """
+        response = await self._request("GET", url, params=params)
+        if add_status_code:
+            return self._add_status_code(response), response.content
+        return response.content
+
+    async def download_file(self, url, local_file_path, params=None, chunk_size=None,
+                            headers=None, offset=None, digest=None):
+        """ Stream GET content straight into a local file, using bounded memory
+
+        :param url: URL Address
+        :param params: URL parameters
+        :param local_file_path: file path to store the content
+        :param chunk_size: amount of bytes written per chunk
+        :param headers: Request headers
+        :param offset: position in the local file where the content starts
+        :param digest: Digest fed with each chunk written
+        :return: JSON with status code, or Response when wrapping responses
+        """
+        chunk_size = chunk_size or Requester.CHUNK_SIZE
+        response = await self._request("GET", url, params=params, headers=headers, stream=True)
+        try:
+            if offset is not None and response.status != 206:
+                raise Exception("Could not GET ({}): Range request not honoured for {}"
+                                .format(response.status, url))
+            with open(local_file_path, 'wb' if offset is None else 'r+b') as local_fd:
+                if offset is not None:
+                    local_fd.seek(offset)
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    local_fd.write(chunk)
+                    if digest is not None:
+                        digest.update(chunk)
+        finally:
+            response.release()
+        return self.create_response(response.status)
+
+    async def put(self, url, params=None, data=None, json=None, headers=None):
+        """ Forward PUT method
+
+        :param url: URL address
+        :param params: URL params
+        :param data: Data content
+        :param json: JSON content
+        :param headers: Request headers
+        :return: JSON
+        """
+        if data and json:
+            raise Exception("Only accept 'data' or 'json'")
+        if data:
+            response = await self._request("PUT", url, params=params, data=data, headers=headers)
+        else:
+            response = await self._request("PUT", url, params=params, json=json, headers=headers)
+        return self._add_status_code(response)
+
+    async def post(self, url, json=None, params=None, headers=None):
+        """ Forward POST method
+
+        :param url: URL address
+        :param params: URL parameters
+        :param json: Data to be posted
+        :param headers: Request headers
+        :return: Request response
+        """
+        response = await self._request("POST", url, json=json, params=params, headers=headers)
+        return self._add_status_code(response)
+
+    async def patch(self, url, json=None, params=None):
+        """ Forward PATCH method
+
+        :param url: URL address
+        :param params: URL parameters
+        :param json: Data to be patched
+        :return: Request response
+        """
+        response = await self._request("PATCH", url, json=json, params=params)
+        return self._add_status_code(response)
+
+    async def delete(self, url, params=None):
+        """ Forward DELETE method
+
+        :param url: URL address
+        :param params: URL parameters
+        :return: Request response
+        """
+        response = await self._request("DELETE", url, params=params)
+        return self._add_status_code(response)
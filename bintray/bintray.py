@@ -2,11 +2,19 @@
 
     https://bintray.com/docs/api
 """
+import contextvars
+import json
 import os
+import time
 
+from concurrent.futures import ThreadPoolExecutor
+
+from bintray.configuration import Configuration
 from bintray.requester import Requester
+from bintray.hashing import Hasher
 from bintray.logger import Logger
-from bintray.utils import bool_to_number
+from bintray.streams import Digest, ProgressMeter, ProgressReader, get_file_size, iter_progress
+from bintray.utils import bool_to_number, remove_file
 
 
 __version__ = "0.8.0"
@@ -20,18 +28,144 @@ class Bintray(object):
     """
 
     # Bintray API URL
-    BINTRAY_URL = "https://api.bintray.com"
+    BINTRAY_URL = os.getenv("BINTRAY_API_URL", "https://api.bintray.com")
+
+    # Bintray download URL
+    DOWNLOAD_URL = os.getenv("BINTRAY_DOWNLOAD_URL", "https://dl.bintray.com")
+
+    # Smallest range fetched by each worker on segmented downloads
+    MIN_SEGMENT_SIZE = 4 * 1024 * 1024
 
-    def __init__(self, username=None, api_key=None):
+    # Suffix of the sidecar file recording the state of a resumable download
+    RESUME_STATE_SUFFIX = ".bintray-partial"
+
+    # Suffix of the temporary file receiving the segments of a download
+    SEGMENTS_SUFFIX = ".bintray-segments"
+
+    def __init__(self, username=None, api_key=None, pool_connections=None, pool_maxsize=None,
+                 keep_alive=None, retry=None, rate_limiter=None, cache=None,
+                 content_store=None, coalesce=None, hasher=None, wrap_responses=None,
+                 metrics=None, configuration=None):
         """ Initialize arguments for login
 
+            Client settings are read from "configuration". Arguments other than None override
+            the matching configuration settings.
+
         :param username: Bintray username
         :param api_key: Bintray API Key
+        :param pool_connections: number of connection pools (one per host) to cache
+        :param pool_maxsize: maximum number of connections kept alive per host
+        :param keep_alive: reuse TCP/TLS connections between requests
+        :param retry: RetryPolicy applied to every request. Default: no retry
+        :param rate_limiter: RateLimiter shared by all requests. Default: unlimited
+        :param cache: cache for GET responses e.g. MemoryCache. Default: no cache
+        :param content_store: ContentStore serving downloads with known SHA-1. Default: none
+        :param coalesce: share a single HTTP call between concurrent identical GET requests
+        :param hasher: Hasher computing checksums of local files. Default: threads, in memory
+        :param wrap_responses: return Response objects, exposing "status_code" and "error" as
+                               attributes, instead of adding them to JSON payloads
+        :param metrics: Metrics recording latency, bytes and errors per endpoint. Default: none
+        :param configuration: Configuration with base URLs, timeouts, pools, retries and cache.
+                              Default: Configuration()
         """
         self._username = username or os.getenv("BINTRAY_USERNAME")
         self._password = api_key or os.getenv("BINTRAY_API_KEY")
-        self._requester = Requester(self._username, self._password)
+        self._configuration = (configuration or self._default_configuration()).replace(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize, keep_alive=keep_alive,
+            retry=retry, rate_limiter=rate_limiter, cache=cache, coalesce=coalesce,
+            wrap_responses=wrap_responses, metrics=metrics)
+        self._api_url = (self._configuration.api_url or Bintray.BINTRAY_URL).rstrip("/")
+        self._download_url = (self._configuration.download_url or
+                              Bintray.DOWNLOAD_URL).rstrip("/")
+        self._requester = self._create_requester()
         self._logger = Logger().logger
+        self._content_store = content_store
+        self._hasher = hasher or Hasher()
+
+    @staticmethod
+    def _default_configuration():
+        """ Create the configuration used when none is passed
+
+        :return: Configuration
+        """
+        return Configuration()
+
+    def _create_requester(self):
+        """ Create the requester sending all HTTP requests of this client
+
+        :return: Requester
+        """
+        return Requester(self._username, self._password,
+                         base_urls=(self._api_url, self._download_url),
+                         **self._configuration.get_requester_arguments())
+
+    @property
+    def configuration(self):
+        """ Settings of this client, after applying arguments passed to the constructor
+
+        :return: Configuration
+        """
+        return self._configuration
+
+    def close(self):
+        """ Release all pooled connections held by this client
+        """
+        self._requester.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def _next_position(items, headers):
+        """ Find the start position of the next page, from X-RangeLimit-* headers
+
+        :param items: items of the current page
+        :param headers: response headers of the current page
+        :return: next start position, or None when there are no more pages
+        """
+        total = headers.get("X-RangeLimit-Total")
+        end_position = headers.get("X-RangeLimit-EndPos")
+        if not items or total is None or end_position is None:
+            return None
+        next_position = int(end_position) + 1
+        return next_position if next_position < int(total) else None
+
+    def _paginate(self, method, url, params=None, json=None, prefetch=False):
+        """ Iterate over all items of a paginated resource, requesting pages lazily
+
+        :param method: HTTP method
+        :param url: URL Address
+        :param params: URL parameters
+        :param json: JSON content
+        :param prefetch: request the next page while the current one is consumed
+        :return: generator of items
+        """
+        params = dict(params or {})
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+
+        def fetch(start_position):
+            params["start_pos"] = start_position
+            return self._requester.page(method, url, params=dict(params), json=json)
+
+        try:
+            items, headers = fetch(int(params.get("start_pos") or 0))
+            while True:
+                next_position = self._next_position(items, headers)
+                future = None
+                if executor and next_position is not None:
+                    future = executor.submit(contextvars.copy_context().run, fetch,
+                                             next_position)
+                for item in items:
+                    yield item
+                if next_position is None:
+                    break
+                items, headers = future.result() if future else fetch(next_position)
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
 
     # Files
 
@@ -48,7 +182,7 @@ class Bintray(object):
         :return: List with all files
         """
         parameters = {"include_unpublished": bool_to_number(include_unpublished)}
-        url = "{}/packages/{}/{}/{}/files".format(Bintray.BINTRAY_URL,
+        url = "{}/packages/{}/{}/{}/files".format(self._api_url,
                                                   subject,
                                                   repo,
                                                   package)
@@ -76,7 +210,7 @@ class Bintray(object):
         :return: List with all files
         """
         parameters = {"include_unpublished": bool_to_number(include_unpublished)}
-        url = "{}/packages/{}/{}/{}/versions/{}/files".format(Bintray.BINTRAY_URL,
+        url = "{}/packages/{}/{}/{}/versions/{}/files".format(self._api_url,
                                                               subject,
                                                               repo,
                                                               package,
@@ -111,9 +245,30 @@ class Bintray(object):
             parameters["start_pos"] = str(start_pos)
         if created_after:
             parameters["created_after"] = str(created_after)
-        url = "{}/search/file".format(Bintray.BINTRAY_URL)
+        url = "{}/search/file".format(self._api_url)
         return self._requester.get(url, parameters)
 
+    def iter_search_file_by_name(self, name, subject=None, repo=None, created_after=None,
+                                 prefetch=False):
+        """ Iterate over all files found by name, walking through all result pages.
+
+        :param name: File to be searched
+        :param subject: File subject to filter
+        :param repo: File repo filter
+        :param created_after: Creation date to filter
+        :param prefetch: request the next page while the current one is consumed
+        :return: generator of files found
+        """
+        parameters = {"name": name}
+        if subject:
+            parameters["subject"] = str(subject)
+        if repo:
+            parameters["repo"] = str(repo)
+        if created_after:
+            parameters["created_after"] = str(created_after)
+        url = "{}/search/file".format(self._api_url)
+        return self._paginate("GET", url, params=parameters, prefetch=prefetch)
+
     def search_file_by_checksum(self, sha1, subject=None, repo=None, start_pos=None,
                             created_after=None):
         """ Search for a file by its sha1 checksum.
@@ -141,9 +296,30 @@ class Bintray(object):
             parameters["start_pos"] = str(start_pos)
         if created_after:
             parameters["created_after"] = str(created_after)
-        url = "{}/search/file".format(Bintray.BINTRAY_URL)
+        url = "{}/search/file".format(self._api_url)
         return self._requester.get(url, parameters)
 
+    def iter_search_file_by_checksum(self, sha1, subject=None, repo=None, created_after=None,
+                                     prefetch=False):
+        """ Iterate over all files found by sha1 checksum, walking through all result pages.
+
+        :param sha1: File SHA-1
+        :param subject: File subject to filter
+        :param repo: File repo filter
+        :param created_after: Creation date to filter
+        :param prefetch: request the next page while the current one is consumed
+        :return: generator of files found
+        """
+        parameters = {"sha1": sha1}
+        if subject:
+            parameters["subject"] = str(subject)
+        if repo:
+            parameters["repo"] = str(repo)
+        if created_after:
+            parameters["created_after"] = str(created_after)
+        url = "{}/search/file".format(self._api_url)
+        return self._paginate("GET", url, params=parameters, prefetch=prefetch)
+
     def file_in_download_list(self, subject, repo, file_path, add_or_remove):
         """ Add or remove a file from/to the 'Download List'.
 
@@ -158,40 +334,113 @@ class Bintray(object):
         """
         action = 'true' if add_or_remove else 'false'
         json_data = {'list_in_downloads': action}
-        url = "{}/file_metadata/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, file_path)
+        url = "{}/file_metadata/{}/{}/{}".format(self._api_url, subject, repo, file_path)
         return self._requester.put(url, json=json_data)
 
     # Content Uploading & Publishing
 
+    @staticmethod
+    def _track_upload(content, progress_callback=None, digest=None):
+        """ Wrap upload content to report its progress and compute its checksums
+
+            Iterables are always wrapped by a generator, so they are sent with chunked transfer
+            encoding.
+
+        :param content: readable file object, bytes or iterable of bytes chunks
+        :param progress_callback: function(bytes_sent, total_bytes, bytes_per_second)
+        :param digest: Digest fed with the content while it is sent
+        :return: content to be sent
+        """
+        if isinstance(content, bytes):
+            if digest is not None:
+                digest.update(content)
+            return content
+        if hasattr(content, "read"):
+            if not progress_callback and digest is None:
+                return content
+            return ProgressReader(content, ProgressMeter(progress_callback,
+                                                         get_file_size(content)), digest=digest)
+        return iter_progress(content, ProgressMeter(progress_callback), digest=digest)
+
+    @staticmethod
+    def _add_checksums(response, digest):
+        """ Update JSON result with checksums computed during the transfer
+
+        :param response: JSON response
+        :param digest: Digest fed with the transferred content
+        :return: JSON response
+        """
+        if isinstance(response, list):
+            response.append({"checksums": digest.hexdigests()})
+        else:
+            response["checksums"] = digest.hexdigests()
+        return response
+
+    def _upload(self, url, local_file_path, params=None, headers=None, progress_callback=None,
+                checksums=False):
+        """ Upload content with PUT method
+
+            Content is streamed, so memory usage does not depend on its size.
+
+        :param url: destination URL
+        :param local_file_path: file path, readable file object or iterable of bytes chunks
+        :param params: URL parameters
+        :param headers: Request headers
+        :param progress_callback: function(bytes_sent, total_bytes, bytes_per_second)
+        :param checksums: add SHA-1 and SHA-256 of the sent content to the response
+        :return: Request response
+        """
+        digest = Digest() if checksums else None
+        if isinstance(local_file_path, (str, os.PathLike)):
+            with open(local_file_path, 'rb') as file_content:
+                response = self._requester.put(
+                    url, params=params, headers=headers,
+                    data=self._track_upload(file_content, progress_callback, digest))
+        else:
+            response = self._requester.put(
+                url, params=params, headers=headers,
+                data=self._track_upload(local_file_path, progress_callback, digest))
+
+        self._logger.info("Upload successfully: {}".format(url))
+        if digest is not None:
+            self._add_checksums(response, digest)
+        return response
+
     def upload_content(self, subject, repo, package, version, remote_file_path, local_file_path,
-                       publish=True, override=False, explode=False):
+                       publish=True, override=False, explode=False, progress_callback=None,
+                       checksums=False):
         """ Upload content to the specified repository path, with package and version information.
 
+            Content is streamed from a file path or a readable file object. Iterables of bytes
+            chunks, like a tarball produced on the fly, are sent with chunked transfer encoding.
+
+            When "checksums" is enabled, SHA-1 and SHA-256 are computed while the content is
+            sent and returned as "checksums" in the response.
+
         :param subject: username or organization
         :param repo: repository name
         :param package: package name
         :param version: package version
         :param remote_file_path: file name to be used on Bintray
-        :param local_file_path: file path to be uploaded
+        :param local_file_path: file path, readable file object or iterable of bytes chunks
         :param publish: publish after uploading
         :param override: override remote file
         :param explode: explode remote file
+        :param progress_callback: function(bytes_sent, total_bytes, bytes_per_second)
+        :param checksums: add SHA-1 and SHA-256 of the uploaded content to the response
         :return: Request response
         """
-        url = "{}/content/{}/{}/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, package,
+        url = "{}/content/{}/{}/{}/{}/{}".format(self._api_url, subject, repo, package,
                                                  version, remote_file_path)
         parameters = {"publish": bool_to_number(publish),
                       "override": bool_to_number(override),
                       "explode": bool_to_number(explode)}
 
-        with open(local_file_path, 'rb') as file_content:
-            response = self._requester.put(url, params=parameters, data=file_content)
-
-        self._logger.info("Upload successfully: {}".format(url))
-        return response
+        return self._upload(url, local_file_path, params=parameters,
+                            progress_callback=progress_callback, checksums=checksums)
 
     def maven_upload(self, subject, repo, package, remote_file_path, local_file_path, publish=True,
-                     passphrase=None):
+                     passphrase=None, progress_callback=None, checksums=False):
         """ Upload Maven artifacts to the specified repository path, with package information.
 
             Version information is resolved from the path, which is expected to follow the Maven
@@ -203,26 +452,25 @@ class Bintray(object):
         :param repo: repository name
         :param package: package name
         :param remote_file_path: file name to be used on Bintray
-        :param local_file_path: file path to be uploaded
+        :param local_file_path: file path, readable file object or iterable of bytes chunks
         :param publish: publish after uploading
         :param passphrase: GPG passphrase
+        :param progress_callback: function(bytes_sent, total_bytes, bytes_per_second)
+        :param checksums: add SHA-1 and SHA-256 of the uploaded content to the response
         :return: Request response
         """
-        url = "{}/maven/{}/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, package,
+        url = "{}/maven/{}/{}/{}/{}".format(self._api_url, subject, repo, package,
                                             remote_file_path)
         parameters = {"publish": bool_to_number(publish)}
         headers = {"X-GPG-PASSPHRASE": passphrase} if passphrase else None
 
-        with open(local_file_path, 'rb') as file_content:
-            response = self._requester.put(url, params=parameters, data=file_content,
-                                           headers=headers)
-
-        self._logger.info("Upload successfully: {}".format(url))
-        return response
+        return self._upload(url, local_file_path, params=parameters, headers=headers,
+                            progress_callback=progress_callback, checksums=checksums)
 
     def debian_upload(self, subject, repo, package, version, remote_file_path, local_file_path,
                       deb_distribution, deb_component, deb_architecture, publish=True,
-                      override=False, passphrase=None):
+                      override=False, passphrase=None, progress_callback=None,
+                      checksums=False):
         """ Upload Debian artifacts to the specified repository path, with package information.
 
             When artifacts are uploaded to a Debian repository using the Automatic index layout,
@@ -233,16 +481,18 @@ class Bintray(object):
         :param package: package name
         :param version: package version
         :param remote_file_path: file name to be used on Bintray
-        :param local_file_path: file path to be uploaded
+        :param local_file_path: file path, readable file object or iterable of bytes chunks
         :param deb_distribution: Debian package distribution e.g. wheezy
         :param deb_component: Debian package component e.g. main
         :param deb_architecture: Debian package architecture e.g. i386,amd64
         :param publish: publish after uploading
         :param override: override remote file
         :param passphrase: GPG passphrase
+        :param progress_callback: function(bytes_sent, total_bytes, bytes_per_second)
+        :param checksums: add SHA-1 and SHA-256 of the uploaded content to the response
         :return: Request response
         """
-        url = "{}/content/{}/{}/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, package,
+        url = "{}/content/{}/{}/{}/{}/{}".format(self._api_url, subject, repo, package,
                                                  version, remote_file_path)
         parameters = {"publish": bool_to_number(publish),
                       "override": bool_to_number(override)}
@@ -254,12 +504,8 @@ class Bintray(object):
         if passphrase:
             headers["X-GPG-PASSPHRASE"] = passphrase
 
-        with open(local_file_path, 'rb') as file_content:
-            response = self._requester.put(url, params=parameters, data=file_content,
-                                           headers=headers)
-
-        self._logger.info("Upload successfully: {}".format(url))
-        return response
+        return self._upload(url, local_file_path, params=parameters, headers=headers,
+                            progress_callback=progress_callback, checksums=checksums)
 
     def _publish_discard_uploaded_content(self, subject, repo, package, version, discard=False,
                                           publish_wait_for_secs=-1, passphrase=None):
@@ -288,7 +534,7 @@ class Bintray(object):
         :param passphrase: GPG passphrase
         :return: Request response
         """
-        url = "{}/content/{}/{}/{}/{}/publish".format(Bintray.BINTRAY_URL, subject, repo, package,
+        url = "{}/content/{}/{}/{}/{}/publish".format(self._api_url, subject, repo, package,
                                                       version)
         body = {'discard': discard,
                 'publish_wait_for_secs': publish_wait_for_secs}
@@ -325,6 +571,179 @@ class Bintray(object):
         return self._publish_discard_uploaded_content(subject, repo, package, version,
                                                       discard=True, passphrase=passphrase)
 
+    @staticmethod
+    def _collect_upload_files(files, remote_prefix=None):
+        """ List local and remote paths to be uploaded
+
+        :param files: local directory, or list of (local file path, remote file path)
+        :param remote_prefix: remote directory prepended to each remote file path
+        :return: list of (local file path, remote file path)
+        """
+        if isinstance(files, str):
+            directory = files
+            files = []
+            for root, _, file_names in os.walk(directory):
+                for file_name in sorted(file_names):
+                    local_file_path = os.path.join(root, file_name)
+                    remote_file_path = os.path.relpath(local_file_path, directory)
+                    files.append((local_file_path, remote_file_path.replace(os.sep, "/")))
+        if remote_prefix:
+            files = [(local_file_path, "{}/{}".format(remote_prefix.strip("/"), remote_file_path))
+                     for local_file_path, remote_file_path in files]
+        return list(files)
+
+    def _get_remote_checksums(self, subject, repo, package, version):
+        """ Retrieve SHA-1 checksums of all files in a version, including unpublished files
+
+            The listing decides which files are skipped, so it is always requested from the
+            server, bypassing the response cache.
+
+        :param subject: username or organization
+        :param repo: repository name
+        :param package: package name
+        :param version: package version
+        :return: dict with remote file path and SHA-1
+        """
+        url = "{}/packages/{}/{}/{}/versions/{}/files".format(self._api_url, subject, repo,
+                                                              package, version)
+        try:
+            files, _ = self._requester.page("GET", url, params={"include_unpublished": 1})
+        except Exception as error:
+            self._logger.warning("Could not list version files: {}".format(error))
+            return {}
+        return self._checksums_by_path(files)
+
+    @staticmethod
+    def _checksums_by_path(files):
+        """ Index SHA-1 checksums from a list of version files
+
+        :param files: version files, as returned by get_version_files
+        :return: dict with remote file path and SHA-1
+        """
+        return {entry["path"]: entry["sha1"] for entry in files
+                if "path" in entry and "sha1" in entry}
+
+    def _get_local_checksums(self, files, remote_checksums):
+        """ Compute SHA-1 checksums of local files which also exist remotely, in parallel
+
+        :param files: list of (local file path, remote file path)
+        :param remote_checksums: dict with remote file path and SHA-1
+        :return: dict with local file path and SHA-1
+        """
+        return self._hasher.checksums([local_file_path for local_file_path, remote_file_path
+                                       in files if remote_file_path in remote_checksums])
+
+    @staticmethod
+    def _is_unchanged(local_file_path, remote_file_path, local_checksums, remote_checksums):
+        """ Check if a local file is identical to the remote file, comparing SHA-1
+
+        :param local_file_path: local file path
+        :param remote_file_path: file name used on Bintray
+        :param local_checksums: dict with local file path and SHA-1
+        :param remote_checksums: dict with remote file path and SHA-1
+        :return: True when both files are identical
+        """
+        remote_sha1 = remote_checksums.get(remote_file_path)
+        return remote_sha1 is not None and remote_sha1 == local_checksums.get(local_file_path)
+
+    @staticmethod
+    def _upload_result(local_file_path, remote_file_path, response=None, error=None,
+                       skipped=False):
+        """ Describe the result of a single file upload
+
+        :param local_file_path: uploaded file path
+        :param remote_file_path: file name used on Bintray
+        :param response: upload response
+        :param error: exception raised by the upload
+        :param skipped: file was not uploaded because it is unchanged
+        :return: upload result
+        """
+        result = {"localFilePath": local_file_path, "remoteFilePath": remote_file_path,
+                  "skipped": skipped}
+        if error is not None:
+            result.update({"statusCode": None, "error": True, "message": str(error)})
+        elif skipped:
+            result.update({"statusCode": None, "error": False, "message": "unchanged"})
+        else:
+            result.update(response)
+        return result
+
+    @staticmethod
+    def _summarize_uploads(results, elapsed):
+        """ Aggregate the results of a bulk upload
+
+        :param results: list of upload results
+        :param elapsed: total upload time in seconds
+        :return: summary
+        """
+        failed = [result for result in results if result["error"]]
+        skipped = [result for result in results if result["skipped"]]
+        uploaded_bytes = sum(os.path.getsize(result["localFilePath"]) for result in results
+                             if not result["error"] and not result["skipped"])
+        return {"total": len(results),
+                "uploaded": len(results) - len(failed) - len(skipped),
+                "skipped": len(skipped),
+                "failed": len(failed),
+                "bytes": uploaded_bytes,
+                "seconds": elapsed}
+
+    def upload_content_bulk(self, subject, repo, package, version, files, remote_prefix=None,
+                            max_workers=8, publish=True, override=False, explode=False,
+                            skip_unchanged=False):
+        """ Upload many files concurrently, with package and version information.
+
+            Files are uploaded unpublished by a bounded pool of workers. When "publish" is
+            enabled and no file failed, the version content is published once at the end.
+
+            When "skip_unchanged" is enabled, the SHA-1 of each local file is compared to the
+            checksum listed by get_version_files, and identical files are not uploaded again.
+            Local files are hashed in parallel by the client Hasher before uploading.
+
+        :param subject: username or organization
+        :param repo: repository name
+        :param package: package name
+        :param version: package version
+        :param files: local directory, or list of (local file path, remote file path)
+        :param remote_prefix: remote directory prepended to each remote file path
+        :param max_workers: maximum number of concurrent uploads
+        :param publish: publish after uploading all files
+        :param override: override remote files
+        :param explode: explode remote files
+        :param skip_unchanged: do not upload files with same SHA-1 of remote files
+        :return: per-file results, aggregate summary and publish response
+        """
+        files = self._collect_upload_files(files, remote_prefix)
+        remote_checksums = {}
+        local_checksums = {}
+        if skip_unchanged:
+            remote_checksums = self._get_remote_checksums(subject, repo, package, version)
+            local_checksums = self._get_local_checksums(files, remote_checksums)
+
+        def upload(local_file_path, remote_file_path):
+            try:
+                if self._is_unchanged(local_file_path, remote_file_path, local_checksums,
+                                      remote_checksums):
+                    return self._upload_result(local_file_path, remote_file_path, skipped=True)
+                response = self.upload_content(subject, repo, package, version,
+                                               remote_file_path, local_file_path, publish=False,
+                                               override=override, explode=explode)
+            except Exception as error:
+                self._logger.warning("Could not upload {}: {}".format(local_file_path, error))
+                return self._upload_result(local_file_path, remote_file_path, error=error)
+            return self._upload_result(local_file_path, remote_file_path, response)
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, upload, *paths)
+                       for paths in files]
+            results = [future.result() for future in futures]
+        summary = self._summarize_uploads(results, time.monotonic() - start)
+
+        publish_response = None
+        if publish and summary["total"] and not summary["failed"]:
+            publish_response = self.publish_uploaded_content(subject, repo, package, version)
+        return {"files": results, "summary": summary, "publish": publish_response}
+
     def delete_content(self, subject, repo, file_path):
         """ Delete content from the specified repository path,
 
@@ -339,7 +758,7 @@ class Bintray(object):
         :param file_path: file to be deleted
         :return: request response
         """
-        url = "{}/content/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, file_path)
+        url = "{}/content/{}/{}/{}".format(self._api_url, subject, repo, file_path)
         response = self._requester.delete(url)
 
         self._logger.info("Delete successfully: {}".format(url))
@@ -347,25 +766,298 @@ class Bintray(object):
 
     # Content Downloading
 
-    def download_content(self, subject, repo, remote_file_path, local_file_path):
-        """ Download content from the specified repository path.
+    def _fetch_from_store(self, local_file_path, sha1):
+        """ Place a file from the content store, when available
 
-        :param subject: username or organization
-        :param repo: repository name
-        :param remote_file_path: file name to be downloaded from Bintray
         :param local_file_path: file name to be stored in local storage
+        :param sha1: expected SHA-1
+        :return: True when served from the content store
         """
-        download_base_url = "https://dl.bintray.com"
-        url = "{}/{}/{}/{}".format(download_base_url, subject, repo, remote_file_path)
-        response, content = self._requester.download(url)
+        if self._content_store is None or not sha1:
+            return False
+        if not self._content_store.fetch(sha1, local_file_path):
+            return False
+        self._logger.info("Download from content store: {}".format(sha1))
+        return True
 
-        with open(local_file_path, 'wb') as local_fd:
-            local_fd.write(content)
+    def _content_store_response(self):
+        """ Response of a download served from the content store
+
+        :return: JSON with status code, or Response when wrapping responses
+        """
+        return self._requester.create_response(200, json_data={"message": "content store"})
 
+    def _create_download_digest(self, sha1, checksums):
+        """ Create a Digest for a download, only when its checksums are needed
+
+        :param sha1: expected SHA-1, or None when unknown
+        :param checksums: checksums were requested by the caller
+        :return: Digest or None
+        """
+        if checksums or sha1 or self._content_store is not None:
+            return Digest()
+        return None
+
+    def _verify_download(self, local_file_path, sha1, digest):
+        """ Verify the checksum of a downloaded file, adding it to the content store
+
+            The checksum is computed while the file is downloaded, so it is not read again.
+            The file is removed when its checksum does not match.
+
+        :param local_file_path: downloaded file
+        :param sha1: expected SHA-1, or None when unknown
+        :param digest: Digest fed with the downloaded content, or None when not needed
+        """
+        if digest is None:
+            return
+        actual_sha1 = digest.hexdigests()["sha1"]
+        if sha1 and sha1.lower() != actual_sha1:
+            os.remove(local_file_path)
+            raise Exception("Checksum mismatch for {}: expected {}, got {}"
+                            .format(local_file_path, sha1, actual_sha1))
+        if self._content_store is not None:
+            self._content_store.add(local_file_path, actual_sha1, verify=False)
+
+    def _download(self, url, local_file_path, params=None, stream=False, chunk_size=None,
+                  segments=1, resume=False, sha1=None, checksums=False):
+        """ Download a file to local storage, buffering or streaming its content
+
+        :param url: file URL
+        :param local_file_path: file name to be stored in local storage
+        :param params: URL parameters
+        :param stream: write content in bounded chunks instead of loading it in memory
+        :param chunk_size: amount of bytes written per chunk when streaming
+        :param segments: number of concurrent HTTP Range requests
+        :param resume: continue a previous interrupted download
+        :param sha1: expected SHA-1, used to verify the file and to look up the content store
+        :param checksums: add SHA-1 and SHA-256 of the downloaded content to the response
+        :return: request response
+        """
+        digest = self._create_download_digest(sha1, checksums)
+        if self._fetch_from_store(local_file_path, sha1):
+            response = self._content_store_response()
+            if checksums:
+                digest.update_file(local_file_path)
+                self._add_checksums(response, digest)
+            return response
+        if not resume:
+            remove_file(local_file_path)
+        if resume:
+            response = self._download_resume(url, local_file_path, params=params,
+                                             chunk_size=chunk_size, digest=digest)
+        elif segments > 1:
+            response = self._download_segments(url, local_file_path, segments, params=params,
+                                               chunk_size=chunk_size, digest=digest)
+        elif stream:
+            response = self._requester.download_file(url, local_file_path, params=params,
+                                                      chunk_size=chunk_size, digest=digest)
+        else:
+            response, content = self._requester.download(url, params=params)
+            with open(local_file_path, 'wb') as local_fd:
+                local_fd.write(content)
+            if digest is not None:
+                digest.update(content)
+
+        self._verify_download(local_file_path, sha1, digest)
         self._logger.info("Download successfully: {}".format(url))
+        if checksums:
+            self._add_checksums(response, digest)
         return response
 
-    def dynamic_download(self, subject, repo, remote_file_path, local_file_path, bt_package=None):
+    @staticmethod
+    def _plan_segments(headers, local_file_path, segments):
+        """ Split a remote file into HTTP Range segments and preallocate the local file
+
+        :param headers: response headers from HEAD request
+        :param local_file_path: local file receiving the segments
+        :param segments: number of concurrent HTTP Range requests
+        :return: list of (offset, request headers), or None when the file can not be split
+        """
+        size = int(headers.get("Content-Length", 0))
+        segments = min(segments, size // Bintray.MIN_SEGMENT_SIZE)
+        if headers.get("Accept-Ranges") != "bytes" or segments < 2:
+            return None
+
+        with open(local_file_path, 'wb') as local_fd:
+            local_fd.truncate(size)
+
+        segment_size = -(-size // segments)
+        validator = headers.get("ETag") or headers.get("Last-Modified")
+        plan = []
+        for start in range(0, size, segment_size):
+            end = min(start + segment_size, size) - 1
+            range_headers = {"Range": "bytes={}-{}".format(start, end)}
+            if validator:
+                range_headers["If-Range"] = validator
+            plan.append((start, range_headers))
+        return plan
+
+    def _download_segments(self, url, local_file_path, segments, params=None, chunk_size=None,
+                           digest=None):
+        """ Download a file splitting it into HTTP Range segments fetched concurrently
+
+            Each segment is written at its own offset into a preallocated temporary file, which
+            replaces the local file once all segments are complete. When a segment fails, the
+            pending ones are cancelled and the temporary file is removed. When the server does
+            not accept ranges, or the file is too small to be split, a single streamed download
+            is performed instead.
+
+            Segments arrive out of order, so checksums are computed from the complete file.
+
+        :param url: file URL
+        :param local_file_path: file name to be stored in local storage
+        :param segments: number of concurrent HTTP Range requests
+        :param params: URL parameters
+        :param chunk_size: amount of bytes written per chunk
+        :param digest: Digest fed with the downloaded content
+        :return: request response, with status 200 once the whole file is assembled
+        """
+        headers = self._requester.head(url, params=params)
+        segments_path = local_file_path + Bintray.SEGMENTS_SUFFIX
+        plan = self._plan_segments(headers, segments_path, segments)
+        if not plan:
+            return self._requester.download_file(url, local_file_path, params=params,
+                                                 chunk_size=chunk_size, digest=digest)
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(plan)) as executor:
+                futures = [executor.submit(contextvars.copy_context().run,
+                                           self._requester.download_file, url, segments_path,
+                                           params=params, chunk_size=chunk_size,
+                                           headers=range_headers, offset=offset)
+                           for offset, range_headers in plan]
+                try:
+                    for future in futures:
+                        future.result()
+                except Exception:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        except Exception:
+            remove_file(segments_path)
+            raise
+        os.replace(segments_path, local_file_path)
+        if digest is not None:
+            digest.update_file(local_file_path)
+        return self._requester.create_response(200)
+
+    @staticmethod
+    def _plan_resume(url, headers, local_file_path):
+        """ Compare the remote file with the state of a previous download
+
+            A sidecar file next to "local_file_path" records the expected size and validators
+            (ETag/Last-Modified) of the remote file. When they still match, the download can
+            continue from the current local size. A local copy larger than the expected size
+            is not a prefix of the remote file, so it is discarded as well. The sidecar file is
+            updated with the current state.
+
+        :param url: file URL
+        :param headers: response headers from HEAD request
+        :param local_file_path: file name to be stored in local storage
+        :return: sidecar file path, expected size, offset and range headers
+        """
+        validator = headers.get("ETag") or headers.get("Last-Modified")
+        state = {"url": url,
+                 "size": int(headers.get("Content-Length", -1)),
+                 "etag": headers.get("ETag"),
+                 "last_modified": headers.get("Last-Modified")}
+        state_path = local_file_path + Bintray.RESUME_STATE_SUFFIX
+
+        offset = 0
+        if os.path.exists(state_path) and os.path.exists(local_file_path):
+            with open(state_path) as state_fd:
+                try:
+                    previous_state = json.load(state_fd)
+                except ValueError:
+                    previous_state = None
+            local_size = os.path.getsize(local_file_path)
+            if previous_state == state and validator and 0 <= local_size <= state["size"] and \
+                    headers.get("Accept-Ranges") == "bytes":
+                offset = local_size
+
+        if not offset:
+            remove_file(local_file_path)
+        with open(state_path, 'w') as state_fd:
+            json.dump(state, state_fd)
+
+        range_headers = {"Range": "bytes={}-".format(offset), "If-Range": validator}
+        return state_path, state["size"], offset, range_headers
+
+    def _download_resume(self, url, local_file_path, params=None, chunk_size=None,
+                         digest=None):
+        """ Download a file continuing from a partial local copy, when it is still valid
+
+            The download restarts from zero when the remote file changed since the previous
+            attempt, and is skipped when the partial local copy is already complete. The sidecar
+            file is removed once the download completes. Only the partial local copy is read to
+            compute checksums, the remaining content is hashed while it is downloaded.
+
+        :param url: file URL
+        :param local_file_path: file name to be stored in local storage
+        :param params: URL parameters
+        :param chunk_size: amount of bytes written per chunk
+        :param digest: Digest fed with the downloaded content
+        :return: request response, with status 200 once the whole file is downloaded
+        """
+        headers = self._requester.head(url, params=params)
+        state_path, size, offset, range_headers = self._plan_resume(url, headers,
+                                                                    local_file_path)
+        if digest is not None and offset:
+            digest.update_file(local_file_path, size=offset)
+        if offset and offset == size:
+            response = self._requester.create_response(200)
+        elif offset:
+            self._logger.info("Resume download from byte {}: {}".format(offset, url))
+            self._requester.download_file(url, local_file_path, params=params,
+                                          chunk_size=chunk_size, headers=range_headers,
+                                          offset=offset, digest=digest)
+            response = self._requester.create_response(200)
+        else:
+            response = self._requester.download_file(url, local_file_path, params=params,
+                                                     chunk_size=chunk_size, digest=digest)
+        os.remove(state_path)
+        return response
+
+    def download_content(self, subject, repo, remote_file_path, local_file_path, stream=False,
+                         chunk_size=None, segments=1, resume=False, sha1=None, checksums=False):
+        """ Download content from the specified repository path.
+
+            When "stream" is enabled, the content is written in chunks of "chunk_size" bytes, so
+            memory usage stays constant regardless of the file size. The response only carries
+            the status code in this mode.
+
+            When "segments" is greater than 1, large files are split into HTTP Range requests
+            fetched concurrently. This mode always streams.
+
+            When "resume" is enabled, an interrupted download continues from the partial local
+            file, as long as the remote file did not change meanwhile. This mode always streams.
+
+            When "sha1" is known, e.g. from get_version_files or search_file_by_checksum, the
+            downloaded file is verified against it. When a content store is configured, files
+            with known SHA-1 are served from it without network access, and every downloaded
+            file is added to it. Checksums are computed while the content is downloaded, except
+            for segmented downloads, which are hashed once complete.
+
+            When "checksums" is enabled, SHA-1 and SHA-256 of the file are returned as
+            "checksums" in the response.
+
+        :param subject: username or organization
+        :param repo: repository name
+        :param remote_file_path: file name to be downloaded from Bintray
+        :param local_file_path: file name to be stored in local storage
+        :param stream: write content in bounded chunks instead of loading it in memory
+        :param chunk_size: amount of bytes written per chunk when streaming
+        :param segments: number of concurrent HTTP Range requests
+        :param resume: continue a previous interrupted download
+        :param sha1: expected SHA-1 of the remote file
+        :param checksums: add SHA-1 and SHA-256 of the downloaded file to the response
+        """
+        url = "{}/{}/{}/{}".format(self._download_url, subject, repo, remote_file_path)
+        return self._download(url, local_file_path, stream=stream, chunk_size=chunk_size,
+                              segments=segments, resume=resume, sha1=sha1, checksums=checksums)
+
+    def dynamic_download(self, subject, repo, remote_file_path, local_file_path, bt_package=None,
+                         stream=False, chunk_size=None):
         """ Download a file based on a dynamic file_path .
 
             This resource is only available for Bintray Premium repositories.
@@ -386,18 +1078,14 @@ class Bintray(object):
         :param remote_file_path: file name to be downloaded from Bintray
         :param local_file_path: file name to be stored in local storage
         :param bt_package: query parameter
+        :param stream: write content in bounded chunks instead of loading it in memory
+        :param chunk_size: amount of bytes written per chunk when streaming
         """
 
         parameters = {"bt_package": bt_package} if bt_package else None
-        download_base_url = "https://dl.bintray.com"
-        url = "{}/{}/{}/{}".format(download_base_url, subject, repo, remote_file_path)
-        response, content = self._requester.download(url, params=parameters)
-
-        with open(local_file_path, 'wb') as local_fd:
-            local_fd.write(content)
-
-        self._logger.info("Download successfully: {}".format(url))
-        return response
+        url = "{}/{}/{}/{}".format(self._download_url, subject, repo, remote_file_path)
+        return self._download(url, local_file_path, params=parameters, stream=stream,
+                              chunk_size=chunk_size)
 
     def url_signing(self, subject, repo, file_path, json_data, encrypt=False):
         """ Generates an anonymous, signed download URL with an expiry date.
@@ -418,7 +1106,7 @@ class Bintray(object):
         """
 
         parameters = {"encrypt": str(encrypt).lower()}
-        url = "{}/signed_url/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, file_path)
+        url = "{}/signed_url/{}/{}/{}".format(self._api_url, subject, repo, file_path)
         response = self._requester.post(url, json=json_data, params=parameters)
         return response
 
@@ -430,7 +1118,7 @@ class Bintray(object):
         :param org: Organization name
         :return: Licenses list
         """
-        url = "{}/orgs/{}/licenses".format(Bintray.BINTRAY_URL, org)
+        url = "{}/orgs/{}/licenses".format(self._api_url, org)
         return self._requester.get(url)
 
     def get_user_proprietary_licenses(self, user):
@@ -439,7 +1127,7 @@ class Bintray(object):
         :param user: User name
         :return: Licenses list
         """
-        url = "{}/users/{}/licenses".format(Bintray.BINTRAY_URL, user)
+        url = "{}/users/{}/licenses".format(self._api_url, user)
         return self._requester.get(url)
 
     def create_org_proprietary_license(self, org, name, description, url):
@@ -452,7 +1140,7 @@ class Bintray(object):
         :param url: license url
         :return: request answer
         """
-        url_request = "{}/orgs/{}/licenses".format(Bintray.BINTRAY_URL, org)
+        url_request = "{}/orgs/{}/licenses".format(self._api_url, org)
         json_data = {
             'name': name,
             'description': description,
@@ -469,7 +1157,7 @@ class Bintray(object):
         :param url: license url
         :return: request response
         """
-        url_request = "{}/users/{}/licenses".format(Bintray.BINTRAY_URL, user)
+        url_request = "{}/users/{}/licenses".format(self._api_url, user)
         json_data = {
             'name': name,
             'description': description,
@@ -487,7 +1175,7 @@ class Bintray(object):
         :param url: license url
         :return: request answer
         """
-        request_url = "{}/orgs/{}/licenses/{}".format(Bintray.BINTRAY_URL, org, custom_license_name)
+        request_url = "{}/orgs/{}/licenses/{}".format(self._api_url, org, custom_license_name)
         json_data = {}
         if isinstance(description, str):
             json_data["description"] = description
@@ -505,7 +1193,7 @@ class Bintray(object):
         :param url: license url
         :return: request answer
         """
-        request_url = "{}/users/{}/licenses/{}".format(Bintray.BINTRAY_URL, user,
+        request_url = "{}/users/{}/licenses/{}".format(self._api_url, user,
                                                        custom_license_name)
         json_data = {}
         if isinstance(description, str):
@@ -526,7 +1214,7 @@ class Bintray(object):
         :param custom_license_name: License name to be deleted
         :return: request answer
         """
-        url = "{}/orgs/{}/licenses/{}".format(Bintray.BINTRAY_URL, org, custom_license_name)
+        url = "{}/orgs/{}/licenses/{}".format(self._api_url, org, custom_license_name)
         return self._requester.delete(url)
 
     def delete_user_proprietary_license(self, user, custom_license_name):
@@ -536,7 +1224,7 @@ class Bintray(object):
         :param custom_license_name: License to be deleted
         :return: request answer
         """
-        url = "{}/users/{}/licenses/{}".format(Bintray.BINTRAY_URL, user, custom_license_name)
+        url = "{}/users/{}/licenses/{}".format(self._api_url, user, custom_license_name)
         return self._requester.delete(url)
 
     def get_oss_licenses(self):
@@ -544,7 +1232,7 @@ class Bintray(object):
 
         :return: List with OSS licenses
         """
-        url = "{}/licenses/oss_licenses".format(Bintray.BINTRAY_URL)
+        url = "{}/licenses/oss_licenses".format(self._api_url)
         return self._requester.get(url)
 
     # Content Signing
@@ -557,7 +1245,7 @@ class Bintray(object):
         :param org: Organization name
         :return: response Content-Type format as 'application/pgp-keys'.
         """
-        url = "{}/orgs/{}/keys/gpg/public.key".format(Bintray.BINTRAY_URL, org)
+        url = "{}/orgs/{}/keys/gpg/public.key".format(self._api_url, org)
         return self._requester.get(url)
 
     def get_user_gpg_public_key(self, user):
@@ -568,7 +1256,7 @@ class Bintray(object):
         :param org: Organization name
         :return: response Content-Type format as 'application/pgp-keys'.
         """
-        url = "{}/users/{}/keys/gpg/public.key".format(Bintray.BINTRAY_URL, user)
+        url = "{}/users/{}/keys/gpg/public.key".format(self._api_url, user)
         return self._requester.get(url)
 
     def gpg_sign_version(self, subject, repo, package, version, key_subject=None, passphrase=None,
@@ -588,7 +1276,7 @@ class Bintray(object):
         :param key_path: Optional private key, if not stored in Bintray
         :return: request response
         """
-        url = "{}/gpg/{}/{}/{}/versions/{}".format(Bintray.BINTRAY_URL, subject, repo, package,
+        url = "{}/gpg/{}/{}/{}/versions/{}".format(self._api_url, subject, repo, package,
                                                    version)
         body = {}
         if subject:
@@ -623,7 +1311,7 @@ class Bintray(object):
         :param key_path: Optional private key, if not stored in Bintray
         :return: request response
         """
-        url = "{}/gpg/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, file_path)
+        url = "{}/gpg/{}/{}/{}".format(self._api_url, subject, repo, file_path)
         body = {}
         if subject:
             body['subject'] = key_subject
@@ -669,7 +1357,7 @@ class Bintray(object):
         :param close: staging repository mode
         :return: request response
         """
-        url = "{}/maven_central_sync/{}/{}/{}/versions/{}".format(Bintray.BINTRAY_URL, subject,
+        url = "{}/maven_central_sync/{}/{}/{}/versions/{}".format(self._api_url, subject,
                                                                   repo, package, version)
         body = {
             'username': username,
@@ -690,7 +1378,7 @@ class Bintray(object):
         :param subject: subject name
         :return: A list of repositories
         """
-        url = "{}/repos/{}".format(Bintray.BINTRAY_URL, subject)
+        url = "{}/repos/{}".format(self._api_url, subject)
         return self._requester.get(url)
 
     def get_repository(self, subject, repo):
@@ -703,7 +1391,7 @@ class Bintray(object):
         :param repo: Repository name
         :return: Repository information
         """
-        url = "{}/repos/{}/{}".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/repos/{}/{}".format(self._api_url, subject, repo)
         return self._requester.get(url)
 
     def create_repository(self, subject, repo, type, description, private=False, labels=None,
@@ -743,7 +1431,7 @@ class Bintray(object):
         :return: Request response
         """
         assert isinstance(private, bool), "private must be a boolean value [True, False]"
-        url = "{}/repos/{}/{}".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/repos/{}/{}".format(self._api_url, subject, repo)
         json_data = {
             'name': repo,
             'type': type,
@@ -794,7 +1482,7 @@ class Bintray(object):
                                         make changes to the version at any time after it is published
         :return: Request response
         """
-        url = "{}/repos/{}/{}".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/repos/{}/{}".format(self._api_url, subject, repo)
         json_data = {}
 
         if isinstance(business_unit, str):
@@ -826,7 +1514,7 @@ class Bintray(object):
         :param repo: repo name
         :return: request response
         """
-        url = "{}/repos/{}/{}".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/repos/{}/{}".format(self._api_url, subject, repo)
         response = self._requester.delete(url)
         self._logger.info("Repository {} deleted successfully".format(repo))
         return response
@@ -847,7 +1535,7 @@ class Bintray(object):
         :param description: repository name
         :return: request response
         """
-        url = "{}/search/repos".format(Bintray.BINTRAY_URL)
+        url = "{}/search/repos".format(self._api_url)
         params = {}
         if name:
             params["name"] = name
@@ -875,7 +1563,7 @@ class Bintray(object):
         :param path_prefix: path to include the files from
         :return: request response
         """
-        url = "{}/repository/{}/{}/links/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo,
+        url = "{}/repository/{}/{}/links/{}/{}/{}".format(self._api_url, subject, repo,
                                                           source_subject, source_repo,
                                                           source_package)
         json_data = {"path_prefix": path_prefix} if path_prefix else None
@@ -896,7 +1584,7 @@ class Bintray(object):
         :param source_package: source package name
         :return: request response
         """
-        url = "{}/repository/{}/{}/links/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo,
+        url = "{}/repository/{}/{}/links/{}/{}/{}".format(self._api_url, subject, repo,
                                                           source_subject, source_repo,
                                                           source_package)
         response = self._requester.delete(url)
@@ -919,7 +1607,7 @@ class Bintray(object):
         :param path: path in the repository
         :return: request response
         """
-        url = "{}/calc_metadata/{}/{}".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/calc_metadata/{}/{}".format(self._api_url, subject, repo)
         if path:
             url += '/' + path
 
@@ -938,7 +1626,7 @@ class Bintray(object):
         :param repo: repository name
         :return: request response
         """
-        url = "{}/repos/{}/{}/geo_restrictions".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/repos/{}/{}/geo_restrictions".format(self._api_url, subject, repo)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
         return response
@@ -958,7 +1646,7 @@ class Bintray(object):
         :param black_list: Countries in black list e.g. ["RU", "BR"]
         :return: request response
         """
-        url = "{}/repos/{}/{}/geo_restrictions".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/repos/{}/{}/geo_restrictions".format(self._api_url, subject, repo)
         json_data = {}
         if white_list and black_list:
             raise ValueError("The update can be done on one list only.")
@@ -983,7 +1671,7 @@ class Bintray(object):
         :param repo: repository name
         :return: request response
         """
-        url = "{}/repos/{}/{}/geo_restrictions".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/repos/{}/{}/geo_restrictions".format(self._api_url, subject, repo)
         response = self._requester.delete(url)
         self._logger.put("Delete successfully")
         return response
@@ -995,7 +1683,7 @@ class Bintray(object):
         :param repo: repository name
         :return: request response
         """
-        url = "{}/repos/{}/{}/ip_restrictions".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/repos/{}/{}/ip_restrictions".format(self._api_url, subject, repo)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
         return response
@@ -1009,7 +1697,7 @@ class Bintray(object):
         :param black_cidrs: black list for CIDRs
         :return: request response
         """
-        url = "{}/repos/{}/{}/ip_restrictions".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/repos/{}/{}/ip_restrictions".format(self._api_url, subject, repo)
         json_data = {}
         if isinstance(white_cidrs, list):
             json_data["white_cidrs"] = white_cidrs
@@ -1034,7 +1722,7 @@ class Bintray(object):
         :param rm_black_cidrs: CIDRs to be removed from the black list
         :return: request response
         """
-        url = "{}/repos/{}/{}/ip_restrictions".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/repos/{}/{}/ip_restrictions".format(self._api_url, subject, repo)
         json_data = {}
         if isinstance(add_white_cidrs, list):
             json_data["add"] = {"white_cidrs": add_white_cidrs}
@@ -1060,7 +1748,7 @@ class Bintray(object):
         :param repo: repository name
         :return: request response
         """
-        url = "{}/repos/{}/{}/ip_restrictions".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/repos/{}/{}/ip_restrictions".format(self._api_url, subject, repo)
 
         response = self._requester.delete(url)
         self._logger.info("Update successfully")
@@ -1079,7 +1767,7 @@ class Bintray(object):
         :param attribute_values: show attributes
         :return: request response + package version information
         """
-        url = "{}/packages/{}/{}/{}/versions/{}".format(Bintray.BINTRAY_URL, subject, repo,
+        url = "{}/packages/{}/{}/{}/versions/{}".format(self._api_url, subject, repo,
                                                         package, version)
         params = {"attribute_values": bool_to_number(attribute_values)}
         response = self._requester.get(url, params=params)
@@ -1105,7 +1793,7 @@ class Bintray(object):
         :param vcs_tag: tag name in VCS
         :return: request response
         """
-        url = "{}/packages/{}/{}/{}/versions".format(Bintray.BINTRAY_URL, subject, repo, package)
+        url = "{}/packages/{}/{}/{}/versions".format(self._api_url, subject, repo, package)
         json_data = {'name': version}
         if isinstance(description, str):
             json_data["desc"] = description
@@ -1134,7 +1822,7 @@ class Bintray(object):
         :param version: version to be deleted
         :return: request response
         """
-        url = "{}/packages/{}/{}/{}/versions/{}".format(Bintray.BINTRAY_URL, subject, repo, package,
+        url = "{}/packages/{}/{}/{}/versions/{}".format(self._api_url, subject, repo, package,
                                                         version)
 
         response = self._requester.delete(url)
@@ -1159,7 +1847,7 @@ class Bintray(object):
         :param vcs_tag: tag name in VCS
         :return: request response
         """
-        url = "{}/packages/{}/{}/{}/versions/{}".format(Bintray.BINTRAY_URL, subject, repo,
+        url = "{}/packages/{}/{}/{}/versions/{}".format(self._api_url, subject, repo,
                                                         package, version)
         json_data = {}
         if isinstance(description, str):
@@ -1188,7 +1876,7 @@ class Bintray(object):
         :param file_path: associated file path
         :return: request response
         """
-        url = "{}/file_version/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, file_path)
+        url = "{}/file_version/{}/{}/{}".format(self._api_url, subject, repo, file_path)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
         return response
@@ -1207,7 +1895,7 @@ class Bintray(object):
         :param package: package name
         :return: request response
         """
-        url = "{}/packages/{}/{}/{}/readme".format(Bintray.BINTRAY_URL, subject, repo, package)
+        url = "{}/packages/{}/{}/{}/readme".format(self._api_url, subject, repo, package)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
         return response
@@ -1233,7 +1921,7 @@ class Bintray(object):
         if github and (bintray_syntax or bintray_content):
             raise ValueError("Only accept github or bintray")
 
-        url = "{}/packages/{}/{}/{}/readme".format(Bintray.BINTRAY_URL, subject, repo, package)
+        url = "{}/packages/{}/{}/{}/readme".format(self._api_url, subject, repo, package)
         json_data = {}
         if isinstance(github, str):
             json_data["github"] = {
@@ -1273,7 +1961,7 @@ class Bintray(object):
         if github and (bintray_syntax or bintray_content):
             raise ValueError("Only accept github or bintray")
 
-        url = "{}/products/{}/{}/readme".format(Bintray.BINTRAY_URL, subject, product)
+        url = "{}/products/{}/{}/readme".format(self._api_url, subject, product)
         json_data = {}
         if isinstance(github, str):
             json_data["github"] = {
@@ -1302,7 +1990,7 @@ class Bintray(object):
         :param product: product name
         :return: request response
         """
-        url = "{}/products/{}/{}/readme".format(Bintray.BINTRAY_URL, subject, product)
+        url = "{}/products/{}/{}/readme".format(self._api_url, subject, product)
 
         response = self._requester.delete(url)
         self._logger.info("Delete successfully")
@@ -1318,7 +2006,7 @@ class Bintray(object):
         :param user: user name
         :return: user information
         """
-        url = "{}/users/{}".format(Bintray.BINTRAY_URL, user)
+        url = "{}/users/{}".format(self._api_url, user)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
         return response
@@ -1334,7 +2022,7 @@ class Bintray(object):
         :param organization: organization name to be searched
         :return: organization information
         """
-        url = "{}/orgs/{}".format(Bintray.BINTRAY_URL, organization)
+        url = "{}/orgs/{}".format(self._api_url, organization)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
         return response
@@ -1348,7 +2036,7 @@ class Bintray(object):
         :param start_pos: initial index position
         :return: follower list
         """
-        url = "{}/users/{}/followers".format(Bintray.BINTRAY_URL, user)
+        url = "{}/users/{}/followers".format(self._api_url, user)
         params = None
 
         if isinstance(start_pos, int):
@@ -1358,6 +2046,19 @@ class Bintray(object):
         self._logger.info("Get successfully")
         return response
 
+    def iter_followers(self, user, prefetch=False):
+        """ Iterate over all followers of the specified repository owner, walking through all
+            result pages.
+
+            Security: Authenticated user is required
+
+        :param user: user name to be searched
+        :param prefetch: request the next page while the current one is consumed
+        :return: generator of followers
+        """
+        url = "{}/users/{}/followers".format(self._api_url, user)
+        return self._paginate("GET", url, prefetch=prefetch)
+
     def search_user(self, name):
         """ Search for a user.
 
@@ -1367,7 +2068,7 @@ class Bintray(object):
         :return: Returns an array of results, where elements are similar to the result of getting a
                  single user.
         """
-        url = "{}/search/users".format(Bintray.BINTRAY_URL)
+        url = "{}/search/users".format(self._api_url)
         params = {"name": name}
 
         response = self._requester.get(url, params=params)
@@ -1388,7 +2089,7 @@ class Bintray(object):
         :param repo: repository name
         :return: list with web hooks
         """
-        url = "{}/webhooks/{}".format(Bintray.BINTRAY_URL, subject)
+        url = "{}/webhooks/{}".format(self._api_url, subject)
         if isinstance(repo, str):
             url += '/' + repo
 
@@ -1414,7 +2115,7 @@ class Bintray(object):
         :param method: HTTP method for callback e.g. "post"
         :return: request response
         """
-        request_url = "{}/webhooks/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, package)
+        request_url = "{}/webhooks/{}/{}/{}".format(self._api_url, subject, repo, package)
         json_data = {
             "url": url,
             "method": method
@@ -1441,7 +2142,7 @@ class Bintray(object):
         :param method: HTTP method for callback
         :return: request response
         """
-        url_requrest = "{}/webhooks/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, package,
+        url_requrest = "{}/webhooks/{}/{}/{}".format(self._api_url, subject, repo, package,
                                                      version)
         json_data = {
             "url": url,
@@ -1463,7 +2164,7 @@ class Bintray(object):
         :param package: package name
         :return: request response
         """
-        url = "{}/webhooks/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, package)
+        url = "{}/webhooks/{}/{}/{}".format(self._api_url, subject, repo, package)
 
         response = self._requester.delete(url)
         self._logger.info("Delete successfully")
@@ -1482,7 +2183,7 @@ class Bintray(object):
         :param org: organization name
         :return: team list
         """
-        url = "{}/orgs/{}/teams".format(Bintray.BINTRAY_URL, org)
+        url = "{}/orgs/{}/teams".format(self._api_url, org)
 
         response = self._requester.get(url)
         self._logger.info("Get successfully")
@@ -1498,7 +2199,7 @@ class Bintray(object):
         :param user: user name
         :return: team list
         """
-        url = "{}/users/{}/teams".format(Bintray.BINTRAY_URL, user)
+        url = "{}/users/{}/teams".format(self._api_url, user)
 
         response = self._requester.get(url)
         self._logger.info("Get successfully")
@@ -1517,7 +2218,7 @@ class Bintray(object):
         :param team: team name
         :return: team details
         """
-        url = "{}/orgs/{}/teams/{}".format(Bintray.BINTRAY_URL, org, team)
+        url = "{}/orgs/{}/teams/{}".format(self._api_url, org, team)
 
         response = self._requester.get(url)
         self._logger.info("Get successfully")
@@ -1535,7 +2236,7 @@ class Bintray(object):
         :param team: team name
         :return: team details
         """
-        url = "{}/users/{}/teams/{}".format(Bintray.BINTRAY_URL, user, team)
+        url = "{}/users/{}/teams/{}".format(self._api_url, user, team)
 
         response = self._requester.get(url)
         self._logger.info("Get successfully")
@@ -1559,7 +2260,7 @@ class Bintray(object):
                               members are allowed to create repositories.
         :return: request response
         """
-        url = "{}/orgs/{}/teams".format(Bintray.BINTRAY_URL, org)
+        url = "{}/orgs/{}/teams".format(self._api_url, org)
         json_data = {
             'name': name,
             'members': members,
@@ -1590,7 +2291,7 @@ class Bintray(object):
                               members are allowed to create repositories.
         :return: request response
         """
-        url = "{}/users/{}/teams".format(Bintray.BINTRAY_URL, user)
+        url = "{}/users/{}/teams".format(self._api_url, user)
         json_data = {
             'name': name,
             'members': members,
@@ -1621,7 +2322,7 @@ class Bintray(object):
                               members are allowed to create repositories.
         :return: request response
         """
-        url = "{}/orgs/{}/teams/{}".format(Bintray.BINTRAY_URL, org, team)
+        url = "{}/orgs/{}/teams/{}".format(self._api_url, org, team)
         json_data = {}
         if isinstance(members, list):
             json_data['members'] = members
@@ -1655,7 +2356,7 @@ class Bintray(object):
                               members are allowed to create repositories.
         :return: request response
         """
-        url = "{}/users/{}/teams/{}".format(Bintray.BINTRAY_URL, user, team)
+        url = "{}/users/{}/teams/{}".format(self._api_url, user, team)
         json_data = {}
         if isinstance(members, list):
             json_data['members'] = members
@@ -1682,7 +2383,7 @@ class Bintray(object):
         :param team: team name
         :return: request response
         """
-        url = "{}/orgs/{}/teams/{}".format(Bintray.BINTRAY_URL, org, team)
+        url = "{}/orgs/{}/teams/{}".format(self._api_url, org, team)
 
         response = self._requester.delete(url)
         self._logger.info("Delete successfully")
@@ -1699,7 +2400,7 @@ class Bintray(object):
         :param team: team name
         :return: request response
         """
-        url = "{}/users/{}/teams/{}".format(Bintray.BINTRAY_URL, user, team)
+        url = "{}/users/{}/teams/{}".format(self._api_url, user, team)
 
         response = self._requester.delete(url)
         self._logger.info("Delete successfully")
@@ -1717,7 +2418,7 @@ class Bintray(object):
         :param repo: repository name
         :return: request response
         """
-        url = "{}/repos/{}/{}/permissions".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/repos/{}/{}/permissions".format(self._api_url, subject, repo)
 
         response = self._requester.get(url)
         self._logger.info("Get successfully")
@@ -1736,7 +2437,7 @@ class Bintray(object):
         :param team: team name
         :return: request response
         """
-        url = "{}/repos/{}/{}/permissions/{}".format(Bintray.BINTRAY_URL, subject, repo, team)
+        url = "{}/repos/{}/{}/permissions/{}".format(self._api_url, subject, repo, team)
 
         response = self._requester.get(url)
         self._logger.info("Get successfully")
@@ -1757,7 +2458,7 @@ class Bintray(object):
         :param permission: permission type e.g. "read", "write"
         :return: request response
         """
-        url = "{}/repos/{}/{}/permissions".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/repos/{}/{}/permissions".format(self._api_url, subject, repo)
         json_data = {"team": team, "permission": permission}
 
         response = self._requester.put(url, json=json_data)
@@ -1776,7 +2477,7 @@ class Bintray(object):
         :param team: team name
         :return: request response
         """
-        url = "{}/repos/{}/{}/permissions/{}".format(Bintray.BINTRAY_URL, subject, repo, team)
+        url = "{}/repos/{}/{}/permissions/{}".format(self._api_url, subject, repo, team)
 
         response = self._requester.delete(url)
         self._logger.info("Delete successfully")
@@ -1796,7 +2497,7 @@ class Bintray(object):
         :param product: product name
         :return: List of EULAs
         """
-        url = "{}/products/{}/{}/eulas".format(Bintray.BINTRAY_URL, subject, product)
+        url = "{}/products/{}/{}/eulas".format(self._api_url, subject, product)
 
         response = self._requester.get(url)
         self._logger.info("Get successfully")
@@ -1815,7 +2516,7 @@ class Bintray(object):
         :param eula: EULA name
         :return: Dictionary with EULA details
         """
-        url = "{}/products/{}/{}/eulas/{}".format(Bintray.BINTRAY_URL, subject, product, eula)
+        url = "{}/products/{}/{}/eulas/{}".format(self._api_url, subject, product, eula)
 
         response = self._requester.get(url)
         self._logger.info("Get successfully")
@@ -1839,7 +2540,7 @@ class Bintray(object):
         :param default: True if all product versions should use same EULA.
         :return: request response
         """
-        url = "{}/products/{}/{}/eulas".format(Bintray.BINTRAY_URL, subject, product)
+        url = "{}/products/{}/{}/eulas".format(self._api_url, subject, product)
         json_data = {
             "name": name,
             "syntax": syntax,
@@ -1871,7 +2572,7 @@ class Bintray(object):
         :param default: True if all product versions should use same EULA.
         :return: request response
         """
-        url = "{}/products/{}/{}/eulas/{}".format(Bintray.BINTRAY_URL, subject, product, eula)
+        url = "{}/products/{}/{}/eulas/{}".format(self._api_url, subject, product, eula)
         json_data = {}
         if isinstance(syntax, str):
             json_data["syntax"] = syntax
@@ -1900,7 +2601,7 @@ class Bintray(object):
         :param eula: eula name to be removed
         :return: request response
         """
-        url = "{}/products/{}/{}/eulas/{}".format(Bintray.BINTRAY_URL, subject, product, eula)
+        url = "{}/products/{}/{}/eulas/{}".format(self._api_url, subject, product, eula)
 
         response = self._requester.delete(url)
         self._logger.info("Delete successfully")
@@ -1918,7 +2619,7 @@ class Bintray(object):
         :param subject: repository owner
         :return: request response
         """
-        url = "{}/subjects/{}/keypair".format(Bintray.BINTRAY_URL, subject)
+        url = "{}/subjects/{}/keypair".format(self._api_url, subject)
 
         response = self._requester.post(url)
         self._logger.info("Generate successfully")
@@ -1943,7 +2644,7 @@ class Bintray(object):
         :param attributes: attributes to be listed
         :return: a list of attributes
         """
-        url = "{}/packages/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, package)
+        url = "{}/packages/{}/{}/{}".format(self._api_url, subject, repo, package)
         if version:
             url += "/versions/{}".format(version)
         url += "/attributes"
@@ -1978,7 +2679,7 @@ class Bintray(object):
                                                          "type": "string"}]
         :return: request response
         """
-        url = "{}/packages/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, package)
+        url = "{}/packages/{}/{}/{}".format(self._api_url, subject, repo, package)
         if version:
             url += "/versions/{}".format(version)
         url += "/attributes"
@@ -2007,7 +2708,7 @@ class Bintray(object):
                                                          "type": "string"}]
         :return: request response
         """
-        url = "{}/packages/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, package)
+        url = "{}/packages/{}/{}/{}".format(self._api_url, subject, repo, package)
         if version:
             url += "/versions/{}".format(version)
         url += "/attributes"
@@ -2032,7 +2733,7 @@ class Bintray(object):
                                                          "type": "string"}]
         :return: request response
         """
-        url = "{}/packages/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, package)
+        url = "{}/packages/{}/{}/{}".format(self._api_url, subject, repo, package)
         if version:
             url += "/versions/{}".format(version)
         url += "/attributes"
@@ -2066,7 +2767,7 @@ class Bintray(object):
         :param attribute_values: True to search attribute values
         :return: Returns an array of results
         """
-        url = "{}/search/attributes/{}/{}".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/search/attributes/{}/{}".format(self._api_url, subject, repo)
         if package:
             url += "/{}/versions".format(package)
 
@@ -2089,7 +2790,7 @@ class Bintray(object):
         :param file_path: file to be checked
         :return: a list of attributes
         """
-        url = "{}/files/{}/{}/{}/attributes".format(Bintray.BINTRAY_URL, subject, repo, file_path)
+        url = "{}/files/{}/{}/{}/attributes".format(self._api_url, subject, repo, file_path)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
         return response
@@ -2108,7 +2809,7 @@ class Bintray(object):
         :param attributes: attributes to be configured
         :return: request response
         """
-        url = "{}/files/{}/{}/{}/attributes".format(Bintray.BINTRAY_URL, subject, repo, file_path)
+        url = "{}/files/{}/{}/{}/attributes".format(self._api_url, subject, repo, file_path)
         response = self._requester.post(url, json=attributes)
         self._logger.info("Set successfully")
         return response
@@ -2125,7 +2826,7 @@ class Bintray(object):
         :param attributes: attributes to be configured
         :return: request response
         """
-        url = "{}/files/{}/{}/{}/attributes".format(Bintray.BINTRAY_URL, subject, repo, file_path)
+        url = "{}/files/{}/{}/{}/attributes".format(self._api_url, subject, repo, file_path)
         response = self._requester.patch(url, json=attributes)
         self._logger.info("Set successfully")
         return response
@@ -2145,7 +2846,7 @@ class Bintray(object):
         :param attributes: attributes to be deleted
         :return: request response
         """
-        url = "{}/files/{}/{}/{}/attributes".format(Bintray.BINTRAY_URL, subject, repo, file_path)
+        url = "{}/files/{}/{}/{}/attributes".format(self._api_url, subject, repo, file_path)
         params = {"names": ",".join(attributes)}
         response = self._requester.delete(url, params=params)
         self._logger.info("Set successfully")
@@ -2165,7 +2866,7 @@ class Bintray(object):
         :param attributes: attributes to be searched
         :return: request response
         """
-        url = "{}/files/{}/{}/search/attributes".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/files/{}/{}/search/attributes".format(self._api_url, subject, repo)
         response = self._requester.post(url, json=attributes)
         self._logger.info("Search successfully")
         return response
@@ -2184,7 +2885,7 @@ class Bintray(object):
         :param eula_name: filter by Eula name
         :return: A list of EULAs
         """
-        url = "{}/products/{}/{}/signed_eulas".format(Bintray.BINTRAY_URL, subject, product)
+        url = "{}/products/{}/{}/signed_eulas".format(self._api_url, subject, product)
         params = {}
         if from_date:
             params["from"] = from_date
@@ -2210,7 +2911,7 @@ class Bintray(object):
         :param eula_name: filter by Eula name
         :return: a list of EULAs
         """
-        url = "{}/products/{}/_all/signed_eulas".format(Bintray.BINTRAY_URL, subject)
+        url = "{}/products/{}/_all/signed_eulas".format(self._api_url, subject)
         params = {}
         if from_date:
             params["from"] = from_date
@@ -2235,7 +2936,7 @@ class Bintray(object):
         :param package: package name
         :return: returns the release notes for a specific package by subject
         """
-        url = "{}/packages/{}/{}/{}/release_notes".format(Bintray.BINTRAY_URL, subject, repo,
+        url = "{}/packages/{}/{}/{}/release_notes".format(self._api_url, subject, repo,
                                                           package)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
@@ -2255,7 +2956,7 @@ class Bintray(object):
         :param github_release_notes_file: GitHub release notes file path
         :return: request response
         """
-        url = "{}/packages/{}/{}/{}/release_notes".format(Bintray.BINTRAY_URL, subject, repo,
+        url = "{}/packages/{}/{}/{}/release_notes".format(self._api_url, subject, repo,
                                                           package)
         json_data = {"github": {
                         "github_repo": github_repo,
@@ -2278,7 +2979,7 @@ class Bintray(object):
         :param content: release notes content
         :return: request response
         """
-        url = "{}/packages/{}/{}/{}/release_notes".format(Bintray.BINTRAY_URL, subject, repo,
+        url = "{}/packages/{}/{}/{}/release_notes".format(self._api_url, subject, repo,
                                                           package)
         json_data = {"package": package,
                      "repo": repo,
@@ -2302,7 +3003,7 @@ class Bintray(object):
         :param package: package name
         :return: response request
         """
-        url = "{}/packages/{}/{}/{}/release_notes".format(Bintray.BINTRAY_URL, subject, repo,
+        url = "{}/packages/{}/{}/{}/release_notes".format(self._api_url, subject, repo,
                                                           package)
         response = self._requester.delete(url)
         self._logger.info("Delete successfully")
@@ -2320,7 +3021,7 @@ class Bintray(object):
         :param version: package version
         :return: release notes
         """
-        url = "{}/packages/{}/{}/{}/versions/{}/release_notes".format(Bintray.BINTRAY_URL, subject,
+        url = "{}/packages/{}/{}/{}/versions/{}/release_notes".format(self._api_url, subject,
                                                                       repo, package, version)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
@@ -2343,7 +3044,7 @@ class Bintray(object):
         :param github_release_notes_file: GitHub release notes file path
         :return: request response
         """
-        url = "{}/packages/{}/{}/{}/versions/{}/release_notes".format(Bintray.BINTRAY_URL, subject,
+        url = "{}/packages/{}/{}/{}/versions/{}/release_notes".format(self._api_url, subject,
                                                                       repo, package, version)
         json_data = {"github": {
                         "github_repo": github_repo,
@@ -2369,7 +3070,7 @@ class Bintray(object):
         :param content: release notes content
         :return: request response
         """
-        url = "{}/packages/{}/{}/{}/versions/{}/release_notes".format(Bintray.BINTRAY_URL, subject,
+        url = "{}/packages/{}/{}/{}/versions/{}/release_notes".format(self._api_url, subject,
                                                                       repo, package, version)
         json_data = {"bintray": {
                         "syntax": syntax,
@@ -2392,7 +3093,7 @@ class Bintray(object):
         :param package: package name
         :return: response request
         """
-        url = "{}/packages/{}/{}/{}/logs".format(Bintray.BINTRAY_URL, subject, repo, package)
+        url = "{}/packages/{}/{}/{}/logs".format(self._api_url, subject, repo, package)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
         return response
@@ -2411,7 +3112,7 @@ class Bintray(object):
         :param local_log_name: log to be saved in local storage
         :return: response request
         """
-        url = "{}/packages/{}/{}/{}/logs/{}".format(Bintray.BINTRAY_URL, subject, repo, package,
+        url = "{}/packages/{}/{}/{}/logs/{}".format(self._api_url, subject, repo, package,
                                                     remote_log_name)
         content = self._requester.download(url, add_status_code=False)
         with open(local_log_name, 'wb') as local_fd:
@@ -2428,7 +3129,7 @@ class Bintray(object):
         :param subject: repository owner
         :return: response request
         """
-        url = "{}/stream/{}".format(Bintray.BINTRAY_URL, subject)
+        url = "{}/stream/{}".format(self._api_url, subject)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
         return response
@@ -2444,7 +3145,7 @@ class Bintray(object):
         :param subject: repository owner
         :return: a list of products associated to the subject
         """
-        url = "{}/products/{}".format(Bintray.BINTRAY_URL, subject)
+        url = "{}/products/{}".format(self._api_url, subject)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
         return response
@@ -2459,7 +3160,7 @@ class Bintray(object):
         :param product: product name
         :return: details of a product
         """
-        url = "{}/products/{}/{}".format(Bintray.BINTRAY_URL, subject, product)
+        url = "{}/products/{}/{}".format(self._api_url, subject, product)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
         return response
@@ -2480,7 +3181,7 @@ class Bintray(object):
         :param sign_url_expiry: expiration time
         :return: request response
         """
-        url = "{}/products/{}".format(Bintray.BINTRAY_URL, subject)
+        url = "{}/products/{}".format(self._api_url, subject)
         json_data = {}
         if name:
             json_data["name"] = name
@@ -2516,7 +3217,7 @@ class Bintray(object):
         :param packages: list of packages associated to the product
         :return: request response
         """
-        url = "{}/products/{}/{}".format(Bintray.BINTRAY_URL, subject, product)
+        url = "{}/products/{}/{}".format(self._api_url, subject, product)
         json_data = {}
         if display_name:
             json_data["display_name"] = display_name
@@ -2545,7 +3246,7 @@ class Bintray(object):
         :param product: product name
         :return: request response
         """
-        url = "{}/products/{}/{}".format(Bintray.BINTRAY_URL, subject, product)
+        url = "{}/products/{}/{}".format(self._api_url, subject, product)
         response = self._requester.delete(url)
         self._logger.info("Delete successfully")
         return response
@@ -2560,7 +3261,7 @@ class Bintray(object):
         :param org: organization name
         :return: request response
         """
-        url = "{}/usage_threshold/organization/{}".format(Bintray.BINTRAY_URL, org)
+        url = "{}/usage_threshold/organization/{}".format(self._api_url, org)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
         return response
@@ -2574,7 +3275,7 @@ class Bintray(object):
         :param repo: repo name
         :return: request response
         """
-        url = "{}/usage_threshold/repo/{}/{}".format(Bintray.BINTRAY_URL, org, repo)
+        url = "{}/usage_threshold/repo/{}/{}".format(self._api_url, org, repo)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
         return response
@@ -2588,7 +3289,7 @@ class Bintray(object):
         :param business_unit: business unit name
         :return: request response
         """
-        url = "{}/usage_threshold/business_unit/{}/{}".format(Bintray.BINTRAY_URL, org,
+        url = "{}/usage_threshold/business_unit/{}/{}".format(self._api_url, org,
                                                               business_unit)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
@@ -2608,7 +3309,7 @@ class Bintray(object):
         :param alert_to_admins: send alerts to admins.
         :return: request response
         """
-        url = "{}/usage_threshold/organization/{}".format(Bintray.BINTRAY_URL, org)
+        url = "{}/usage_threshold/organization/{}".format(self._api_url, org)
 
         json_data = {}
         if monthly_storage:
@@ -2642,7 +3343,7 @@ class Bintray(object):
         :param alert_to_admins: send alerts to admins.
         :return: request response
         """
-        url = "{}/usage_threshold/repo/{}/{}".format(Bintray.BINTRAY_URL, org, repo)
+        url = "{}/usage_threshold/repo/{}/{}".format(self._api_url, org, repo)
 
         json_data = {}
         if monthly_storage:
@@ -2676,7 +3377,7 @@ class Bintray(object):
         :param alert_to_admins: send alerts to admins.
         :return: request response
         """
-        url = "{}/usage_threshold/business_unit/{}/{}".format(Bintray.BINTRAY_URL, org,
+        url = "{}/usage_threshold/business_unit/{}/{}".format(self._api_url, org,
                                                               business_unit)
 
         json_data = {}
@@ -2709,7 +3410,7 @@ class Bintray(object):
         :param alert_to_admins: send alerts to admins.
         :return: request response
         """
-        url = "{}/usage_threshold/organization/{}".format(Bintray.BINTRAY_URL, org)
+        url = "{}/usage_threshold/organization/{}".format(self._api_url, org)
 
         json_data = {}
         if monthly_storage:
@@ -2744,7 +3445,7 @@ class Bintray(object):
         :param alert_to_admins: send alerts to admins.
         :return: request response
         """
-        url = "{}/usage_threshold/repo/{}/{}".format(Bintray.BINTRAY_URL, org, repo)
+        url = "{}/usage_threshold/repo/{}/{}".format(self._api_url, org, repo)
 
         json_data = {}
         if monthly_storage:
@@ -2779,7 +3480,7 @@ class Bintray(object):
         :param alert_to_admins: send alerts to admins.
         :return: request response
         """
-        url = "{}/usage_threshold/business_unit/{}/{}".format(Bintray.BINTRAY_URL, org,
+        url = "{}/usage_threshold/business_unit/{}/{}".format(self._api_url, org,
                                                               business_unit)
         json_data = {}
         if monthly_storage:
@@ -2806,7 +3507,7 @@ class Bintray(object):
         :param org: organization name
         :return: request response
         """
-        url = "{}/usage_threshold/organization/{}".format(Bintray.BINTRAY_URL, org)
+        url = "{}/usage_threshold/organization/{}".format(self._api_url, org)
         response = self._requester.delete(url)
         self._logger.info("Delete successfully")
         return response
@@ -2820,7 +3521,7 @@ class Bintray(object):
         :param repo: repository name
         :return: request response
         """
-        url = "{}/usage_threshold/repo/{}/{}".format(Bintray.BINTRAY_URL, org, repo)
+        url = "{}/usage_threshold/repo/{}/{}".format(self._api_url, org, repo)
         response = self._requester.delete(url)
         self._logger.info("Delete successfully")
         return response
@@ -2834,7 +3535,7 @@ class Bintray(object):
         :param business_unit: business unit name
         :return: request response
         """
-        url = "{}/usage_threshold/business_unit/{}/{}".format(Bintray.BINTRAY_URL, org,
+        url = "{}/usage_threshold/business_unit/{}/{}".format(self._api_url, org,
                                                               business_unit)
         response = self._requester.delete(url)
         self._logger.info("Delete successfully")
@@ -2853,7 +3554,7 @@ class Bintray(object):
         :param start_name: name prefix filter
         :return: list of packages
         """
-        url = "{}/repos/{}/{}/packages".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/repos/{}/{}/packages".format(self._api_url, subject, repo)
         params = {}
         if start_pos:
             params["start_pos"] = start_pos
@@ -2863,6 +3564,24 @@ class Bintray(object):
         self._logger.info("Get successfully")
         return response
 
+    def iter_packages(self, subject, repo, start_name=None, prefetch=False):
+        """ Iterate over all packages in the specified repository, walking through all result
+            pages.
+
+            Security: Authenticated user with 'read' permission, or repository read entitlement.
+
+        :param subject: repository owner
+        :param repo: repository name
+        :param start_name: name prefix filter
+        :param prefetch: request the next page while the current one is consumed
+        :return: generator of packages
+        """
+        url = "{}/repos/{}/{}/packages".format(self._api_url, subject, repo)
+        params = {}
+        if start_name:
+            params["start_name"] = start_name
+        return self._paginate("GET", url, params=params, prefetch=prefetch)
+
     def get_package(self, subject, repo, package, attribute_values=True):
         """ Get general information about a specified package with package name.
 
@@ -2874,7 +3593,7 @@ class Bintray(object):
         :param attribute_values: show attribute values
         :return: package details
         """
-        url = "{}/packages/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, package)
+        url = "{}/packages/{}/{}/{}".format(self._api_url, subject, repo, package)
         params = {"attribute_values": bool_to_number(attribute_values)}
         response = self._requester.get(url, params=params)
         self._logger.info("Get successfully")
@@ -2890,7 +3609,7 @@ class Bintray(object):
         :param file_path: file path to be searched
         :return: package details
         """
-        url = "{}/file_package/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, file_path)
+        url = "{}/file_package/{}/{}/{}".format(self._api_url, subject, repo, file_path)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
         return response
@@ -2908,7 +3627,7 @@ class Bintray(object):
         :param repo: repository name
         :return: package details
         """
-        url = "{}/search/packages/maven".format(Bintray.BINTRAY_URL)
+        url = "{}/search/packages/maven".format(self._api_url)
         params = {}
         if group_id:
             params["g"] = group_id
@@ -2953,7 +3672,7 @@ class Bintray(object):
         :param public_stats: stats are public (available only for Premium accounts)
         :return: request response
         """
-        url = "{}/packages/{}/{}".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/packages/{}/{}".format(self._api_url, subject, repo)
         json_data = {"name": package}
         if desc:
             json_data["desc"] = desc
@@ -2993,7 +3712,7 @@ class Bintray(object):
         :param package: package name
         :return: request response
         """
-        url = "{}/packages/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, package)
+        url = "{}/packages/{}/{}/{}".format(self._api_url, subject, repo, package)
         response = self._requester.delete(url)
         self._logger.info("Delete successfully")
         return response
@@ -3023,7 +3742,7 @@ class Bintray(object):
         :param public_stats: stats are public (available only for Premium accounts)
         :return: request response
         """
-        url = "{}/packages/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, package)
+        url = "{}/packages/{}/{}/{}".format(self._api_url, subject, repo, package)
         json_data = {}
         if desc:
             json_data["desc"] = desc
@@ -3065,7 +3784,7 @@ class Bintray(object):
         :param desc: desc name to filter
         :return: an array of results
         """
-        url = "{}/search/packages".format(Bintray.BINTRAY_URL)
+        url = "{}/search/packages".format(self._api_url)
         params = {}
         if package:
             params["name"] = package
@@ -3099,7 +3818,7 @@ class Bintray(object):
         :param to_date: end date range ISO8601 (yyyy-MM-dd'T'HH:mm:ss.SSSZ)
         :return: download details
         """
-        url = "{}/packages/{}/{}/{}".format(Bintray.BINTRAY_URL, subject, repo, package)
+        url = "{}/packages/{}/{}/{}".format(self._api_url, subject, repo, package)
         if version:
             url += "/versions/{}/stats/{}".format(version, suffix)
         else:
@@ -3180,7 +3899,7 @@ class Bintray(object):
         :param to_date: end date range ISO8601 (yyyy-MM-dd'T'HH:mm:ss.SSSZ)
         :return: download details
         """
-        url = "{}/usage/{}".format(Bintray.BINTRAY_URL, subject)
+        url = "{}/usage/{}".format(self._api_url, subject)
         json_data = {}
         if from_date:
             json_data["from"] = from_date
@@ -3203,7 +3922,7 @@ class Bintray(object):
         :param to_date: end date range ISO8601 (yyyy-MM-dd'T'HH:mm:ss.SSSZ)
         :return: download details
         """
-        url = "{}/usage/{}/{}".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/usage/{}/{}".format(self._api_url, subject, repo)
         json_data = {}
         if from_date:
             json_data["from"] = from_date
@@ -3230,7 +3949,7 @@ class Bintray(object):
         :param to_date: end date range ISO8601 (yyyy-MM-dd'T'HH:mm:ss.SSSZ)
         :return: download details
         """
-        url = "{}/usage/package_usage/{}/{}".format(Bintray.BINTRAY_URL, subject, repo)
+        url = "{}/usage/package_usage/{}/{}".format(self._api_url, subject, repo)
         if package:
             url += "/{}".format(package)
         params = {"start_pos": start_pos}
@@ -3244,6 +3963,32 @@ class Bintray(object):
         self._logger.info("Search successfully")
         return response
 
+    def iter_usage_report_for_package(self, subject, repo, package=None, from_date=None,
+                                      to_date=None, prefetch=False):
+        """ Iterate over the storage usage report of all packages, walking through all result
+            pages.
+
+            Security: Authenticated user with 'admin' permission for repo, or 'publish' permission
+                      for specific package.
+
+        :param subject: repository owner
+        :param repo: repository name
+        :param package: package name
+        :param from_date: initial date range ISO8601 (yyyy-MM-dd'T'HH:mm:ss.SSSZ)
+        :param to_date: end date range ISO8601 (yyyy-MM-dd'T'HH:mm:ss.SSSZ)
+        :param prefetch: request the next page while the current one is consumed
+        :return: generator of package usage reports
+        """
+        url = "{}/usage/package_usage/{}/{}".format(self._api_url, subject, repo)
+        if package:
+            url += "/{}".format(package)
+        json_data = {}
+        if from_date:
+            json_data["from"] = from_date
+        if to_date:
+            json_data["to"] = to_date
+        return self._paginate("POST", url, json=json_data, prefetch=prefetch)
+
     def get_usage_report_grouped_by_business_unit(self, subject, business_unit=None,
                                                   from_date=None,
                                                   to_date=None):
@@ -3259,7 +4004,7 @@ class Bintray(object):
         :param to_date: end date range ISO8601 (yyyy-MM-dd'T'HH:mm:ss.SSSZ)
         :return: download details
         """
-        url = "{}/usage/business_unit_usage/{}".format(Bintray.BINTRAY_URL, subject)
+        url = "{}/usage/business_unit_usage/{}".format(self._api_url, subject)
         if business_unit:
             url += "/{}".format(business_unit)
         json_data = {}
@@ -3282,7 +4027,7 @@ class Bintray(object):
         :param org: organization name
         :return: list of keys
         """
-        url = "{}/orgs/{}/access_keys".format(Bintray.BINTRAY_URL, org)
+        url = "{}/orgs/{}/access_keys".format(self._api_url, org)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
         return response
@@ -3295,7 +4040,7 @@ class Bintray(object):
         :param user: user name
         :return: list of keys
         """
-        url = "{}/users/{}/access_keys".format(Bintray.BINTRAY_URL, user)
+        url = "{}/users/{}/access_keys".format(self._api_url, user)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
         return response
@@ -3309,7 +4054,7 @@ class Bintray(object):
         :param access_key_id: access key id
         :return: list of keys
         """
-        url = "{}/orgs/{}/access_keys/{}".format(Bintray.BINTRAY_URL, org, access_key_id)
+        url = "{}/orgs/{}/access_keys/{}".format(self._api_url, org, access_key_id)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
         return response
@@ -3323,7 +4068,7 @@ class Bintray(object):
         :param access_key_id: access key id
         :return: list of keys
         """
-        url = "{}/users/{}/access_keys/{}".format(Bintray.BINTRAY_URL, user, access_key_id)
+        url = "{}/users/{}/access_keys/{}".format(self._api_url, user, access_key_id)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
         return response
@@ -3382,7 +4127,7 @@ class Bintray(object):
         :param api_only: allow access keys access to Bintray UI as well as to the API
         :return: request response
         """
-        request_url = "{}/orgs/{}/access_keys".format(Bintray.BINTRAY_URL, org)
+        request_url = "{}/orgs/{}/access_keys".format(self._api_url, org)
         return self._create_access_key(request_url, id, url, cache_for_secs, expiry, white_cidrs,
                                        black_cidrs, api_only)
 
@@ -3402,7 +4147,7 @@ class Bintray(object):
         :param api_only: allow access keys access to Bintray UI as well as to the API
         :return: request response
         """
-        request_url = "{}/users/{}/access_keys".format(Bintray.BINTRAY_URL, user)
+        request_url = "{}/users/{}/access_keys".format(self._api_url, user)
         return self._create_access_key(request_url, id, url, cache_for_secs, expiry, white_cidrs,
                                        black_cidrs, api_only)
 
@@ -3415,7 +4160,7 @@ class Bintray(object):
         :param access_key_id: access key id
         :return: request response
         """
-        url = "{}/orgs/{}/access_keys/{}".format(Bintray.BINTRAY_URL, org, access_key_id)
+        url = "{}/orgs/{}/access_keys/{}".format(self._api_url, org, access_key_id)
         response = self._requester.delete(url)
         self._logger.info("Delete successfully")
         return response
@@ -3429,7 +4174,7 @@ class Bintray(object):
         :param access_key_id: access key id
         :return: request response
         """
-        url = "{}/users/{}/access_keys/{}".format(Bintray.BINTRAY_URL, user, access_key_id)
+        url = "{}/users/{}/access_keys/{}".format(self._api_url, user, access_key_id)
         response = self._requester.delete(url)
         self._logger.info("Delete successfully")
         return response
@@ -3481,7 +4226,7 @@ class Bintray(object):
         :param black_cidrs: will block access for all IPs that exist in the specified range.
         :return: request response
         """
-        request_url = "{}/orgs/{}/access_keys/{}".format(Bintray.BINTRAY_URL, org, access_key_id)
+        request_url = "{}/orgs/{}/access_keys/{}".format(self._api_url, org, access_key_id)
         return self._update_access_key(request_url, url, cache_for_secs, expiry, white_cidrs,
                                        black_cidrs)
 
@@ -3500,7 +4245,7 @@ class Bintray(object):
         :param black_cidrs: will block access for all IPs that exist in the specified range.
         :return: request response
         """
-        request_url = "{}/users/{}/access_keys/{}".format(Bintray.BINTRAY_URL, user, access_key_id)
+        request_url = "{}/users/{}/access_keys/{}".format(self._api_url, user, access_key_id)
         return self._update_access_key(request_url, url, cache_for_secs, expiry, white_cidrs,
                                        black_cidrs)
 
@@ -3517,17 +4262,17 @@ class Bintray(object):
         :return: entitlements list
         """
         if product:
-            url = "{}/products/{}/{}/entitlements".format(Bintray.BINTRAY_URL, subject, product)
+            url = "{}/products/{}/{}/entitlements".format(self._api_url, subject, product)
         else:
             if version:
-                url = "{}/packages/{}/{}/{}/versions/{}/entitlements".format(Bintray.BINTRAY_URL,
+                url = "{}/packages/{}/{}/{}/versions/{}/entitlements".format(self._api_url,
                                                                              subject, repo,
                                                                              package, version)
             elif package:
-                url = "{}/packages/{}/{}/{}/entitlements".format(Bintray.BINTRAY_URL, subject, repo,
+                url = "{}/packages/{}/{}/{}/entitlements".format(self._api_url, subject, repo,
                                                                  package)
             else:
-                url = "{}/packages/{}/{}/entitlements".format(Bintray.BINTRAY_URL, subject, repo)
+                url = "{}/packages/{}/{}/entitlements".format(self._api_url, subject, repo)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
         return response
@@ -3548,19 +4293,19 @@ class Bintray(object):
         :return: entitlements list
         """
         if product:
-            url = "{}/products/{}/{}/entitlements/{}".format(Bintray.BINTRAY_URL, subject, product,
+            url = "{}/products/{}/{}/entitlements/{}".format(self._api_url, subject, product,
                                                              entitlement_id)
         else:
             if version:
-                url = "{}/packages/{}/{}/{}/versions/{}/entitlements/{}".format(Bintray.BINTRAY_URL,
+                url = "{}/packages/{}/{}/{}/versions/{}/entitlements/{}".format(self._api_url,
                                                                                 subject, repo,
                                                                                 package, version,
                                                                                 entitlement_id)
             elif package:
-                url = "{}/packages/{}/{}/{}/entitlements/{}".format(Bintray.BINTRAY_URL, subject,
+                url = "{}/packages/{}/{}/{}/entitlements/{}".format(self._api_url, subject,
                                                                     repo, package, entitlement_id)
             else:
-                url = "{}/packages/{}/{}/entitlements/{}".format(Bintray.BINTRAY_URL, subject, repo,
+                url = "{}/packages/{}/{}/entitlements/{}".format(self._api_url, subject, repo,
                                                                  entitlement_id)
         response = self._requester.get(url)
         self._logger.info("Get successfully")
@@ -3596,17 +4341,17 @@ class Bintray(object):
         :return: entitlements list
         """
         if product:
-            url = "{}/products/{}/{}/entitlements".format(Bintray.BINTRAY_URL, subject, product)
+            url = "{}/products/{}/{}/entitlements".format(self._api_url, subject, product)
         else:
             if version:
-                url = "{}/packages/{}/{}/{}/versions/{}/entitlements".format(Bintray.BINTRAY_URL,
+                url = "{}/packages/{}/{}/{}/versions/{}/entitlements".format(self._api_url,
                                                                              subject, repo,
                                                                              package, version)
             elif package:
-                url = "{}/packages/{}/{}/{}/entitlements".format(Bintray.BINTRAY_URL, subject, repo,
+                url = "{}/packages/{}/{}/{}/entitlements".format(self._api_url, subject, repo,
                                                                  package)
             else:
-                url = "{}/packages/{}/{}/entitlements".format(Bintray.BINTRAY_URL, subject, repo)
+                url = "{}/packages/{}/{}/entitlements".format(self._api_url, subject, repo)
 
         json_data = {}
         if access:
@@ -3638,19 +4383,19 @@ class Bintray(object):
         :return: entitlements list
         """
         if product:
-            url = "{}/products/{}/{}/entitlements/{}".format(Bintray.BINTRAY_URL, subject, product,
+            url = "{}/products/{}/{}/entitlements/{}".format(self._api_url, subject, product,
                                                              entitlement_id)
         else:
             if version:
-                url = "{}/packages/{}/{}/{}/versions/{}/entitlements/{}".format(Bintray.BINTRAY_URL,
+                url = "{}/packages/{}/{}/{}/versions/{}/entitlements/{}".format(self._api_url,
                                                                                 subject, repo,
                                                                                 package, version,
                                                                                 entitlement_id)
             elif package:
-                url = "{}/packages/{}/{}/{}/entitlements/{}".format(Bintray.BINTRAY_URL, subject,
+                url = "{}/packages/{}/{}/{}/entitlements/{}".format(self._api_url, subject,
                                                                     repo, package, entitlement_id)
             else:
-                url = "{}/packages/{}/{}/entitlements/{}".format(Bintray.BINTRAY_URL, subject, repo,
+                url = "{}/packages/{}/{}/entitlements/{}".format(self._api_url, subject, repo,
                                                                  entitlement_id)
         response = self._requester.delete(url)
         self._logger.info("Delete successfully")
@@ -3686,19 +4431,19 @@ class Bintray(object):
         :return: entitlements list
         """
         if product:
-            url = "{}/products/{}/{}/entitlements/{}".format(Bintray.BINTRAY_URL, subject, product,
+            url = "{}/products/{}/{}/entitlements/{}".format(self._api_url, subject, product,
                                                              entitlement_id)
         else:
             if version:
-                url = "{}/packages/{}/{}/{}/versions/{}/entitlements/{}".format(Bintray.BINTRAY_URL,
+                url = "{}/packages/{}/{}/{}/versions/{}/entitlements/{}".format(self._api_url,
                                                                                 subject, repo,
                                                                                 package, version,
                                                                                 entitlement_id)
             elif package:
-                url = "{}/packages/{}/{}/{}/entitlements/{}".format(Bintray.BINTRAY_URL, subject,
+                url = "{}/packages/{}/{}/{}/entitlements/{}".format(self._api_url, subject,
                                                                     repo, package, entitlement_id)
             else:
-                url = "{}/packages/{}/{}/entitlements/{}".format(Bintray.BINTRAY_URL, subject, repo,
+                url = "{}/packages/{}/{}/entitlements/{}".format(self._api_url, subject, repo,
                                                                  entitlement_id)
         json_data = {}
         if access:
@@ -3731,7 +4476,7 @@ class Bintray(object):
         :param deep: return all entitlements under the given scope
         :return: entitlement found
         """
-        url = "{}/search/entitlements".format(Bintray.BINTRAY_URL)
+        url = "{}/search/entitlements".format(self._api_url)
         params = {"deep": bool_to_number(deep)}
         if access_key:
             params["access_key"] = access_key
@@ -3762,7 +4507,7 @@ class Bintray(object):
         :param deep: return all entitlements under the given scope
         :return: entitlement found
         """
-        url = "{}/search/entitlements".format(Bintray.BINTRAY_URL)
+        url = "{}/search/entitlements".format(self._api_url)
         params = {"deep": bool_to_number(deep)}
         if tag:
             params["tag"] = tag
@@ -0,0 +1,319 @@
+import abc
+import collections
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from urllib.parse import urlparse
+
+
+class Cache(abc.ABC):
+    """ Base class for GET response caches
+
+        Entries expire after a TTL chosen by the longest matching URL path prefix in "ttls"
+        (e.g. {"/repos": 300, "/licenses/oss_licenses": 3600}), or after the default TTL.
+
+        Expired entries are kept until evicted, so they can be revalidated with conditional
+        requests when they carry ETag or Last-Modified headers. A TTL of zero revalidates every
+        request.
+
+        Mutating requests invalidate cached entries of the same resource, of its parents and of
+        its children. See related_paths for resources shared between endpoint families.
+
+        Subclasses implement get, set, invalidate and clear.
+    """
+
+    def __init__(self, ttl=60, ttls=None, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        """ Initialize cache limits
+
+        :param ttl: default time to live in seconds
+        :param ttls: time to live per URL path prefix, as {"/repos": 300}
+        :param max_entries: maximum number of cached responses
+        :param max_bytes: maximum size of all cached bodies
+        """
+        self._ttl = ttl
+        self._ttls = sorted((ttls or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+
+    def get_ttl(self, url):
+        """ Retrieve the time to live of an URL
+
+        :param url: Web address
+        :return: time to live in seconds
+        """
+        path = urlparse(url).path
+        for prefix, ttl in self._ttls:
+            if _is_same_or_child(path, prefix):
+                return ttl
+        return self._ttl
+
+    @abc.abstractmethod
+    def get(self, key, stale=False):
+        """ Retrieve a cached entry
+
+        :param key: cache key
+        :param stale: return expired entries as well
+        :return: cached entry, or None when not found
+        """
+
+    @abc.abstractmethod
+    def set(self, key, entry):
+        """ Store an entry, evicting least recently used entries when needed
+
+        :param key: cache key
+        :param entry: dict with "path", "expires", "status_code", "headers" and "content"
+        """
+
+    @abc.abstractmethod
+    def invalidate(self, url):
+        """ Remove all entries related to a modified resource
+
+        :param url: URL of the modified resource
+        """
+
+    @abc.abstractmethod
+    def clear(self):
+        """ Remove all entries
+        """
+
+
+class MemoryCache(Cache):
+    """ In-process cache for GET responses, with TTL and LRU eviction
+
+        The cache is bounded by number of entries and by the total size of cached bodies; the
+        least recently used entries are evicted first.
+    """
+
+    def __init__(self, ttl=60, ttls=None, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        """ Initialize cache limits
+
+        :param ttl: default time to live in seconds
+        :param ttls: time to live per URL path prefix, as {"/repos": 300}
+        :param max_entries: maximum number of cached responses
+        :param max_bytes: maximum size of all cached bodies
+        """
+        super(MemoryCache, self).__init__(ttl, ttls, max_entries, max_bytes)
+        self._entries = collections.OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, stale=False):
+        """ Retrieve a cached entry
+
+        :param key: cache key
+        :param stale: return expired entries as well
+        :return: cached entry, or None when not found
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not stale and entry["expires"] <= time.time():
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        """ Store an entry, evicting least recently used entries when needed
+
+        :param key: cache key
+        :param entry: dict with "path", "expires", "status_code", "headers" and "content"
+        """
+        size = len(entry["content"])
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._size += size
+            while len(self._entries) > self._max_entries or self._size > self._max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry["content"])
+
+    def invalidate(self, url):
+        """ Remove all entries related to a modified resource
+
+        :param url: URL of the modified resource
+        """
+        paths = related_paths(urlparse(url).path)
+        with self._lock:
+            for key in [key for key, entry in self._entries.items()
+                        if any(_is_related(entry["path"], path) for path in paths)]:
+                self._remove(key)
+
+    def clear(self):
+        """ Remove all entries
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class DiskCache(Cache):
+    """ On-disk cache for GET responses, shared between processes
+
+        Entries are stored in a SQLite database in WAL mode, so many processes can read and
+        write the same cache concurrently. The cache is bounded by number of entries and by the
+        total size of cached bodies; the least recently used entries are evicted first.
+    """
+
+    # Default database location
+    DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".bintray", "cache.sqlite3")
+
+    def __init__(self, path=None, ttl=60, ttls=None, max_entries=65536,
+                 max_bytes=512 * 1024 * 1024, timeout=30):
+        """ Initialize cache limits and database
+
+        :param path: database file path. Default: DEFAULT_PATH
+        :param ttl: default time to live in seconds
+        :param ttls: time to live per URL path prefix, as {"/repos": 300}
+        :param max_entries: maximum number of cached responses
+        :param max_bytes: maximum size of all cached bodies
+        :param timeout: seconds to wait for a lock held by another process
+        """
+        super(DiskCache, self).__init__(ttl, ttls, max_entries, max_bytes)
+        self._path = path or DiskCache.DEFAULT_PATH
+        self._timeout = timeout
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(self._path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as connection:
+            connection.execute("""CREATE TABLE IF NOT EXISTS entries (
+                                  key TEXT PRIMARY KEY,
+                                  path TEXT NOT NULL,
+                                  expires REAL NOT NULL,
+                                  status_code INTEGER NOT NULL,
+                                  headers TEXT NOT NULL,
+                                  content BLOB NOT NULL,
+                                  size INTEGER NOT NULL,
+                                  accessed REAL NOT NULL)""")
+            connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed "
+                               "ON entries (accessed)")
+
+    def _connection(self):
+        """ Retrieve the database connection of the current thread
+
+        :return: SQLite connection
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self._path, timeout=self._timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key, stale=False):
+        """ Retrieve a cached entry
+
+        :param key: cache key
+        :param stale: return expired entries as well
+        :return: cached entry, or None when not found
+        """
+        with self._connection() as connection:
+            row = connection.execute("SELECT path, expires, status_code, headers, content "
+                                     "FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            path, expires, status_code, headers, content = row
+            if not stale and expires <= time.time():
+                return None
+            connection.execute("UPDATE entries SET accessed = ? WHERE key = ?",
+                               (time.time(), key))
+        return {"path": path, "expires": expires, "status_code": status_code,
+                "headers": json.loads(headers), "content": bytes(content)}
+
+    def set(self, key, entry):
+        """ Store an entry, evicting least recently used entries when needed
+
+        :param key: cache key
+        :param entry: dict with "path", "expires", "status_code", "headers" and "content"
+        """
+        size = len(entry["content"])
+        if size > self._max_bytes:
+            return
+        with self._connection() as connection:
+            connection.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                               (key, entry["path"], entry["expires"], entry["status_code"],
+                                json.dumps(entry["headers"]), sqlite3.Binary(entry["content"]),
+                                size, time.time()))
+            count, total = connection.execute("SELECT COUNT(*), TOTAL(size) "
+                                              "FROM entries").fetchone()
+            if count <= self._max_entries and total <= self._max_bytes:
+                return
+            for evict_key, evict_size in connection.execute(
+                    "SELECT key, size FROM entries ORDER BY accessed").fetchall():
+                if count <= self._max_entries and total <= self._max_bytes:
+                    break
+                connection.execute("DELETE FROM entries WHERE key = ?", (evict_key,))
+                count -= 1
+                total -= evict_size
+
+    def invalidate(self, url):
+        """ Remove all entries related to a modified resource
+
+        :param url: URL of the modified resource
+        """
+        with self._connection() as connection:
+            for path in related_paths(urlparse(url).path):
+                path = path.rstrip("/")
+                connection.execute("DELETE FROM entries WHERE path = ? "
+                                   "OR substr(path, 1, length(?) + 1) = ? || '/' "
+                                   "OR substr(?, 1, length(path) + 1) = path || '/'",
+                                   (path, path, path, path))
+
+    def clear(self):
+        """ Remove all entries
+        """
+        with self._connection() as connection:
+            connection.execute("DELETE FROM entries")
+
+    def close(self):
+        """ Close the database connection of the current thread
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+def _is_same_or_child(path, parent):
+    """ Check if a path is equal or below a parent path, comparing whole segments
+    """
+    return path == parent or path.startswith(parent.rstrip("/") + "/")
+
+
+def _is_related(path, other):
+    """ Check if two paths are the same resource, or parent and child
+    """
+    return _is_same_or_child(path, other) or _is_same_or_child(other, path)
+
+
+def related_paths(path):
+    """ List resource paths affected by a change, including other endpoint families
+
+        Changing content (/content/:subject/:repo/...) or Maven artifacts affects every package
+        of the repository (/packages/:subject/:repo), since deleted content paths do not name
+        their package, and file searches (/search/file). Changing packages affects the
+        repository package list (/repos/:subject/:repo) and package searches.
+
+    :param path: URL path of the modified resource
+    :return: list of URL paths
+    """
+    segments = path.strip("/").split("/")
+    paths = [path]
+    if segments[0] in ("content", "maven") and len(segments) >= 3:
+        paths.append("/packages/{}/{}".format(*segments[1:3]))
+        paths.append("/search/file")
+    if segments[0] == "packages" and len(segments) >= 3:
+        paths.append("/repos/{}/{}".format(*segments[1:3]))
+        paths.append("/search/packages")
+    return paths
@@ -0,0 +1,87 @@
+import copy
+
+from bintray.requester import Requester
+
+
+class Configuration(object):
+    """ Settings shared by all requests of a client
+
+        Base URLs default to Bintray.BINTRAY_URL and Bintray.DOWNLOAD_URL, which can be changed
+        by the BINTRAY_API_URL and BINTRAY_DOWNLOAD_URL environment variables. A configuration
+        can be shared by many clients, e.g. to point all of them at a closer mirror or a caching
+        proxy:
+
+            configuration = Configuration(api_url="https://bintray-proxy.example.com")
+            bintray = Bintray(configuration=configuration)
+    """
+
+    def __init__(self, api_url=None, download_url=None,
+                 connect_timeout=Requester.CONNECT_TIMEOUT, read_timeout=Requester.READ_TIMEOUT,
+                 deadline=None, pool_connections=10, pool_maxsize=10, keep_alive=True,
+                 retry=None, rate_limiter=None, cache=None, coalesce=False,
+                 wrap_responses=False, metrics=None):
+        """ Initialize client settings
+
+        :param api_url: base URL of the REST API. Default: Bintray.BINTRAY_URL
+        :param download_url: base URL of downloads. Default: Bintray.DOWNLOAD_URL
+        :param connect_timeout: seconds to wait for a connection, or None to wait forever
+        :param read_timeout: seconds to wait between bytes received, or None to wait forever
+        :param deadline: seconds available for each call, including retries and delays
+                         between them. Default: none
+        :param pool_connections: number of connection pools (one per host) to cache
+        :param pool_maxsize: maximum number of connections kept alive per host
+        :param keep_alive: reuse TCP/TLS connections between requests
+        :param retry: RetryPolicy applied to every request. Default: no retry
+        :param rate_limiter: RateLimiter shared by all requests. Default: unlimited
+        :param cache: cache for GET responses e.g. MemoryCache. Default: no cache
+        :param coalesce: share a single HTTP call between concurrent identical GET requests
+        :param wrap_responses: return Response objects instead of updating JSON payloads
+        :param metrics: Metrics recording latency, bytes and errors per endpoint. Default: none
+        """
+        self.api_url = api_url
+        self.download_url = download_url
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.deadline = deadline
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.coalesce = coalesce
+        self.wrap_responses = wrap_responses
+        self.metrics = metrics
+
+    def replace(self, **overrides):
+        """ Copy the configuration, changing some settings
+
+            Settings passed as None are ignored, so optional client arguments can be forwarded
+            as they are.
+
+        :param overrides: settings to be changed
+        :return: new Configuration
+        """
+        configuration = copy.copy(self)
+        for name, value in overrides.items():
+            if not hasattr(configuration, name):
+                raise Exception("Unknown configuration setting: {}".format(name))
+            if value is not None:
+                setattr(configuration, name, value)
+        return configuration
+
+    def get_requester_arguments(self):
+        """ Retrieve the settings used by Requester
+
+        :return: dict with Requester arguments
+        """
+        return {"pool_connections": self.pool_connections, "pool_maxsize": self.pool_maxsize,
+                "keep_alive": self.keep_alive, "retry": self.retry,
+                "rate_limiter": self.rate_limiter, "cache": self.cache,
+                "coalesce": self.coalesce, "wrap_responses": self.wrap_responses,
+                "metrics": self.metrics, "connect_timeout": self.connect_timeout,
+                "read_timeout": self.read_timeout, "deadline": self.deadline}
+
+    def __repr__(self):
+        return "Configuration({})".format(", ".join("{}={!r}".format(name, value)
+                                                    for name, value in vars(self).items()))
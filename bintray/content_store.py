@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+
+from bintray.hashing import hash_file
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class ContentStore(object):
+    """ Local content-addressed store of artifacts, keyed by SHA-1
+
+        Files are stored as <root>/<first 2 hex digits>/<remaining hex digits>. Files are placed
+        into their destination as a reflink (copy-on-write clone) when the file system supports
+        it, otherwise as a hard link when "link" is enabled, otherwise as a copy.
+
+        Hard links share the content with the store: modifying the destination file in place
+        corrupts the stored object. Disable "link" when downloaded files are modified.
+    """
+
+    # Default store location
+    DEFAULT_ROOT = os.path.join(os.path.expanduser("~"), ".bintray", "objects")
+
+    # Linux ioctl to clone a file (FICLONE)
+    FICLONE = 0x40049409
+
+    def __init__(self, root=None, link=True):
+        """ Initialize store location
+
+        :param root: store directory. Default: DEFAULT_ROOT
+        :param link: allow hard links between store and destination files
+        """
+        self._root = root or ContentStore.DEFAULT_ROOT
+        self._link = link
+
+    def get_path(self, sha1):
+        """ Retrieve the stored object path of a SHA-1
+
+        :param sha1: file SHA-1
+        :return: object path
+        """
+        sha1 = sha1.lower()
+        return os.path.join(self._root, sha1[:2], sha1[2:])
+
+    def __contains__(self, sha1):
+        return os.path.isfile(self.get_path(sha1))
+
+    def fetch(self, sha1, local_file_path):
+        """ Place a stored object into a local file
+
+        :param sha1: file SHA-1
+        :param local_file_path: destination file path
+        :return: True when the object was found. Otherwise, False
+        """
+        object_path = self.get_path(sha1)
+        if not os.path.isfile(object_path):
+            return False
+        self._place(object_path, local_file_path, self._link)
+        return True
+
+    def add(self, local_file_path, sha1=None, verify=True):
+        """ Store a local file, verifying its checksum
+
+        :param local_file_path: file to be stored
+        :param sha1: expected SHA-1. Default: computed from the file
+        :param verify: compute the SHA-1 from the file. When False, "sha1" is trusted, e.g. when
+                       it was computed while downloading the file
+        :return: file SHA-1
+        """
+        actual_sha1 = sha1.lower() if sha1 and not verify else hash_file(local_file_path)
+        if sha1 and sha1.lower() != actual_sha1:
+            raise Exception("Checksum mismatch for {}: expected {}, got {}"
+                            .format(local_file_path, sha1, actual_sha1))
+        object_path = self.get_path(actual_sha1)
+        if not os.path.isfile(object_path):
+            self._place(local_file_path, object_path, self._link)
+        return actual_sha1
+
+    @classmethod
+    def _place(cls, source, destination, link):
+        """ Atomically place a file, as reflink, hard link or copy
+
+        :param source: source file path
+        :param destination: destination file path
+        :param link: allow hard links
+        """
+        directory = os.path.dirname(os.path.abspath(destination))
+        os.makedirs(directory, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".bintray-")
+        os.close(file_descriptor)
+        try:
+            if not cls._reflink(source, temp_path):
+                if link:
+                    try:
+                        os.remove(temp_path)
+                        os.link(source, temp_path)
+                    except OSError:
+                        shutil.copyfile(source, temp_path)
+                else:
+                    shutil.copyfile(source, temp_path)
+            os.replace(temp_path, destination)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    @classmethod
+    def _reflink(cls, source, destination):
+        """ Clone a file sharing its blocks, when supported by the file system
+
+        :param source: source file path
+        :param destination: existing empty destination file path
+        :return: True when cloned. Otherwise, False
+        """
+        if fcntl is None:
+            return False
+        try:
+            with open(source, 'rb') as source_fd, open(destination, 'wb') as destination_fd:
+                fcntl.ioctl(destination_fd.fileno(), cls.FICLONE, source_fd.fileno())
+        except OSError:
+            return False
+        return True
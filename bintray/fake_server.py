@@ -0,0 +1,738 @@
+""" In-memory stand-in for the Bintray REST API and download server
+
+    Usage, from the command line:
+
+        python -m bintray.fake_server --port 8080 --latency 0.05 --error-rate 0.01
+
+    and point clients at it with BINTRAY_API_URL=http://127.0.0.1:8080 and
+    BINTRAY_DOWNLOAD_URL=http://127.0.0.1:8080/dl. From Python:
+
+        with FakeBintray(latency=0.01) as server, server.patch():
+            Bintray().create_package("uilianries", "generic", "statistics")
+
+    or, for a single client:
+
+        with FakeBintray() as server:
+            Bintray(configuration=server.get_configuration()).get_repositories("uilianries")
+"""
+import argparse
+import contextlib
+import fnmatch
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+from bintray.bintray import Bintray
+from bintray.configuration import Configuration
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """ Forward every request to the FakeBintray owning the server
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, which Nagle's algorithm delays on keep-alive
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.fake_bintray.handle(self)
+
+    do_HEAD = do_PUT = do_POST = do_PATCH = do_DELETE = do_GET
+
+
+class _Server(ThreadingHTTPServer):
+    """ HTTP server ignoring connections dropped by clients, e.g. cancelled downloads
+    """
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super(_Server, self).handle_error(request, client_address)
+
+
+class FakeBintray(object):
+    """ In-memory stand-in for the Bintray REST API and download server
+
+        Implements the endpoints used for content uploading, publishing and downloading,
+        packages, versions, files, search, attributes and statistics. Any subject and
+        repository exist; packages must be created before uploading content. Credentials are
+        not verified.
+
+        Downloads are served under DOWNLOAD_PATH, with support for HEAD and Range requests.
+
+        Latency is added to every request, bodies are sent and received at most at "bandwidth"
+        bytes per second, and a fraction "error_rate" of requests fail with one of
+        "error_status_codes". Errors can also be queued with fail_next.
+    """
+
+    # Path prefix of the download server
+    DOWNLOAD_PATH = "/dl"
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, bandwidth=None, error_rate=0.0,
+                 error_status_codes=(500, 503), page_size=50, seed=None):
+        """ Initialize server settings
+
+        :param host: address to listen on
+        :param port: port to listen on. Default: any free port
+        :param latency: seconds added to every request
+        :param bandwidth: maximum bytes per second of request and response bodies
+        :param error_rate: probability of failing a request, from 0 to 1
+        :param error_status_codes: status codes of injected errors
+        :param page_size: maximum number of items per page on paginated resources
+        :param seed: seed for error injection, to reproduce a run
+        """
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_status_codes = tuple(error_status_codes)
+        self.page_size = page_size
+        self.requests = []
+        self._address = (host, port)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._errors = []
+        self._server = None
+        self._thread = None
+        self._packages = {}
+        self._versions = {}
+        self._files = {}
+        self._contents = {}
+        self._downloads = {}
+        self._routes = [
+            ("PUT", r"/content/([^/]+)/([^/]+)/([^/]+)/([^/]+)/(.+)", self._upload_content),
+            ("POST", r"/content/([^/]+)/([^/]+)/([^/]+)/([^/]+)/publish", self._publish_content),
+            ("DELETE", r"/content/([^/]+)/([^/]+)/(.+)", self._delete_content),
+            ("PUT", r"/maven/([^/]+)/([^/]+)/([^/]+)/(.+)", self._maven_upload),
+            ("GET", r"/repos/([^/]+)/([^/]+)/packages", self._get_packages),
+            ("GET", r"/repos/([^/]+)/([^/]+)", self._get_repository),
+            ("POST", r"/packages/([^/]+)/([^/]+)", self._create_package),
+            ("GET", r"/packages/([^/]+)/([^/]+)/([^/]+)", self._get_package),
+            ("PATCH", r"/packages/([^/]+)/([^/]+)/([^/]+)", self._update_package),
+            ("DELETE", r"/packages/([^/]+)/([^/]+)/([^/]+)", self._delete_package),
+            ("GET", r"/packages/([^/]+)/([^/]+)/([^/]+)/files", self._get_package_files),
+            ("POST", r"/packages/([^/]+)/([^/]+)/([^/]+)/versions", self._create_version),
+            ("GET", r"/packages/([^/]+)/([^/]+)/([^/]+)/versions/([^/]+)", self._get_version),
+            ("PATCH", r"/packages/([^/]+)/([^/]+)/([^/]+)/versions/([^/]+)",
+             self._update_version),
+            ("DELETE", r"/packages/([^/]+)/([^/]+)/([^/]+)/versions/([^/]+)",
+             self._delete_version),
+            ("GET", r"/packages/([^/]+)/([^/]+)/([^/]+)/versions/([^/]+)/files",
+             self._get_version_files),
+            ("GET", r"/packages/([^/]+)/([^/]+)/([^/]+)(?:/versions/([^/]+))?/attributes",
+             self._get_attributes),
+            ("POST", r"/packages/([^/]+)/([^/]+)/([^/]+)(?:/versions/([^/]+))?/attributes",
+             self._set_attributes),
+            ("PATCH", r"/packages/([^/]+)/([^/]+)/([^/]+)(?:/versions/([^/]+))?/attributes",
+             self._update_attributes),
+            ("DELETE", r"/packages/([^/]+)/([^/]+)/([^/]+)(?:/versions/([^/]+))?/attributes",
+             self._delete_attributes),
+            ("POST", r"/packages/([^/]+)/([^/]+)/([^/]+)(?:/versions/([^/]+))?/stats/([^/]+)",
+             self._get_statistics),
+            ("GET", r"/search/file", self._search_file),
+            ("GET", r"/search/packages", self._search_packages),
+            ("GET", re.escape(FakeBintray.DOWNLOAD_PATH) + r"/([^/]+)/([^/]+)/(.+)",
+             self._download_content),
+        ]
+        self._routes = [(method, re.compile(pattern + "$"), handler)
+                        for method, pattern, handler in self._routes]
+
+    # Server
+
+    def start(self):
+        """ Start serving requests in a background thread
+
+        :return: self
+        """
+        self._server = _Server(self._address, _Handler)
+        self._server.fake_bintray = self
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """ Stop serving requests
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def url(self):
+        """ Base URL of the API, to be used as Bintray.BINTRAY_URL
+        """
+        host, port = self._server.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    @property
+    def download_url(self):
+        """ Base URL of downloads, to be used as Bintray.DOWNLOAD_URL
+        """
+        return self.url + FakeBintray.DOWNLOAD_PATH
+
+    def get_configuration(self, **settings):
+        """ Create a client configuration pointing at this server
+
+        :param settings: other Configuration settings
+        :return: Configuration
+        """
+        return Configuration(api_url=self.url, download_url=self.download_url, **settings)
+
+    @contextlib.contextmanager
+    def patch(self):
+        """ Point all Bintray clients created while the context is active at this server
+        """
+        previous_urls = Bintray.BINTRAY_URL, Bintray.DOWNLOAD_URL
+        Bintray.BINTRAY_URL, Bintray.DOWNLOAD_URL = self.url, self.download_url
+        try:
+            yield self
+        finally:
+            Bintray.BINTRAY_URL, Bintray.DOWNLOAD_URL = previous_urls
+
+    def fail_next(self, status_code, count=1):
+        """ Queue errors for the next requests, regardless of the error rate
+
+        :param status_code: status code of the injected errors
+        :param count: number of requests to fail
+        """
+        with self._lock:
+            self._errors.extend([status_code] * count)
+
+    def add_file(self, subject, repo, package, version, path, content, published=True):
+        """ Store a file directly, creating its package and version when needed
+
+        :param subject: username or organization
+        :param repo: repository name
+        :param package: package name
+        :param version: package version
+        :param path: file path in the repository
+        :param content: file content, as bytes
+        :param published: file is published
+        """
+        with self._lock:
+            if (subject, repo, package) not in self._packages:
+                self._packages[(subject, repo, package)] = self._new_package(subject, repo,
+                                                                             {"name": package})
+            self._store_file(subject, repo, package, version, path, content, published)
+
+    # Transport
+
+    def handle(self, handler):
+        """ Serve a single request
+
+        :param handler: request handler of the HTTP server
+        """
+        parsed_url = urlparse(handler.path)
+        query = {key: values[-1] for key, values in parse_qs(parsed_url.query).items()}
+        body = self._read_body(handler)
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            self.requests.append((handler.command, parsed_url.path))
+            error_status_code = self._next_error()
+            if error_status_code:
+                response = error_status_code, {"message": "Injected error"}, {}
+            else:
+                response = self._dispatch(handler, unquote(parsed_url.path), query, body)
+        self._reply(handler, *response)
+
+    def _next_error(self):
+        """ Pick the status code of an injected error
+
+        :return: status code, or None when the request should succeed
+        """
+        if self._errors:
+            return self._errors.pop(0)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self._random.choice(self.error_status_codes)
+        return None
+
+    def _dispatch(self, handler, path, query, body):
+        """ Route a request to its endpoint
+
+        :param handler: request handler of the HTTP server
+        :param path: URL path
+        :param query: URL parameters
+        :param body: request body
+        :return: status code, payload and headers
+        """
+        method = "GET" if handler.command == "HEAD" else handler.command
+        found_path = False
+        for route_method, pattern, endpoint in self._routes:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            found_path = True
+            if route_method == method:
+                return endpoint(handler, query, body, *match.groups())
+        if found_path:
+            return 405, {"message": "Method not allowed"}, {}
+        return 404, {"message": "Endpoint not implemented by fake server: {}".format(path)}, {}
+
+    def _throttle(self, size, start):
+        """ Wait until the transferred bytes respect the bandwidth limit
+
+        :param size: bytes transferred since start
+        :param start: transfer start time
+        """
+        if self.bandwidth:
+            delay = size / float(self.bandwidth) - (time.monotonic() - start)
+            if delay > 0:
+                time.sleep(delay)
+
+    def _read_body(self, handler):
+        """ Read a request body, sent with Content-Length or chunked transfer encoding
+
+        :param handler: request handler of the HTTP server
+        :return: request body, as bytes
+        """
+        chunks = []
+        start = time.monotonic()
+        received = 0
+        if handler.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                size = int(handler.rfile.readline().split(b";")[0].strip(), 16)
+                chunk = handler.rfile.read(size)
+                handler.rfile.readline()
+                if not size:
+                    break
+                chunks.append(chunk)
+                received += size
+                self._throttle(received, start)
+        else:
+            remaining = int(handler.headers.get("Content-Length") or 0)
+            while remaining:
+                chunk = handler.rfile.read(min(remaining, 64 * 1024))
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                remaining -= len(chunk)
+                received += len(chunk)
+                self._throttle(received, start)
+        return b"".join(chunks)
+
+    def _reply(self, handler, status_code, payload, headers):
+        """ Send a response, throttling its body
+
+        :param handler: request handler of the HTTP server
+        :param status_code: HTTP status code
+        :param payload: JSON payload, or bytes
+        :param headers: response headers
+        """
+        if isinstance(payload, bytes):
+            body, content_type = payload, "application/octet-stream"
+        else:
+            body, content_type = json.dumps(payload).encode(), "application/json"
+        handler.send_response(status_code)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        if handler.command == "HEAD":
+            return
+
+        chunk_size = max(1024, int(self.bandwidth / 50)) if self.bandwidth else len(body)
+        start = time.monotonic()
+        for offset in range(0, len(body), chunk_size or 1):
+            handler.wfile.write(body[offset:offset + chunk_size])
+            self._throttle(offset + chunk_size, start)
+
+    # Helpers
+
+    @staticmethod
+    def _now():
+        return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+    @staticmethod
+    def _load_json(body):
+        try:
+            return json.loads(body.decode() or "null")
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _not_found(kind, name):
+        return 404, {"message": "{} '{}' was not found".format(kind, name)}, {}
+
+    @staticmethod
+    def _success(status_code=200):
+        return status_code, {"message": "success"}, {}
+
+    def _paginate(self, items, query):
+        """ Select a page of items, as selected by the "start_pos" parameter
+
+        :param items: all items
+        :param query: URL parameters
+        :return: status code, page and X-RangeLimit headers
+        """
+        start = int(query.get("start_pos") or 0)
+        page = items[start:start + self.page_size]
+        headers = {"X-RangeLimit-Total": str(len(items)),
+                   "X-RangeLimit-StartPos": str(start),
+                   "X-RangeLimit-EndPos": str(start + len(page) - 1)}
+        return 200, page, headers
+
+    def _new_package(self, subject, repo, json_data):
+        now = self._now()
+        package = {"name": json_data.get("name"), "repo": repo, "owner": subject,
+                   "desc": None, "labels": [], "attribute_names": [], "licenses": [],
+                   "vcs_url": None, "versions": [], "latest_version": None, "created": now,
+                   "updated": now, "attributes": []}
+        package.update({key: value for key, value in json_data.items() if key != "name"})
+        return package
+
+    def _public_package(self, package):
+        return {key: value for key, value in package.items() if key != "attributes"}
+
+    def _new_version(self, subject, repo, package, json_data):
+        now = self._now()
+        version = {"name": json_data.get("name"), "desc": None, "package": package,
+                   "repo": repo, "owner": subject, "labels": [], "attribute_names": [],
+                   "created": now, "updated": now, "released": now, "attributes": []}
+        version.update({key: value for key, value in json_data.items() if key != "name"})
+        self._versions[(subject, repo, package, version["name"])] = version
+        package_entry = self._packages[(subject, repo, package)]
+        package_entry["versions"].insert(0, version["name"])
+        package_entry["latest_version"] = version["name"]
+        return version
+
+    def _public_version(self, version):
+        return {key: value for key, value in version.items() if key != "attributes"}
+
+    def _store_file(self, subject, repo, package, version, path, content, published):
+        if (subject, repo, package, version) not in self._versions:
+            self._new_version(subject, repo, package, {"name": version})
+        self._files[(subject, repo, path)] = {
+            "name": path.rsplit("/", 1)[-1], "path": path, "repo": repo, "package": package,
+            "version": version, "owner": subject, "created": self._now(), "size": len(content),
+            "sha1": hashlib.sha1(content).hexdigest(),
+            "sha256": hashlib.sha256(content).hexdigest(), "published": published}
+        self._contents[(subject, repo, path)] = content
+
+    def _list_files(self, include_unpublished, **filters):
+        files = []
+        for entry in self._files.values():
+            if not include_unpublished and not entry["published"]:
+                continue
+            if all(entry[key] == value for key, value in filters.items() if value is not None):
+                files.append({key: value for key, value in entry.items() if key != "published"})
+        return sorted(files, key=lambda entry: entry["path"])
+
+    def _get_attribute_owner(self, subject, repo, package, version):
+        if version:
+            return self._versions.get((subject, repo, package, version))
+        return self._packages.get((subject, repo, package))
+
+    # Content uploading & publishing
+
+    def _upload_content(self, handler, query, body, subject, repo, package, version, path):
+        if (subject, repo, package) not in self._packages:
+            return self._not_found("Package", package)
+        if (subject, repo, path) in self._files and query.get("override") != "1":
+            return 409, {"message": "Unable to upload files: An artifact with the path '{}' "
+                                    "already exists".format(path)}, {}
+        self._store_file(subject, repo, package, version, path, body,
+                         query.get("publish") == "1")
+        return self._success(201)
+
+    def _maven_upload(self, handler, query, body, subject, repo, package, path):
+        parts = path.split("/")
+        if len(parts) < 3:
+            return 400, {"message": "Invalid Maven path: {}".format(path)}, {}
+        query = dict(query, override="1")
+        return self._upload_content(handler, query, body, subject, repo, package, parts[-2],
+                                    path)
+
+    def _publish_content(self, handler, query, body, subject, repo, package, version):
+        discard = (self._load_json(body) or {}).get("discard", False)
+        count = 0
+        for key, entry in list(self._files.items()):
+            if (entry["package"], entry["version"]) != (package, version) or \
+                    key[:2] != (subject, repo) or entry["published"]:
+                continue
+            count += 1
+            if discard:
+                del self._files[key]
+                del self._contents[key]
+            else:
+                entry["published"] = True
+        return 200, {"files": count}, {}
+
+    def _delete_content(self, handler, query, body, subject, repo, path):
+        if self._files.pop((subject, repo, path), None) is None:
+            return self._not_found("File", path)
+        del self._contents[(subject, repo, path)]
+        return self._success()
+
+    # Content downloading
+
+    def _download_content(self, handler, query, body, subject, repo, path):
+        entry = self._files.get((subject, repo, path))
+        if entry is None or not entry["published"]:
+            return self._not_found("File", path)
+        content = self._contents[(subject, repo, path)]
+        etag = '"{}"'.format(entry["sha1"])
+        headers = {"Accept-Ranges": "bytes", "ETag": etag}
+        if handler.command == "GET":
+            key = (subject, repo, entry["package"], entry["version"])
+            self._downloads[key] = self._downloads.get(key, 0) + 1
+
+        match = re.match(r"bytes=(\d+)-(\d*)$", handler.headers.get("Range", ""))
+        if_range = handler.headers.get("If-Range")
+        if match is None or (if_range and if_range != etag):
+            return 200, content, headers
+        start = int(match.group(1))
+        end = min(int(match.group(2) or len(content) - 1), len(content) - 1)
+        if start >= len(content):
+            headers["Content-Range"] = "bytes */{}".format(len(content))
+            return 416, b"", headers
+        headers["Content-Range"] = "bytes {}-{}/{}".format(start, end, len(content))
+        return 206, content[start:end + 1], headers
+
+    # Repositories & packages
+
+    def _get_repository(self, handler, query, body, subject, repo):
+        return 200, {"name": repo, "owner": subject, "type": "generic", "private": False,
+                     "premium": False, "desc": None, "labels": [], "created": self._now(),
+                     "package_count": len([key for key in self._packages
+                                           if key[:2] == (subject, repo)])}, {}
+
+    def _get_packages(self, handler, query, body, subject, repo):
+        start_name = query.get("start_name", "")
+        packages = [{"name": key[2], "linked": False} for key in sorted(self._packages)
+                    if key[:2] == (subject, repo) and key[2].startswith(start_name)]
+        return self._paginate(packages, query)
+
+    def _create_package(self, handler, query, body, subject, repo):
+        json_data = self._load_json(body) or {}
+        name = json_data.get("name")
+        if not name:
+            return 400, {"message": "Package name is required"}, {}
+        if (subject, repo, name) in self._packages:
+            return 409, {"message": "Package '{}' already exists".format(name)}, {}
+        package = self._new_package(subject, repo, json_data)
+        self._packages[(subject, repo, name)] = package
+        return 201, self._public_package(package), {}
+
+    def _get_package(self, handler, query, body, subject, repo, package):
+        entry = self._packages.get((subject, repo, package))
+        if entry is None:
+            return self._not_found("Package", package)
+        return 200, self._public_package(entry), {}
+
+    def _update_package(self, handler, query, body, subject, repo, package):
+        entry = self._packages.get((subject, repo, package))
+        if entry is None:
+            return self._not_found("Package", package)
+        entry.update(self._load_json(body) or {})
+        entry["updated"] = self._now()
+        return self._success()
+
+    def _delete_package(self, handler, query, body, subject, repo, package):
+        if self._packages.pop((subject, repo, package), None) is None:
+            return self._not_found("Package", package)
+        for key in [key for key in self._versions if key[:3] == (subject, repo, package)]:
+            del self._versions[key]
+        for key, entry in list(self._files.items()):
+            if key[:2] == (subject, repo) and entry["package"] == package:
+                del self._files[key]
+                del self._contents[key]
+        return self._success()
+
+    def _get_package_files(self, handler, query, body, subject, repo, package):
+        if (subject, repo, package) not in self._packages:
+            return self._not_found("Package", package)
+        return 200, self._list_files(query.get("include_unpublished") == "1", owner=subject,
+                                     repo=repo, package=package), {}
+
+    # Versions
+
+    def _create_version(self, handler, query, body, subject, repo, package):
+        if (subject, repo, package) not in self._packages:
+            return self._not_found("Package", package)
+        json_data = self._load_json(body) or {}
+        name = json_data.get("name")
+        if not name:
+            return 400, {"message": "Version name is required"}, {}
+        if (subject, repo, package, name) in self._versions:
+            return 409, {"message": "Version '{}' already exists".format(name)}, {}
+        return 201, self._public_version(self._new_version(subject, repo, package,
+                                                           json_data)), {}
+
+    def _resolve_version(self, subject, repo, package, version):
+        if version == "_latest":
+            package_entry = self._packages.get((subject, repo, package))
+            version = package_entry["latest_version"] if package_entry else None
+        return self._versions.get((subject, repo, package, version))
+
+    def _get_version(self, handler, query, body, subject, repo, package, version):
+        entry = self._resolve_version(subject, repo, package, version)
+        if entry is None:
+            return self._not_found("Version", version)
+        return 200, self._public_version(entry), {}
+
+    def _update_version(self, handler, query, body, subject, repo, package, version):
+        entry = self._versions.get((subject, repo, package, version))
+        if entry is None:
+            return self._not_found("Version", version)
+        entry.update(self._load_json(body) or {})
+        entry["updated"] = self._now()
+        return self._success()
+
+    def _delete_version(self, handler, query, body, subject, repo, package, version):
+        if self._versions.pop((subject, repo, package, version), None) is None:
+            return self._not_found("Version", version)
+        package_entry = self._packages[(subject, repo, package)]
+        package_entry["versions"].remove(version)
+        package_entry["latest_version"] = (package_entry["versions"] or [None])[0]
+        for key, entry in list(self._files.items()):
+            if key[:2] == (subject, repo) and (entry["package"], entry["version"]) == \
+                    (package, version):
+                del self._files[key]
+                del self._contents[key]
+        return self._success()
+
+    def _get_version_files(self, handler, query, body, subject, repo, package, version):
+        if (subject, repo, package, version) not in self._versions:
+            return self._not_found("Version", version)
+        return 200, self._list_files(query.get("include_unpublished") == "1", owner=subject,
+                                     repo=repo, package=package, version=version), {}
+
+    # Attributes
+
+    def _get_attributes(self, handler, query, body, subject, repo, package, version):
+        owner = self._get_attribute_owner(subject, repo, package, version)
+        if owner is None:
+            return self._not_found("Version" if version else "Package", version or package)
+        names = query.get("names")
+        attributes = owner["attributes"]
+        if names:
+            attributes = [attribute for attribute in attributes
+                          if attribute["name"] in names.split(",")]
+        return 200, attributes, {}
+
+    def _set_attributes(self, handler, query, body, subject, repo, package, version):
+        owner = self._get_attribute_owner(subject, repo, package, version)
+        if owner is None:
+            return self._not_found("Version" if version else "Package", version or package)
+        owner["attributes"] = list(self._load_json(body) or [])
+        owner["attribute_names"] = [attribute["name"] for attribute in owner["attributes"]]
+        return 200, owner["attributes"], {}
+
+    def _update_attributes(self, handler, query, body, subject, repo, package, version):
+        owner = self._get_attribute_owner(subject, repo, package, version)
+        if owner is None:
+            return self._not_found("Version" if version else "Package", version or package)
+        updated = {attribute["name"]: attribute for attribute in self._load_json(body) or []}
+        owner["attributes"] = [updated.pop(attribute["name"], attribute)
+                               for attribute in owner["attributes"]] + list(updated.values())
+        owner["attribute_names"] = [attribute["name"] for attribute in owner["attributes"]]
+        return 200, owner["attributes"], {}
+
+    def _delete_attributes(self, handler, query, body, subject, repo, package, version):
+        owner = self._get_attribute_owner(subject, repo, package, version)
+        if owner is None:
+            return self._not_found("Version" if version else "Package", version or package)
+        names = query.get("names")
+        owner["attributes"] = [attribute for attribute in owner["attributes"]
+                               if names and attribute["name"] not in names.split(",")]
+        owner["attribute_names"] = [attribute["name"] for attribute in owner["attributes"]]
+        return self._success()
+
+    # Search
+
+    def _search_file(self, handler, query, body):
+        files = self._list_files(False, owner=query.get("subject"), repo=query.get("repo"))
+        if "name" in query:
+            files = [entry for entry in files if fnmatch.fnmatchcase(entry["name"],
+                                                                     query["name"])]
+        elif "sha1" in query:
+            files = [entry for entry in files if entry["sha1"] == query["sha1"].lower()]
+        else:
+            return 400, {"message": "Missing search parameter: name or sha1"}, {}
+        return self._paginate(files, query)
+
+    def _search_packages(self, handler, query, body):
+        packages = []
+        for (subject, repo, name), package in sorted(self._packages.items()):
+            if query.get("subject") not in (None, subject) or \
+                    query.get("repo") not in (None, repo):
+                continue
+            if query.get("name", "").lower() not in name.lower():
+                continue
+            if query.get("desc", "").lower() not in (package["desc"] or "").lower():
+                continue
+            packages.append(self._public_package(package))
+        return self._paginate(packages, query)
+
+    # Statistics
+
+    def _get_statistics(self, handler, query, body, subject, repo, package, version, suffix):
+        if (subject, repo, package) not in self._packages:
+            return self._not_found("Package", package)
+        json_data = self._load_json(body) or {}
+        records = [{"version": key[3], "count": count}
+                   for key, count in sorted(self._downloads.items())
+                   if key[:3] == (subject, repo, package) and version in (None, key[3])]
+        if suffix == "time_range_downloads":
+            records = [{"date": int(time.time() // 86400 * 86400 * 1000),
+                        "downloads": records}]
+        elif suffix == "country_downloads":
+            records = [{"country": "Unknown",
+                        "count": sum(record["count"] for record in records)}]
+        elif suffix != "total_downloads":
+            return 404, {"message": "Unknown statistics: {}".format(suffix)}, {}
+        return 200, {"from": json_data.get("from"), "to": json_data.get("to"),
+                     "records": records}, {}
+
+
+def main():
+    """ Run a fake Bintray server until interrupted
+    """
+    parser = argparse.ArgumentParser(description="In-memory stand-in for Bintray")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds added to every request")
+    parser.add_argument("--bandwidth", type=int, default=None,
+                        help="maximum bytes per second of bodies")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="probability of failing a request")
+    parser.add_argument("--seed", type=int, default=None, help="seed for error injection")
+    args = parser.parse_args()
+
+    server = FakeBintray(args.host, args.port, latency=args.latency, bandwidth=args.bandwidth,
+                         error_rate=args.error_rate, seed=args.seed).start()
+    print("Fake Bintray API: {}".format(server.url))
+    print("Fake Bintray downloads: {}".format(server.download_url))
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
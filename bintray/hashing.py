@@ -0,0 +1,258 @@
+import hashlib
+import mmap
+import os
+import sqlite3
+import threading
+import time
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+def hash_file(file_path, algorithm="sha1"):
+    """ Compute the checksum of a local file, mapping it in memory
+
+        The mapped file is hashed as a single buffer, without copying it into Python objects.
+        hashlib releases the GIL while hashing, so threads can hash many files concurrently.
+
+    :param file_path: local file path
+    :param algorithm: hashlib algorithm name
+    :return: hexadecimal digest
+    """
+    digest = hashlib.new(algorithm)
+    with open(file_path, 'rb') as file_fd:
+        if os.fstat(file_fd.fileno()).st_size:
+            with mmap.mmap(file_fd.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                digest.update(mapped_file)
+    return digest.hexdigest()
+
+
+class HashIndex(object):
+    """ In-memory index of file checksums
+
+        Entries are keyed by absolute file path and algorithm, and are only valid while the file
+        size, modification time and inode are unchanged. Files modified within the last
+        RACY_SECONDS are not indexed, since a later change could keep the same modification time.
+    """
+
+    # Files modified more recently than this are not indexed
+    RACY_SECONDS = 2
+
+    def __init__(self):
+        """ Initialize index entries
+        """
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_signature(file_path):
+        """ Retrieve the attributes which identify a version of a file
+
+        :param file_path: local file path
+        :return: tuple with size, modification time in nanoseconds and inode
+        """
+        stat = os.stat(file_path)
+        return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+    @staticmethod
+    def _is_racy(signature):
+        """ Check if a file was modified too recently to be indexed
+
+        :param signature: file signature
+        :return: True when the file should not be indexed
+        """
+        return signature[1] >= (time.time() - HashIndex.RACY_SECONDS) * 1e9
+
+    def get(self, file_path, algorithm, signature):
+        """ Retrieve the checksum of a file, when it did not change since indexed
+
+        :param file_path: local file path
+        :param algorithm: hashlib algorithm name
+        :param signature: current file signature
+        :return: hexadecimal digest, or None when not found
+        """
+        with self._lock:
+            entry = self._entries.get((os.path.abspath(file_path), algorithm))
+        if entry is None or entry[0] != signature:
+            return None
+        return entry[1]
+
+    def set(self, file_path, algorithm, signature, checksum):
+        """ Store the checksum of a file
+
+        :param file_path: local file path
+        :param algorithm: hashlib algorithm name
+        :param signature: file signature when it was hashed
+        :param checksum: hexadecimal digest
+        """
+        if self._is_racy(signature):
+            return
+        with self._lock:
+            self._entries[(os.path.abspath(file_path), algorithm)] = (signature, checksum)
+
+    def clear(self):
+        """ Remove all entries
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskHashIndex(HashIndex):
+    """ On-disk index of file checksums, shared between processes
+
+        Entries are stored in a SQLite database in WAL mode, so checksums computed by a build
+        are reused by the next one.
+    """
+
+    # Default database location
+    DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".bintray", "hashes.sqlite3")
+
+    def __init__(self, path=None, timeout=30):
+        """ Initialize index database
+
+        :param path: database file path. Default: DEFAULT_PATH
+        :param timeout: seconds to wait for a lock held by another process
+        """
+        super(DiskHashIndex, self).__init__()
+        self._path = path or DiskHashIndex.DEFAULT_PATH
+        self._timeout = timeout
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(self._path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as connection:
+            connection.execute("""CREATE TABLE IF NOT EXISTS hashes (
+                                  path TEXT NOT NULL,
+                                  algorithm TEXT NOT NULL,
+                                  size INTEGER NOT NULL,
+                                  mtime INTEGER NOT NULL,
+                                  inode INTEGER NOT NULL,
+                                  checksum TEXT NOT NULL,
+                                  PRIMARY KEY (path, algorithm))""")
+
+    def _connection(self):
+        """ Retrieve the database connection of the current thread
+
+        :return: SQLite connection
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self._path, timeout=self._timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, file_path, algorithm, signature):
+        """ Retrieve the checksum of a file, when it did not change since indexed
+
+        :param file_path: local file path
+        :param algorithm: hashlib algorithm name
+        :param signature: current file signature
+        :return: hexadecimal digest, or None when not found
+        """
+        with self._connection() as connection:
+            row = connection.execute("SELECT size, mtime, inode, checksum FROM hashes "
+                                     "WHERE path = ? AND algorithm = ?",
+                                     (os.path.abspath(file_path), algorithm)).fetchone()
+        if row is None or tuple(row[:3]) != tuple(signature):
+            return None
+        return row[3]
+
+    def set(self, file_path, algorithm, signature, checksum):
+        """ Store the checksum of a file
+
+        :param file_path: local file path
+        :param algorithm: hashlib algorithm name
+        :param signature: file signature when it was hashed
+        :param checksum: hexadecimal digest
+        """
+        if self._is_racy(signature):
+            return
+        with self._connection() as connection:
+            connection.execute("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?)",
+                               (os.path.abspath(file_path), algorithm) + tuple(signature) +
+                               (checksum,))
+
+    def clear(self):
+        """ Remove all entries
+        """
+        with self._connection() as connection:
+            connection.execute("DELETE FROM hashes")
+
+    def close(self):
+        """ Close the database connection of the current thread
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class Hasher(object):
+    """ Hash batches of local files concurrently
+
+        Files are hashed by a pool of threads, or of processes when "processes" is enabled.
+        Checksums are recorded in a HashIndex, so unchanged files are never hashed again.
+    """
+
+    def __init__(self, max_workers=None, processes=False, index=None):
+        """ Initialize hashing workers
+
+        :param max_workers: maximum number of files hashed concurrently. Default: CPU count
+        :param processes: hash files in a process pool instead of a thread pool
+        :param index: HashIndex recording checksums e.g. DiskHashIndex. Default: in memory
+        """
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._processes = processes
+        self._index = index if index is not None else HashIndex()
+
+    def checksum(self, file_path, algorithm="sha1"):
+        """ Compute the checksum of a single file
+
+        :param file_path: local file path
+        :param algorithm: hashlib algorithm name
+        :return: hexadecimal digest
+        """
+        signature = self._index.get_signature(file_path)
+        checksum = self._index.get(file_path, algorithm, signature)
+        if checksum is None:
+            checksum = hash_file(file_path, algorithm)
+            self._index.set(file_path, algorithm, signature, checksum)
+        return checksum
+
+    def checksums(self, file_paths, algorithm="sha1"):
+        """ Compute the checksum of many files concurrently
+
+            Files which can not be read are left out of the result.
+
+        :param file_paths: local file paths
+        :param algorithm: hashlib algorithm name
+        :return: dict with file path and hexadecimal digest
+        """
+        result = {}
+        pending = []
+        for file_path in file_paths:
+            try:
+                signature = self._index.get_signature(file_path)
+            except OSError:
+                continue
+            checksum = self._index.get(file_path, algorithm, signature)
+            if checksum is None:
+                pending.append((file_path, signature))
+            else:
+                result[file_path] = checksum
+        if not pending:
+            return result
+
+        executor_type = ProcessPoolExecutor if self._processes else ThreadPoolExecutor
+        with executor_type(max_workers=min(self._max_workers, len(pending))) as executor:
+            futures = [(file_path, signature, executor.submit(hash_file, file_path, algorithm))
+                       for file_path, signature in pending]
+            for file_path, signature, future in futures:
+                try:
+                    checksum = future.result()
+                except OSError:
+                    continue
+                self._index.set(file_path, algorithm, signature, checksum)
+                result[file_path] = checksum
+        return result
@@ -0,0 +1,51 @@
+import importlib
+
+# Supported backends, fastest first
+BACKENDS = ("orjson", "ujson", "json")
+
+_backend = None
+
+
+def set_backend(backend=None):
+    """ Select the library used to decode JSON responses
+
+    :param backend: module name in BACKENDS, or any module with a "loads" function accepting
+                    bytes. Default: fastest installed backend
+    :return: backend name
+    """
+    global _backend
+    if backend is None:
+        for name in BACKENDS:
+            try:
+                _backend = importlib.import_module(name)
+                break
+            except ImportError:
+                continue
+    elif isinstance(backend, str):
+        if backend not in BACKENDS:
+            raise Exception("Unknown JSON backend: {}".format(backend))
+        _backend = importlib.import_module(backend)
+    else:
+        _backend = backend
+    return get_backend()
+
+
+def get_backend():
+    """ Retrieve the name of the library used to decode JSON responses
+
+    :return: backend name
+    """
+    return _backend.__name__
+
+
+def loads(content):
+    """ Decode a JSON document
+
+    :param content: JSON document, as bytes or string
+    :return: decoded object
+    :raise ValueError: when the document is not valid JSON
+    """
+    return _backend.loads(content)
+
+
+set_backend()
@@ -0,0 +1,266 @@
+import bisect
+import threading
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import unquote, urlparse
+
+
+# Parameters following each resource segment of Bintray API paths
+RESOURCE_PARAMETERS = {
+    "access_keys": ("access_key",),
+    "business_unit": ("business_unit",),
+    "business_unit_usage": ("business_unit",),
+    "calc_metadata": ("subject", "repo"),
+    "content": ("subject", "repo"),
+    "entitlements": ("entitlement",),
+    "eulas": ("eula",),
+    "file_metadata": ("subject", "repo"),
+    "file_package": ("subject", "repo"),
+    "file_version": ("subject", "repo"),
+    "files": ("subject", "repo", "package"),
+    "gpg": ("subject", "repo", "package"),
+    "licenses": ("license",),
+    "links": ("source_subject", "source_repo", "source_package"),
+    "logs": ("log",),
+    "maven": ("subject", "repo", "package"),
+    "maven_central_sync": ("subject", "repo", "package"),
+    "organization": ("organization",),
+    "orgs": ("org",),
+    "package_usage": ("subject", "repo"),
+    "packages": ("subject", "repo", "package"),
+    "permissions": ("team",),
+    "products": ("subject", "product"),
+    "repo": ("subject", "repo"),
+    "repos": ("subject", "repo"),
+    "repository": ("subject", "repo"),
+    "signed_url": ("subject", "repo"),
+    "stream": ("subject",),
+    "subjects": ("subject",),
+    "teams": ("team",),
+    "usage": ("subject", "repo"),
+    "users": ("user",),
+    "versions": ("version",),
+    "webhooks": ("subject", "repo", "package"),
+}
+
+# Resources whose remaining segments are a single file path
+PATH_RESOURCES = ("calc_metadata", "content", "file_metadata", "file_package", "file_version",
+                  "maven", "signed_url")
+
+# Path segments which are never parameters
+LITERAL_SEGMENTS = frozenset(RESOURCE_PARAMETERS).union(
+    ("attributes", "file", "followers", "geo_restrictions", "ip_restrictions", "keypair", "keys",
+     "oss_licenses", "public.key", "publish", "readme", "release_notes", "search",
+     "signed_eulas", "usage_threshold", "_all", "_latest"))
+
+
+def get_url_template(url):
+    """ Replace the parameters of an URL path by their names, grouping requests by endpoint
+
+        e.g. "https://api.bintray.com/packages/uilianries/generic/statistics" becomes
+        "/packages/{subject}/{repo}/{package}". Paths which do not start by an API resource
+        are downloads, as "/{subject}/{repo}/{path}".
+
+    :param url: Web address
+    :return: URL path template
+    """
+    segments = [unquote(segment) for segment in urlparse(url).path.strip("/").split("/")
+                if segment]
+    if segments and segments[0] not in LITERAL_SEGMENTS:
+        return "/" + "/".join(["{subject}", "{repo}", "{path}"][:len(segments)])
+
+    template = []
+    index = 0
+    while index < len(segments):
+        segment = segments[index]
+        index += 1
+        if segment not in LITERAL_SEGMENTS:
+            template.append("{param}")
+            continue
+        template.append(segment)
+        for name in RESOURCE_PARAMETERS.get(segment, ()):
+            if index >= len(segments) or segments[index] in LITERAL_SEGMENTS:
+                break
+            template.append("{" + name + "}")
+            index += 1
+        if segment in PATH_RESOURCES and index < len(segments):
+            template.append("{path}")
+            index = len(segments) - 1 if segments[-1] == "publish" else len(segments)
+    return "/" + "/".join(template)
+
+
+class EndpointMetrics(object):
+    """ Statistics of a single HTTP method and URL template
+    """
+
+    def __init__(self, buckets):
+        """ Initialize counters
+
+        :param buckets: upper bounds of the latency histogram, in seconds
+        """
+        self.count = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency_sum = 0.0
+        self.latency_buckets = [0] * (len(buckets) + 1)
+        self.statuses = {}
+
+    def as_dict(self, buckets):
+        """ Copy statistics into a dict
+
+        :param buckets: upper bounds of the latency histogram, in seconds
+        :return: dict with counters, and cumulative latency histogram keyed by upper bound
+        """
+        histogram = {}
+        cumulative = 0
+        for bound, count in zip(list(buckets) + [float("inf")], self.latency_buckets):
+            cumulative += count
+            histogram[bound] = cumulative
+        return {"count": self.count, "retries": self.retries, "bytes_sent": self.bytes_sent,
+                "bytes_received": self.bytes_received, "latency_sum": self.latency_sum,
+                "latency_histogram": histogram, "statuses": dict(self.statuses)}
+
+
+class Metrics(object):
+    """ Per-endpoint metrics of HTTP requests
+
+        Requests are grouped by HTTP method and URL template, counting calls, retries, bytes
+        sent and received, statuses and a latency histogram. Statistics can be read by
+        snapshot(), exported as Prometheus text, or forwarded to a callback on every request.
+    """
+
+    # Default latency histogram upper bounds, in seconds
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self, buckets=None, callback=None, namespace="bintray"):
+        """ Initialize metrics
+
+        :param buckets: latency histogram upper bounds, in seconds. Default: BUCKETS
+        :param callback: function called with a dict describing each request
+        :param namespace: prefix of Prometheus metric names
+        """
+        self._buckets = tuple(sorted(buckets or Metrics.BUCKETS))
+        self._callback = callback
+        self._namespace = namespace
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, method, url, duration, status_code=None, bytes_sent=0, bytes_received=0,
+               retries=0, error=None, resource_url=None):
+        """ Record a request, including all its attempts
+
+        :param method: HTTP method
+        :param url: Web address
+        :param duration: seconds spent on the request, including retries
+        :param status_code: final HTTP status, or None when no response was received
+        :param bytes_sent: size of the request body
+        :param bytes_received: size of the response body
+        :param retries: number of attempts after the first one
+        :param error: exception raised when no response was received
+        :param resource_url: Web address without the path of the base URL, used to group
+                             requests by endpoint. Default: url
+        """
+        template = get_url_template(resource_url or url)
+        status = str(status_code) if status_code is not None else type(error).__name__
+        with self._lock:
+            endpoint = self._endpoints.get((method, template))
+            if endpoint is None:
+                endpoint = self._endpoints[(method, template)] = EndpointMetrics(self._buckets)
+            endpoint.count += 1
+            endpoint.retries += retries
+            endpoint.bytes_sent += bytes_sent
+            endpoint.bytes_received += bytes_received
+            endpoint.latency_sum += duration
+            endpoint.latency_buckets[bisect.bisect_left(self._buckets, duration)] += 1
+            endpoint.statuses[status] = endpoint.statuses.get(status, 0) + 1
+        if self._callback is not None:
+            self._callback({"method": method, "url": url, "template": template,
+                            "duration": duration, "status": status,
+                            "error": status_code is None or status_code >= 400,
+                            "bytes_sent": bytes_sent, "bytes_received": bytes_received,
+                            "retries": retries})
+
+    def snapshot(self):
+        """ Copy the statistics of all endpoints
+
+        :return: dict with (method, URL template) and endpoint statistics
+        """
+        with self._lock:
+            return {key: endpoint.as_dict(self._buckets)
+                    for key, endpoint in self._endpoints.items()}
+
+    def reset(self):
+        """ Remove all statistics
+        """
+        with self._lock:
+            self._endpoints.clear()
+
+    @staticmethod
+    def _format_labels(labels):
+        return ",".join('{}="{}"'.format(name, str(value).replace("\\", "\\\\")
+                                         .replace('"', '\\"'))
+                        for name, value in labels)
+
+    def to_prometheus(self):
+        """ Export statistics in the Prometheus text exposition format
+
+        :return: Prometheus metrics text
+        """
+        prefix = self._namespace + "_"
+        requests = ["# TYPE {}requests_total counter".format(prefix)]
+        retries = ["# TYPE {}retries_total counter".format(prefix)]
+        sent = ["# TYPE {}sent_bytes_total counter".format(prefix)]
+        received = ["# TYPE {}received_bytes_total counter".format(prefix)]
+        latency = ["# TYPE {}request_duration_seconds histogram".format(prefix)]
+        for (method, template), endpoint in sorted(self.snapshot().items()):
+            labels = (("method", method), ("endpoint", template))
+            for status, count in sorted(endpoint["statuses"].items()):
+                requests.append("{}requests_total{{{}}} {}".format(
+                    prefix, self._format_labels(labels + (("status", status),)), count))
+            labels_text = self._format_labels(labels)
+            retries.append("{}retries_total{{{}}} {}".format(prefix, labels_text,
+                                                             endpoint["retries"]))
+            sent.append("{}sent_bytes_total{{{}}} {}".format(prefix, labels_text,
+                                                             endpoint["bytes_sent"]))
+            received.append("{}received_bytes_total{{{}}} {}".format(
+                prefix, labels_text, endpoint["bytes_received"]))
+            for bound, count in endpoint["latency_histogram"].items():
+                latency.append("{}request_duration_seconds_bucket{{{}}} {}".format(
+                    prefix, self._format_labels(labels + (("le", "+Inf" if bound == float("inf")
+                                                           else repr(bound)),)), count))
+            latency.append("{}request_duration_seconds_sum{{{}}} {}".format(
+                prefix, labels_text, repr(endpoint["latency_sum"])))
+            latency.append("{}request_duration_seconds_count{{{}}} {}".format(
+                prefix, labels_text, endpoint["count"]))
+        return "\n".join(requests + retries + sent + received + latency) + "\n"
+
+    def serve(self, host="127.0.0.1", port=0):
+        """ Expose statistics as a Prometheus endpoint, served by a background thread
+
+            Call shutdown() on the returned server to stop it.
+
+        :param host: listening address
+        :param port: listening port. Default: any free port
+        :return: HTTPServer, whose "server_port" is the listening port
+        """
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                body = metrics.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = HTTPServer((host, port), Handler)
+        thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05},
+                                  daemon=True)
+        thread.start()
+        return server
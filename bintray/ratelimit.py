@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import time
+
+from bintray.utils import get_endpoint_family
+
+
+class TokenBucket(object):
+    """ Thread-safe token bucket
+
+        Tokens are refilled continuously at "rate" per second, up to "burst" tokens. Each request
+        consumes one token, blocking until it is available.
+    """
+
+    def __init__(self, rate, burst=None):
+        """ Initialize bucket arguments
+
+        :param rate: tokens refilled per second
+        :param burst: maximum amount of tokens stored, at least one. Default: max(1, rate)
+        """
+        if rate <= 0:
+            raise Exception("Rate must be greater than zero")
+        if burst is not None and burst < 1:
+            raise Exception("Burst must be at least one token")
+        self._rate = float(rate)
+        self._burst = float(burst or max(1.0, rate))
+        self._tokens = self._burst
+        self._timestamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _try_acquire(self, tokens):
+        """ Consume tokens when available
+
+        :param tokens: amount of tokens to be consumed
+        :return: zero when consumed. Otherwise, the time to wait in seconds
+        """
+        if tokens > self._burst:
+            raise Exception("Can not acquire {} tokens, burst is {}".format(tokens, self._burst))
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._timestamp) * self._rate)
+            self._timestamp = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0
+            return (tokens - self._tokens) / self._rate
+
+    def acquire(self, tokens=1, timeout=None):
+        """ Consume tokens, waiting until they are available
+
+        :param tokens: amount of tokens to be consumed
+        :param timeout: maximum seconds to wait. Default: wait forever
+        :return: True when consumed, False when they would not be available in time
+        """
+        expires = None if timeout is None else time.monotonic() + timeout
+        delay = self._try_acquire(tokens)
+        while delay:
+            if expires is not None and time.monotonic() + delay > expires:
+                return False
+            time.sleep(delay)
+            delay = self._try_acquire(tokens)
+        return True
+
+    async def acquire_async(self, tokens=1, timeout=None):
+        """ Consume tokens, waiting on the event loop until they are available
+
+        :param tokens: amount of tokens to be consumed
+        :param timeout: maximum seconds to wait. Default: wait forever
+        :return: True when consumed, False when they would not be available in time
+        """
+        expires = None if timeout is None else time.monotonic() + timeout
+        delay = self._try_acquire(tokens)
+        while delay:
+            if expires is not None and time.monotonic() + delay > expires:
+                return False
+            await asyncio.sleep(delay)
+            delay = self._try_acquire(tokens)
+        return True
+
+
+class RateLimiter(object):
+    """ Client-side rate limiter shared by all threads of a client
+
+        Every request consumes a token from the global bucket. Requests to an endpoint family,
+        which is the first segment of the URL path (e.g. "search", "content", "packages"),
+        consume a token from the family bucket as well, when it is configured.
+    """
+
+    def __init__(self, rate=None, burst=None, families=None):
+        """ Initialize rate limits
+
+        :param rate: requests per second for all endpoints. Default: unlimited
+        :param burst: requests allowed at once for all endpoints
+        :param families: limits per endpoint family, as {"search": (rate, burst)}
+        """
+        self._bucket = TokenBucket(rate, burst) if rate else None
+        self._families = {}
+        for family, limits in (families or {}).items():
+            if not isinstance(limits, (tuple, list)):
+                limits = (limits, None)
+            self._families[family.strip("/")] = TokenBucket(*limits)
+
+    @staticmethod
+    def get_family(url):
+        """ Retrieve the endpoint family from an URL
+
+        :param url: Web address
+        :return: first segment of the URL path
+        """
+        return get_endpoint_family(url)
+
+    @staticmethod
+    def _get_timeout(expires):
+        return None if expires is None else max(0.0, expires - time.monotonic())
+
+    def acquire(self, url, timeout=None):
+        """ Wait until a request to the URL is allowed
+
+        :param url: Web address
+        :param timeout: maximum seconds to wait. Default: wait forever
+        :return: True when allowed, False when it would not be allowed in time
+        """
+        expires = None if timeout is None else time.monotonic() + timeout
+        bucket = self._families.get(self.get_family(url))
+        if bucket and not bucket.acquire(timeout=self._get_timeout(expires)):
+            return False
+        if self._bucket and not self._bucket.acquire(timeout=self._get_timeout(expires)):
+            return False
+        return True
+
+    async def acquire_async(self, url, timeout=None):
+        """ Wait on the event loop until a request to the URL is allowed
+
+        :param url: Web address
+        :param timeout: maximum seconds to wait. Default: wait forever
+        :return: True when allowed, False when it would not be allowed in time
+        """
+        expires = None if timeout is None else time.monotonic() + timeout
+        bucket = self._families.get(self.get_family(url))
+        if bucket and not await bucket.acquire_async(timeout=self._get_timeout(expires)):
+            return False
+        if self._bucket and \
+                not await self._bucket.acquire_async(timeout=self._get_timeout(expires)):
+            return False
+        return True
@@ -1,19 +1,120 @@
+import contextlib
+import contextvars
 import requests
-import json
+import time
 
+from urllib.parse import urlencode, urlparse
+
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from requests.structures import CaseInsensitiveDict
+
+from bintray.json_backend import loads
+from bintray.response import Response
+from bintray.singleflight import SingleFlight
+
+
+# Monotonic time when requests of the current context must be finished
+_context_deadline = contextvars.ContextVar("bintray_deadline", default=None)
+
+
+@contextlib.contextmanager
+def deadline(seconds):
+    """ Bound the total time of all requests sent inside the context, including retries
+
+        Works across threads and asyncio tasks, since the deadline is a context variable.
+        Nested deadlines can only shorten the outer one:
+
+            with deadline(5):
+                bintray.get_package("uilianries", "generic", "statistics")
+
+    :param seconds: time available for all requests of the context
+    """
+    expires = time.monotonic() + seconds
+    current = _context_deadline.get()
+    token = _context_deadline.set(expires if current is None else min(current, expires))
+    try:
+        yield
+    finally:
+        _context_deadline.reset(token)
 
 
 class Requester(object):
 
-    def __init__(self, username=None, api_key=None):
+    # Default amount of bytes written per chunk when streaming content
+    CHUNK_SIZE = 1024 * 1024
+
+    # Default seconds to wait for a connection
+    CONNECT_TIMEOUT = 10
+
+    # Default seconds to wait between bytes received
+    READ_TIMEOUT = 60
+
+    def __init__(self, username=None, api_key=None, pool_connections=10, pool_maxsize=10,
+                 keep_alive=True, retry=None, rate_limiter=None, cache=None, coalesce=False,
+                 wrap_responses=False, metrics=None, connect_timeout=CONNECT_TIMEOUT,
+                 read_timeout=READ_TIMEOUT, deadline=None, base_urls=None):
         """ Initialize arguments for login
 
         :param username: Bintray username
         :param api_key: Bintray API Key
+        :param pool_connections: number of connection pools (one per host) to cache
+        :param pool_maxsize: maximum number of connections kept alive per host
+        :param keep_alive: reuse TCP/TLS connections between requests
+        :param retry: RetryPolicy applied to every request. Default: no retry
+        :param rate_limiter: RateLimiter applied to every request. Default: unlimited
+        :param cache: cache for GET responses e.g. MemoryCache. Default: no cache
+        :param coalesce: share a single HTTP call between concurrent identical GET requests
+        :param wrap_responses: return Response objects instead of updating JSON payloads
+        :param metrics: Metrics recording every request. Default: disabled
+        :param connect_timeout: seconds to wait for a connection, or None to wait forever
+        :param read_timeout: seconds to wait between bytes received, or None to wait forever
+        :param deadline: seconds available for each call, including retries. Default: none
+        :param base_urls: base URLs of the API and downloads, whose paths are removed before
+                          computing cache paths, rate limit families and metric templates
         """
         self._username = username
         self._password = api_key
+        self._retry = retry
+        self._rate_limiter = rate_limiter
+        self._cache = cache
+        self._single_flight = SingleFlight() if coalesce else None
+        self._wrap_responses = wrap_responses
+        self._metrics = metrics
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._deadline = deadline
+        self._base_urls = sorted((base_url.rstrip("/") for base_url in base_urls or ()
+                                  if urlparse(base_url).path.strip("/")), key=len, reverse=True)
+        self._session = self._create_session(pool_connections, pool_maxsize, keep_alive)
+
+    @staticmethod
+    def _create_session(pool_connections, pool_maxsize, keep_alive):
+        """ Create a pooled HTTP session shared by all requests
+
+        :param pool_connections: number of connection pools to cache
+        :param pool_maxsize: maximum number of connections per pool
+        :param keep_alive: reuse connections between requests
+        :return: Requests session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def close(self):
+        """ Close all pooled connections
+        """
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def _get_authentication(self):
         """ Retrieve Basic HTTP Authentication based on username and API key
@@ -27,19 +128,38 @@ class Requester(object):
     def _add_status_code(self, response):
         """ Update JSON result with error and status code
 
+            The body is decoded by the fastest JSON backend installed. When responses are
+            wrapped, a Response is returned instead, which only decodes the body when its
+            payload is accessed.
+
         :param response: Requests response
-        :return: Response JSON
+        :return: Response JSON, or Response when wrapping responses
         """
-        try:
-            json_data = response.json()
-        except json.decoder.JSONDecodeError:
-            json_data = {'message': response.content.decode()}
+        if self._wrap_responses:
+            return Response(response.content, response.status_code, not response.ok,
+                            response.headers)
+        json_data = Response.decode(response.content)
         if isinstance(json_data, list):
             json_data.append({"statusCode": response.status_code, "error": not response.ok})
         else:
             json_data.update({"statusCode": response.status_code, "error": not response.ok})
         return json_data
 
+    def create_response(self, status_code, error=False, json_data=None):
+        """ Create the result of a request answered without JSON payload, e.g. a download
+            streamed into a file
+
+        :param status_code: HTTP status code
+        :param error: True when the request failed
+        :param json_data: payload entries, e.g. {"message": "content store"}
+        :return: JSON with status code, or Response when wrapping responses
+        """
+        if self._wrap_responses:
+            response = Response(b"{}", status_code, error)
+            response.json.update(json_data or {})
+            return response
+        return dict(json_data or {}, statusCode=status_code, error=error)
+
     def _raise_error(self, message, response):
         try:
             response.raise_for_status()
@@ -51,6 +171,305 @@ class Requester(object):
                 pass
             raise Exception("{} ({}): {}".format(message, response.status_code, error_message))
 
+    def _get_expiry(self):
+        """ Find when the current call must be finished
+
+            The earliest of the deadline of each call and the deadline of the current context.
+
+        :return: monotonic time, or None when there is no deadline
+        """
+        expires = _context_deadline.get()
+        if self._deadline is not None:
+            call_expires = time.monotonic() + self._deadline
+            expires = call_expires if expires is None else min(expires, call_expires)
+        return expires
+
+    @staticmethod
+    def _get_remaining(expires):
+        """ Compute the time left before a deadline
+
+        :param expires: monotonic time of the deadline, or None
+        :return: seconds left, or None when there is no deadline
+        """
+        if expires is None:
+            return None
+        remaining = expires - time.monotonic()
+        if remaining <= 0:
+            raise requests.exceptions.Timeout("Deadline exceeded")
+        return remaining
+
+    def _get_timeout(self, expires=None):
+        """ Retrieve the timeout of an attempt, as expected by Requests
+
+            Connect and read timeouts are shortened to the time left before the deadline.
+            Requests only bounds each read, so a body still arriving at the deadline is not
+            interrupted.
+
+        :param expires: monotonic time of the deadline, or None
+        :return: tuple with connect and read timeouts, or None to wait forever
+        """
+        remaining = self._get_remaining(expires)
+        connect_timeout, read_timeout = self._connect_timeout, self._read_timeout
+        if remaining is not None:
+            connect_timeout = min(connect_timeout or remaining, remaining)
+            read_timeout = min(read_timeout or remaining, remaining)
+        if connect_timeout is None and read_timeout is None:
+            return None
+        return connect_timeout, read_timeout
+
+    @staticmethod
+    def _can_wait(expires, delay):
+        """ Check if there is time left to wait before another attempt
+
+        :param expires: monotonic time of the deadline, or None
+        :param delay: seconds to wait
+        :return: True when another attempt can start before the deadline
+        """
+        return expires is None or time.monotonic() + delay < expires
+
+    @staticmethod
+    def _rewind(body, position):
+        """ Move a request body back to its initial position, so it can be sent again
+
+        :param body: request data
+        :param position: initial position, or None when the body is not a file
+        :return: True when the body can be replayed
+        """
+        if position is None:
+            return body is None or isinstance(body, (bytes, bytearray, str, dict, list, tuple))
+        try:
+            body.seek(position)
+        except (AttributeError, OSError, ValueError):
+            return False
+        return True
+
+    def _get_resource_url(self, url):
+        """ Remove the path of the base URL, so the URL path starts by the resource
+
+            e.g. with a proxy at "https://proxy.example.com/bintray", the URL
+            "https://proxy.example.com/bintray/packages/uilianries" becomes
+            "https://proxy.example.com/packages/uilianries".
+
+        :param url: Web address
+        :return: Web address without the base path
+        """
+        for base_url in self._base_urls:
+            if url.startswith(base_url + "/"):
+                parsed_url = urlparse(base_url)
+                return "{}://{}{}".format(parsed_url.scheme, parsed_url.netloc,
+                                          url[len(base_url):])
+        return url
+
+    def _record_metrics(self, method, url, start, response, retries, stream):
+        """ Record a request which received a response
+
+        :param method: HTTP method
+        :param url: Web address
+        :param start: performance counter when the request started
+        :param response: Requests response
+        :param retries: number of attempts after the first one
+        :param stream: the response body was not read yet
+        """
+        bytes_received = response.headers.get("Content-Length") if method != "HEAD" else 0
+        if bytes_received is None and not stream:
+            bytes_received = len(response.content)
+        self._metrics.record(method, url, time.perf_counter() - start,
+                             status_code=response.status_code,
+                             bytes_sent=int(response.request.headers.get("Content-Length") or 0),
+                             bytes_received=int(bytes_received or 0), retries=retries,
+                             resource_url=self._get_resource_url(url))
+
+    def _request(self, method, url, **kwargs):
+        """ Send a request through the pooled session and validate its status
+
+            Temporary failures are retried according to the retry policy. Request bodies read
+            from files are rewound before each new attempt; bodies which can not be replayed,
+            like generators and asynchronous generators, are never retried. Attempts, delays
+            between them and waits for the rate limiter are bounded by the deadline, after
+            which the last failure is reported.
+
+        :param method: HTTP method
+        :param url: Web address
+        :param kwargs: Extra arguments forwarded to Requests
+        :return: Requests response
+        """
+        body = kwargs.get("data")
+        try:
+            position = body.tell()
+        except (AttributeError, OSError, ValueError):
+            position = None
+
+        start = time.perf_counter() if self._metrics is not None else None
+        expires = self._get_expiry()
+        attempt = 1
+        try:
+            while True:
+                if self._rate_limiter and not self._rate_limiter.acquire(
+                        self._get_resource_url(url), self._get_remaining(expires)):
+                    raise requests.exceptions.Timeout("Deadline exceeded")
+                try:
+                    response = self._session.request(method, url,
+                                                     auth=self._get_authentication(),
+                                                     timeout=self._get_timeout(expires), **kwargs)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                    if not self._retry or not self._retry.can_retry(method, attempt) or \
+                            not self._rewind(body, position):
+                        raise
+                    delay = self._retry.get_delay(attempt)
+                    if not self._can_wait(expires, delay):
+                        raise
+                else:
+                    if response.ok or not self._retry or \
+                            not self._retry.can_retry(method, attempt, response.status_code) or \
+                            not self._rewind(body, position):
+                        break
+                    delay = self._retry.get_delay(attempt, response.headers)
+                    if not self._can_wait(expires, delay):
+                        break
+                    response.close()
+                time.sleep(delay)
+                attempt += 1
+        except Exception as error:
+            if start is not None:
+                self._metrics.record(method, url, time.perf_counter() - start,
+                                     retries=attempt - 1, error=error,
+                                     resource_url=self._get_resource_url(url))
+            raise
+        if start is not None:
+            self._record_metrics(method, url, start, response, attempt - 1,
+                                 kwargs.get("stream", False))
+
+        if self._cache is not None and method not in ("GET", "HEAD"):
+            self._cache.invalidate(self._get_resource_url(url))
+        if not response.ok:
+            self._raise_error("Could not {}".format(method), response)
+        return response
+
+    def _cache_key(self, url, params=None):
+        """ Build the cache key of a GET request, including the authenticated user
+
+        :param url: Web address
+        :param params: URL parameters
+        :return: cache key
+        """
+        query = urlencode(sorted((params or {}).items()))
+        return "{}|{}?{}".format(self._username or "", url, query)
+
+    def _to_cache_entry(self, url, response):
+        """ Convert a response into a cache entry
+
+        :param url: Web address
+        :param response: Requests response
+        :return: cache entry
+        """
+        headers = {name: response.headers[name] for name in ("Content-Type", "ETag",
+                                                              "Last-Modified")
+                   if name in response.headers}
+        resource_url = self._get_resource_url(url)
+        return {"path": urlparse(resource_url).path,
+                "expires": time.time() + self._cache.get_ttl(resource_url),
+                "status_code": response.status_code,
+                "headers": headers,
+                "content": response.content}
+
+    @staticmethod
+    def _from_cache_entry(url, entry):
+        """ Convert a cache entry into a response
+
+        :param url: Web address
+        :param entry: cache entry
+        :return: Requests response
+        """
+        response = requests.Response()
+        response.url = url
+        response.status_code = entry["status_code"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["content"]
+        return response
+
+    def _lookup_cache(self, url, params=None):
+        """ Search a GET request in the cache
+
+            Expired entries are kept while they fit in the cache. When they carry validators
+            (ETag/Last-Modified), conditional headers are returned so the entry can be
+            revalidated instead of downloaded again.
+
+        :param url: Web address
+        :param params: URL params
+        :return: cache key, fresh cached response or None, and conditional request headers
+        """
+        key = self._cache_key(url, params)
+        entry = self._cache.get(key, stale=True)
+        if entry is None:
+            return key, None, None
+        if entry["expires"] > time.time():
+            return key, self._from_cache_entry(url, entry), None
+        headers = {}
+        if "ETag" in entry["headers"]:
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if "Last-Modified" in entry["headers"]:
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return key, None, headers or None
+
+    def _store_cache(self, key, url, response):
+        """ Store a GET response in the cache
+
+            A "304 Not Modified" response refreshes the expired entry, which is then served. A
+            304 is never stored: when the entry was evicted or invalidated while revalidating,
+            e.g. by another process sharing a DiskCache, there is nothing to serve.
+
+        :param key: cache key
+        :param url: Web address
+        :param response: Requests response
+        :return: Requests response to be served, or None when a 304 has no entry to refresh
+        """
+        if response.status_code == 304:
+            entry = self._cache.get(key, stale=True)
+            if entry is None:
+                return None
+            entry = dict(entry, expires=time.time() +
+                         self._cache.get_ttl(self._get_resource_url(url)))
+            for name in ("ETag", "Last-Modified"):
+                if name in response.headers:
+                    entry["headers"] = dict(entry["headers"], **{name: response.headers[name]})
+            self._cache.set(key, entry)
+            return self._from_cache_entry(url, entry)
+        self._cache.set(key, self._to_cache_entry(url, response))
+        return response
+
+    def _get(self, url, params=None):
+        """ GET method, coalescing concurrent identical requests when enabled
+
+        :param url: Web address
+        :param params: URL params
+        :return: Requests response
+        """
+        if self._single_flight is None:
+            return self._get_cached(url, params)
+        return self._single_flight.do(self._cache_key(url, params), self._get_cached, url, params)
+
+    def _get_cached(self, url, params=None):
+        """ GET method, served from the cache when a fresh entry is available
+
+            When the entry being revalidated disappears before its "304 Not Modified" arrives,
+            the GET is sent again without conditional headers.
+
+        :param url: Web address
+        :param params: URL params
+        :return: Requests response
+        """
+        if self._cache is None:
+            return self._request("GET", url, params=params)
+        key, response, headers = self._lookup_cache(url, params)
+        if response is not None:
+            return response
+        response = self._request("GET", url, params=params, headers=headers)
+        served = self._store_cache(key, url, response)
+        if served is None:
+            response = self._request("GET", url, params=params)
+            served = self._store_cache(key, url, response)
+        return served if served is not None else response
+
     def get(self, url, params=None):
         """ Forward GET method
 
@@ -58,8 +477,7 @@ class Requester(object):
         :param params: URL params
         :return: JSON answer
         """
-        response, _ = self.download(url, params)
-        return response
+        return self._add_status_code(self._get(url, params))
 
     def download(self, url, params=None, add_status_code=True):
         """ Just like GET method, but with content
@@ -69,13 +487,66 @@ class Requester(object):
         :param add_status_code: add JSON return code
         :return: JSON response and content
         """
-        response = requests.get(url, auth=self._get_authentication(), params=params)
-        if not response.ok:
-            self._raise_error("Could not GET", response)
+        response = self._request("GET", url, params=params)
         if add_status_code:
             return self._add_status_code(response), response.content
         return response.content
 
+    def page(self, method, url, params=None, json=None):
+        """ Request a single page of a paginated resource
+
+        :param method: HTTP method
+        :param url: URL Address
+        :param params: URL parameters
+        :param json: JSON content
+        :return: JSON answer, without status code, and response headers
+        """
+        response = self._request(method, url, params=params, json=json)
+        return loads(response.content), response.headers
+
+    def head(self, url, params=None):
+        """ Forward HEAD method
+
+        :param url: URL Address
+        :param params: URL parameters
+        :return: Response headers
+        """
+        response = self._request("HEAD", url, params=params, allow_redirects=True)
+        return response.headers
+
+    def download_file(self, url, local_file_path, params=None, chunk_size=None, headers=None,
+                      offset=None, digest=None):
+        """ Stream GET content straight into a local file, using bounded memory
+
+            When "offset" is passed, the file must already exist and the content is written at
+            that position, which is expected to be answered as a partial content (206).
+
+        :param url: URL Address
+        :param params: URL parameters
+        :param local_file_path: file path to store the content
+        :param chunk_size: amount of bytes written per chunk
+        :param headers: Request headers
+        :param offset: position in the local file where the content starts
+        :param digest: Digest fed with each chunk written
+        :return: JSON with status code, or Response when wrapping responses
+        """
+        chunk_size = chunk_size or Requester.CHUNK_SIZE
+        response = self._request("GET", url, params=params, headers=headers, stream=True)
+        try:
+            if offset is not None and response.status_code != 206:
+                raise Exception("Could not GET ({}): Range request not honoured for {}"
+                                .format(response.status_code, url))
+            with open(local_file_path, 'wb' if offset is None else 'r+b') as local_fd:
+                if offset is not None:
+                    local_fd.seek(offset)
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    local_fd.write(chunk)
+                    if digest is not None:
+                        digest.update(chunk)
+        finally:
+            response.close()
+        return self.create_response(response.status_code, not response.ok)
+
     def put(self, url, params=None, data=None, json=None, headers=None):
         """ Forward PUT method
 
@@ -89,13 +560,9 @@ class Requester(object):
         if data and json:
             raise Exception("Only accept 'data' or 'json'")
         if data:
-            response = requests.put(url, auth=self._get_authentication(), params=params, data=data,
-                                    headers=headers)
+            response = self._request("PUT", url, params=params, data=data, headers=headers)
         else:
-            response = requests.put(url, auth=self._get_authentication(), params=params, json=json,
-                                    headers=headers)
-        if not response.ok:
-            self._raise_error("Could not PUT", response)
+            response = self._request("PUT", url, params=params, json=json, headers=headers)
         return self._add_status_code(response)
 
     def post(self, url, json=None, params=None, headers=None):
@@ -107,10 +574,7 @@ class Requester(object):
         :param headers: Request headers
         :return: Request response
         """
-        response = requests.post(url, auth=self._get_authentication(), json=json, params=params,
-                                 headers=headers)
-        if not response.ok:
-            self._raise_error("Could not POST", response)
+        response = self._request("POST", url, json=json, params=params, headers=headers)
         return self._add_status_code(response)
 
     def patch(self, url, json=None, params=None):
@@ -121,9 +585,7 @@ class Requester(object):
         :param json: Data to be patched
         :return: Request response
         """
-        response = requests.patch(url, auth=self._get_authentication(), json=json, params=params)
-        if not response.ok:
-            self._raise_error("Could not PATCH", response)
+        response = self._request("PATCH", url, json=json, params=params)
         return self._add_status_code(response)
 
     def delete(self, url, params=None):
@@ -133,7 +595,5 @@ class Requester(object):
         :param params: URL parameters
         :return: Request response
         """
-        response = requests.delete(url, auth=self._get_authentication(), params=params)
-        if not response.ok:
-            self._raise_error("Could not DELETE", response)
+        response = self._request("DELETE", url, params=params)
         return self._add_status_code(response)
@@ -0,0 +1,98 @@
+from bintray.json_backend import loads
+
+
+class Response(object):
+    """ Response of a Bintray request, exposing status code and error as attributes
+
+        The JSON payload is only decoded on first access, so callers checking only the status
+        of a request do not pay for decoding its body. The payload is kept as decoded, instead
+        of being updated with "statusCode" and "error" entries. For compatibility with plain
+        JSON responses, both are also available as keys, and iterating a response iterates its
+        payload.
+    """
+
+    __slots__ = ("_content", "_json", "status_code", "error", "headers")
+
+    # Keys mapped to attributes
+    STATUS_KEYS = ("statusCode", "error")
+
+    # Marks a payload not decoded yet
+    _UNDECODED = object()
+
+    def __init__(self, content, status_code, error, headers=None):
+        """ Initialize response
+
+        :param content: response body, as bytes
+        :param status_code: HTTP status code
+        :param error: True when the request failed
+        :param headers: response headers
+        """
+        self._content = content
+        self._json = Response._UNDECODED
+        self.status_code = status_code
+        self.error = error
+        self.headers = headers
+
+    @staticmethod
+    def decode(content):
+        """ Decode a response body, wrapping non-JSON bodies as a message
+
+        :param content: response body, as bytes
+        :return: decoded JSON payload
+        """
+        try:
+            return loads(content)
+        except ValueError:
+            return {'message': content.decode()}
+
+    @property
+    def json(self):
+        """ Decoded JSON payload. The body is decoded and released on first access
+        """
+        if self._json is Response._UNDECODED:
+            self._json = self.decode(self._content)
+            self._content = None
+        return self._json
+
+    def _get_status(self):
+        return {"statusCode": self.status_code, "error": self.error}
+
+    def __getitem__(self, key):
+        if key in Response.STATUS_KEYS:
+            return self._get_status()[key]
+        return self.json[key]
+
+    def __setitem__(self, key, value):
+        self.json[key] = value
+
+    def __contains__(self, key):
+        return key in Response.STATUS_KEYS or key in self.json
+
+    def __iter__(self):
+        return iter(self.json)
+
+    def __len__(self):
+        return len(self.json)
+
+    def __repr__(self):
+        return "Response(status_code={}, error={})".format(self.status_code, self.error)
+
+    def get(self, key, default=None):
+        """ Retrieve a payload entry or a status key
+
+        :param key: entry name
+        :param default: value returned when the entry does not exist
+        :return: entry value
+        """
+        try:
+            return self[key]
+        except (KeyError, IndexError, TypeError):
+            return default
+
+    def keys(self):
+        """ Retrieve payload entry names followed by status keys
+
+        :return: list of keys
+        """
+        keys = list(self.json.keys()) if isinstance(self.json, dict) else []
+        return keys + [key for key in Response.STATUS_KEYS if key not in keys]
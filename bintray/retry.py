@@ -0,0 +1,86 @@
+import email.utils
+import random
+import time
+
+
+class RetryPolicy(object):
+    """ Decide when a failed request should be sent again, and how long to wait before it
+
+        Delays grow exponentially (backoff_base * 2 ** (attempt - 1)), capped by backoff_max. With
+        jitter enabled, the "full jitter" strategy is used: the delay is a random value between
+        zero and the exponential delay, which spreads retries from concurrent clients.
+    """
+
+    # Status codes which usually mean a temporary failure
+    RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+
+    # Methods which are safe to be replayed
+    IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+    def __init__(self, max_attempts=3, backoff_base=0.5, backoff_max=30.0, jitter=True,
+                 respect_retry_after=True, status_codes=None, methods=None):
+        """ Initialize retry arguments
+
+        :param max_attempts: total number of attempts, including the first one
+        :param backoff_base: delay in seconds before the first retry
+        :param backoff_max: maximum delay in seconds between two attempts
+        :param jitter: randomize delays to avoid synchronized retries
+        :param respect_retry_after: wait for the delay requested by Retry-After header
+        :param status_codes: status codes to be retried. Default: RETRY_STATUS_CODES
+        :param methods: HTTP methods to be retried. Default: IDEMPOTENT_METHODS
+        """
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.respect_retry_after = respect_retry_after
+        self.status_codes = frozenset(status_codes or RetryPolicy.RETRY_STATUS_CODES)
+        self.methods = frozenset(method.upper() for method in
+                                 (methods or RetryPolicy.IDEMPOTENT_METHODS))
+
+    def can_retry(self, method, attempt, status_code=None):
+        """ Check if a request can be sent again
+
+        :param method: HTTP method
+        :param attempt: number of attempts already performed
+        :param status_code: response status code, or None when the connection failed
+        :return: True when the request should be retried
+        """
+        if attempt >= self.max_attempts or method.upper() not in self.methods:
+            return False
+        return status_code is None or status_code in self.status_codes
+
+    def get_delay(self, attempt, headers=None):
+        """ Compute the time to wait before the next attempt
+
+        :param attempt: number of attempts already performed
+        :param headers: response headers, or None when the connection failed
+        :return: delay in seconds
+        """
+        if self.respect_retry_after and headers is not None:
+            retry_after = self._parse_retry_after(headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+        delay = min(self.backoff_base * (2 ** (attempt - 1)), self.backoff_max)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    @staticmethod
+    def _parse_retry_after(value):
+        """ Parse Retry-After header, as delay in seconds or as HTTP date
+
+        :param value: header value
+        :return: delay in seconds, or None when not available
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            date = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, date.timestamp() - time.time())
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+
+
+class _Call(object):
+    """ In-flight call shared by concurrent callers
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """ Coalesce concurrent identical calls into a single execution
+
+        While a call for a key is in flight, other callers with the same key wait for it and
+        receive the same result, or the same exception. Once it completes, the next call for the
+        key is executed again.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._futures = {}
+
+    def do(self, key, function, *args, **kwargs):
+        """ Execute a function, or wait for the in-flight execution with the same key
+
+        :param key: call identity
+        :param function: function to be executed
+        :return: function result
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function(*args, **kwargs)
+            return call.result
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    async def do_async(self, key, function, *args, **kwargs):
+        """ Await a coroutine function, or the in-flight execution with the same key
+
+        :param key: call identity
+        :param function: coroutine function to be awaited
+        :return: coroutine result
+        """
+        future = self._futures.get(key)
+        if future is None:
+            future = asyncio.ensure_future(function(*args, **kwargs))
+            self._futures[key] = future
+            future.add_done_callback(lambda _: self._futures.pop(key, None))
+        return await asyncio.shield(future)
@@ -0,0 +1,205 @@
+import hashlib
+import io
+import os
+import stat
+import time
+
+
+class Digest(object):
+    """ Compute several checksums in a single pass, while content streams through
+
+        Feeding chunks as they are sent or received avoids reading files again to verify them.
+    """
+
+    # Checksums published by Bintray for each file
+    ALGORITHMS = ("sha1", "sha256")
+
+    def __init__(self, algorithms=ALGORITHMS):
+        """ Initialize hash objects
+
+        :param algorithms: hashlib algorithm names
+        """
+        self._algorithms = algorithms
+        self._hashes = []
+        self.reset()
+
+    def reset(self):
+        """ Discard all content fed so far, e.g. when a request body is sent again
+        """
+        self._hashes = [(algorithm, hashlib.new(algorithm)) for algorithm in self._algorithms]
+
+    def update(self, data):
+        """ Feed a chunk of content
+
+        :param data: bytes chunk
+        """
+        for _, hash_object in self._hashes:
+            hash_object.update(data)
+
+    def update_file(self, file_path, size=None, chunk_size=1024 * 1024):
+        """ Feed content already stored in a local file
+
+        :param file_path: local file path
+        :param size: amount of bytes to read from the beginning of the file. Default: whole file
+        :param chunk_size: amount of bytes read per chunk
+        """
+        with open(file_path, 'rb') as file_fd:
+            while size is None or size > 0:
+                chunk = file_fd.read(chunk_size if size is None else min(chunk_size, size))
+                if not chunk:
+                    break
+                self.update(chunk)
+                if size is not None:
+                    size -= len(chunk)
+
+    def hexdigests(self):
+        """ Retrieve the hexadecimal digest of each algorithm
+
+        :return: dict with algorithm name and hexadecimal digest
+        """
+        return {algorithm: hash_object.hexdigest() for algorithm, hash_object in self._hashes}
+
+
+class ProgressMeter(object):
+    """ Track transferred bytes and report them to a callback
+
+        The callback receives the amount of bytes transferred so far, the total amount of bytes
+        (None when unknown) and the instantaneous rate in bytes per second, smoothed with an
+        exponential moving average.
+    """
+
+    # Weight of the most recent sample in the moving average
+    SMOOTHING = 0.3
+
+    def __init__(self, callback=None, total=None):
+        """ Initialize progress arguments
+
+        :param callback: function(transferred, total, rate)
+        :param total: total amount of bytes, or None when unknown
+        """
+        self._callback = callback
+        self.total = total
+        self.transferred = 0
+        self.rate = 0.0
+        self._timestamp = time.monotonic()
+
+    def update(self, size):
+        """ Account transferred bytes
+
+        :param size: amount of bytes transferred since the last update
+        """
+        now = time.monotonic()
+        elapsed = now - self._timestamp
+        self._timestamp = now
+        self.transferred += size
+        if elapsed > 0:
+            sample = size / elapsed
+            self.rate = sample if not self.rate else \
+                ProgressMeter.SMOOTHING * sample + (1 - ProgressMeter.SMOOTHING) * self.rate
+        if self._callback:
+            self._callback(self.transferred, self.total, self.rate)
+
+    def reset(self):
+        """ Restart counting, e.g. when a request body is sent again
+        """
+        self.transferred = 0
+        self._timestamp = time.monotonic()
+
+
+class ProgressReader(io.IOBase):
+    """ File-like wrapper which reports the amount of bytes read
+
+        The file size is exposed as "len", so HTTP clients send a Content-Length instead of
+        using chunked transfer encoding. As for any file object, the length sent is "len" minus
+        the current position, which Requests computes by calling tell(). Seeking is forwarded,
+        so the body can be sent again on retries.
+    """
+
+    def __init__(self, file_object, meter, chunk_size=64 * 1024, digest=None):
+        """ Wrap a readable file object
+
+        :param file_object: readable file object
+        :param meter: ProgressMeter updated on each read. Its total is the file size, and is
+                      reduced to the bytes left from the current position
+        :param chunk_size: amount of bytes yielded per chunk, when iterated
+        :param digest: Digest fed with each chunk read
+        """
+        super(ProgressReader, self).__init__()
+        self._file_object = file_object
+        self._meter = meter
+        self._digest = digest
+        self._chunk_size = chunk_size
+        self.len = meter.total
+        if meter.total is not None:
+            try:
+                meter.total -= file_object.tell()
+            except (AttributeError, OSError):
+                pass
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return hasattr(self._file_object, "seek") and (
+            not hasattr(self._file_object, "seekable") or self._file_object.seekable())
+
+    def tell(self):
+        return self._file_object.tell()
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        position = self._file_object.seek(offset, whence)
+        self._meter.reset()
+        if self._digest is not None:
+            self._digest.reset()
+        return position
+
+    def read(self, size=-1):
+        data = self._file_object.read(size)
+        if data:
+            self._meter.update(len(data))
+            if self._digest is not None:
+                self._digest.update(data)
+        return data
+
+    def __iter__(self):
+        return iter(lambda: self.read(self._chunk_size), b"")
+
+
+def iter_progress(iterable, meter, digest=None):
+    """ Iterate over chunks of bytes, reporting the amount of bytes produced
+
+    :param iterable: iterable of bytes chunks
+    :param meter: ProgressMeter updated on each chunk
+    :param digest: Digest fed with each chunk
+    :return: generator of bytes chunks
+    """
+    for chunk in iterable:
+        if chunk:
+            meter.update(len(chunk))
+            if digest is not None:
+                digest.update(chunk)
+            yield chunk
+
+
+def get_file_size(file_object):
+    """ Retrieve the size of a file object, regardless of its current position, when available
+
+        The size reported by the file system is only meaningful for regular files, e.g. it is
+        zero for pipes.
+
+    :param file_object: file object
+    :return: size in bytes, or None when unknown
+    """
+    try:
+        status = os.fstat(file_object.fileno())
+        if stat.S_ISREG(status.st_mode):
+            return status.st_size
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        pass
+    try:
+        position = file_object.tell()
+        size = file_object.seek(0, os.SEEK_END)
+        file_object.seek(position)
+        return size
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
@@ -1,3 +1,8 @@
+import os
+
+from urllib.parse import urlparse
+
+
 def bool_to_number(value):
     """ Convert boolean result into numeric string
 
@@ -5,3 +10,26 @@ def bool_to_number(value):
     :return: "1" when True. Otherwise, "0"
     """
     return 1 if value else 0
+
+
+def remove_file(file_path):
+    """ Remove a local file, when it exists
+
+        Files about to be downloaded again are removed instead of truncated, since they may be
+        hard links shared with a content store.
+
+    :param file_path: local file path
+    """
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+
+def get_endpoint_family(url):
+    """ Retrieve the endpoint family from an URL
+
+    :param url: Web address
+    :return: first segment of the URL path e.g. "packages"
+    """
+    return urlparse(url).path.strip("/").split("/", 1)[0]
@@ -81,7 +81,7 @@ setup(
 
     # You can just specify the packages manually here if your project is
     # simple. Or you can use find_packages().
-    packages=find_packages(exclude=['tests']),
+    packages=find_packages(exclude=['tests', 'benchmarks']),
 
     # Alternatively, if you want to distribute just a my_module.py, uncomment
     # this:
@@ -98,7 +98,9 @@ setup(
     # for example:
     # $ pip install -e .[dev,test]
     extras_require={
-        'test': get_requires(os.path.join('bintray', 'requirements_test.txt'))
+        'test': get_requires(os.path.join('bintray', 'requirements_test.txt')),
+        'async': get_requires(os.path.join('bintray', 'requirements_async.txt')),
+        'json': get_requires(os.path.join('bintray', 'requirements_json.txt'))
     },
 
     # If there are data files included in your packages that need to be
@@ -0,0 +1,89 @@
+import io
+import os
+import time
+
+import pytest
+import requests
+
+from bintray.bintray import Bintray
+from bintray.fake_server import FakeBintray
+
+
+def create_response(status_code, content, url=None, method="GET"):
+    """ Create a Requests response, as received from a server
+
+    :param status_code: HTTP status code
+    :param content: response body, as bytes
+    :param url: Web address
+    :param method: HTTP method of the request
+    :return: Requests response
+    """
+    response = requests.Response()
+    response.status_code = status_code
+    response.raw = io.BytesIO()
+    response._content = content
+    response.url = url
+    if url is not None:
+        response.request = requests.Request(method, url).prepare()
+    return response
+
+
+class FakeSession(object):
+    """ Requests session answering every request without network access
+    """
+
+    def __init__(self, status_codes=(200,), content=b'{"name": "statistics"}', headers=None,
+                 etag=None, delay=0):
+        """ Initialize answers
+
+        :param status_codes: status of each request. The last one answers all further requests
+        :param content: response body, as bytes
+        :param headers: response headers
+        :param etag: ETag of the resource. Requests sending it as If-None-Match receive a 304
+        :param delay: seconds to wait before answering
+        """
+        self.status_codes = list(status_codes)
+        self.content = content
+        self.headers = headers or {}
+        self.etag = etag
+        self.delay = delay
+        self.requests = []
+        self.bodies = []
+
+    @property
+    def methods(self):
+        return [method for method, _ in self.requests]
+
+    def request(self, method, url, data=None, headers=None, **kwargs):
+        self.requests.append((method, url))
+        if hasattr(data, "read"):
+            self.bodies.append(data.read())
+        elif data is not None:
+            self.bodies.append(data if isinstance(data, bytes) else b"".join(data))
+        if self.delay:
+            time.sleep(self.delay)
+        status_code = self.status_codes.pop(0) if len(self.status_codes) > 1 else \
+            self.status_codes[0]
+        response = create_response(status_code, self.content, url, method)
+        response.headers.update(self.headers)
+        if self.etag:
+            response.headers["ETag"] = self.etag
+            if headers and headers.get("If-None-Match") == self.etag:
+                response.status_code = 304
+                response._content = b""
+        return response
+
+
+@pytest.fixture()
+def fake_bintray():
+    with FakeBintray(page_size=2) as server, server.patch():
+        yield server
+
+
+@pytest.fixture()
+def fake_file(fake_bintray):
+    """ Content of "file.bin", large enough to be downloaded in segments
+    """
+    content = os.urandom(2 * Bintray.MIN_SEGMENT_SIZE + 1024)
+    fake_bintray.add_file("uilianries", "generic", "statistics", "1.0", "file.bin", content)
+    return content
@@ -0,0 +1,227 @@
+import asyncio
+import hashlib
+import inspect
+import logging
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from bintray.async_bintray import AsyncBintray
+from bintray.bintray import Bintray
+from bintray.fake_server import FakeBintray
+from bintray.retry import RetryPolicy
+
+
+def test_async_bintray_mirrors_bintray():
+    for name, method in vars(Bintray).items():
+        if name.startswith("_") or not inspect.isfunction(method):
+            continue
+        async_method = getattr(AsyncBintray, name)
+        if name.startswith("iter_"):
+            continue
+        assert inspect.iscoroutinefunction(async_method), name
+        if name != "close":
+            assert inspect.signature(method) == inspect.signature(async_method), name
+
+
+def test_async_bintray_close():
+    async def run():
+        async with AsyncBintray() as bintray:
+            assert bintray._requester._session is None
+            bintray._requester._get_session()
+        return bintray._requester._session.closed
+    assert asyncio.run(run())
+
+
+def test_async_download_package_download_log_file(tmp_path):
+    async def download(url, params=None, add_status_code=True):
+        return b"log"
+
+    async def run():
+        async with AsyncBintray() as bintray:
+            bintray._requester.download = download
+            return await bintray.download_package_download_log_file(
+                "uilianries", "generic", "statistics", "download.log", local_log_name)
+
+    local_log_name = str(tmp_path / "download.log")
+    assert asyncio.run(run()) is None
+    with open(local_log_name, 'rb') as local_fd:
+        assert b"log" == local_fd.read()
+
+
+def test_async_get(fake_bintray, fake_file):
+    async def run():
+        async with AsyncBintray() as bintray:
+            return await asyncio.gather(
+                bintray.get_package("uilianries", "generic", "statistics"),
+                bintray.get_version("uilianries", "generic", "statistics", "1.0"))
+
+    package, version = asyncio.run(run())
+    assert "statistics" == package["name"] and 200 == package["statusCode"]
+    assert "1.0" == version["name"] and 200 == version["statusCode"]
+
+
+def test_async_upload(fake_bintray, fake_file, tmp_path):
+    local_file_path = tmp_path / "upload.bin"
+    local_file_path.write_bytes(b"bintray")
+
+    async def run():
+        async with AsyncBintray() as bintray:
+            file_response = await bintray.upload_content(
+                "uilianries", "generic", "statistics", "1.0", "file.txt", str(local_file_path),
+                checksums=True)
+            chunks = (chunk for chunk in [b"bin", b"tray"])
+            generator_response = await bintray.upload_content(
+                "uilianries", "generic", "statistics", "1.0", "chunks.txt", chunks,
+                checksums=True)
+            for remote_file_path in ("file.txt", "chunks.txt"):
+                await bintray.download_content("uilianries", "generic", remote_file_path,
+                                               str(tmp_path / remote_file_path))
+            return file_response, generator_response
+
+    file_response, generator_response = asyncio.run(run())
+    sha1 = hashlib.sha1(b"bintray").hexdigest()
+    for response in (file_response, generator_response):
+        assert 201 == response["statusCode"]
+        assert sha1 == response["checksums"]["sha1"]
+    assert b"bintray" == (tmp_path / "file.txt").read_bytes()
+    assert b"bintray" == (tmp_path / "chunks.txt").read_bytes()
+
+
+def test_async_download_segments(fake_bintray, fake_file, tmp_path):
+    local_file_path = str(tmp_path / "file.bin")
+
+    async def run():
+        async with AsyncBintray() as bintray:
+            return await bintray.download_content("uilianries", "generic", "file.bin",
+                                                  local_file_path, segments=3, checksums=True)
+
+    response = asyncio.run(run())
+    assert 200 == response["statusCode"]
+    assert hashlib.sha1(fake_file).hexdigest() == response["checksums"]["sha1"]
+    assert fake_file == (tmp_path / "file.bin").read_bytes()
+    assert ["file.bin"] == os.listdir(str(tmp_path))
+
+
+def test_async_download_segments_failure(fake_bintray, fake_file, tmp_path):
+    async def run():
+        async with AsyncBintray() as bintray:
+            download_file = bintray._requester.download_file
+
+            async def fail_first_segment(url, local_file_path, offset=None, **kwargs):
+                if offset == 0:
+                    raise Exception("Could not GET (503): Service Unavailable")
+                return await download_file(url, local_file_path, offset=offset, **kwargs)
+
+            bintray._requester.download_file = fail_first_segment
+            await bintray.download_content("uilianries", "generic", "file.bin",
+                                           str(tmp_path / "file.bin"), segments=3)
+
+    with pytest.raises(Exception):
+        asyncio.run(run())
+    assert [] == os.listdir(str(tmp_path))
+
+
+def test_async_download_resume(fake_bintray, fake_file, tmp_path):
+    local_file_path = str(tmp_path / "file.bin")
+
+    async def run():
+        async with AsyncBintray() as bintray:
+            url = "{}/uilianries/generic/file.bin".format(bintray._download_url)
+            bintray._plan_resume(url, await bintray._requester.head(url), local_file_path)
+            with open(local_file_path, 'wb') as local_fd:
+                local_fd.write(fake_file[:1024])
+            return await bintray.download_content("uilianries", "generic", "file.bin",
+                                                  local_file_path, resume=True, checksums=True)
+
+    response = asyncio.run(run())
+    assert 200 == response["statusCode"]
+    assert hashlib.sha1(fake_file).hexdigest() == response["checksums"]["sha1"]
+    assert fake_file == (tmp_path / "file.bin").read_bytes()
+    assert ["file.bin"] == os.listdir(str(tmp_path))
+
+
+def test_async_iter_packages_prefetch(fake_bintray, fake_file):
+    for name in ["foo", "bar", "baz", "qux"]:
+        fake_bintray.add_file("uilianries", "generic", name, "1.0", name, name.encode())
+
+    async def run():
+        async with AsyncBintray() as bintray:
+            return [package["name"] async for package in
+                    bintray.iter_packages("uilianries", "generic", prefetch=True)]
+
+    assert ["bar", "baz", "foo", "qux", "statistics"] == asyncio.run(run())
+    assert 3 == fake_bintray.requests.count(("GET", "/repos/uilianries/generic/packages"))
+
+
+def test_async_coalesce():
+    async def run():
+        async with AsyncBintray(coalesce=True) as bintray:
+            return await asyncio.gather(*[bintray.get_package("uilianries", "generic",
+                                                              "statistics")
+                                          for _ in range(8)])
+
+    with FakeBintray(latency=0.2) as server, server.patch():
+        server.add_file("uilianries", "generic", "statistics", "1.0", "file.bin", b"bintray")
+        responses = asyncio.run(run())
+        assert [("GET", "/packages/uilianries/generic/statistics")] == server.requests
+    for response in responses:
+        assert "statistics" == response["name"] and 200 == response["statusCode"]
+
+
+def test_async_upload_generator_not_retried(fake_bintray, fake_file):
+    async def run():
+        async with AsyncBintray(retry=RetryPolicy(backoff_base=0, jitter=False)) as bintray:
+            await bintray.upload_content("uilianries", "generic", "statistics", "1.0",
+                                         "chunks.txt", iter([b"abc"] * 1000))
+
+    fake_bintray.fail_next(503)
+    with pytest.raises(Exception, match="503"):
+        asyncio.run(run())
+    assert 1 == fake_bintray.requests.count(
+        ("PUT", "/content/uilianries/generic/statistics/1.0/chunks.txt"))
+
+
+def test_async_upload_pipe_with_progress(fake_bintray, fake_file, tmp_path):
+    body = os.urandom(200000)
+    read_fd, write_fd = os.pipe()
+    reports = []
+
+    def write_pipe():
+        with open(write_fd, 'wb') as pipe:
+            pipe.write(body)
+
+    async def run():
+        async with AsyncBintray() as bintray:
+            with open(read_fd, 'rb') as pipe:
+                response = await bintray.upload_content(
+                    "uilianries", "generic", "statistics", "1.0", "pipe.bin", pipe,
+                    progress_callback=lambda sent, total, rate: reports.append((sent, total)))
+            await bintray.download_content("uilianries", "generic", "pipe.bin",
+                                           str(tmp_path / "pipe.bin"), stream=True)
+            return response
+
+    writer = threading.Thread(target=write_pipe)
+    writer.start()
+    response = asyncio.run(run())
+    writer.join()
+    assert 201 == response["statusCode"]
+    assert (200000, None) == reports[-1]
+    assert body == (tmp_path / "pipe.bin").read_bytes()
+
+
+def test_async_log_after_result(fake_bintray, fake_file, caplog):
+    async def run():
+        async with AsyncBintray() as bintray:
+            await bintray.get_package("uilianries", "generic", "statistics")
+            await bintray.delete_content("uilianries", "generic", "missing.bin")
+
+    caplog.set_level(logging.INFO, logger="bintray")
+    with pytest.raises(Exception, match="404"):
+        asyncio.run(run())
+    messages = [record.getMessage() for record in caplog.records]
+    assert "Get successfully" in messages
+    assert not [message for message in messages if message.startswith("Delete successfully")]
@@ -0,0 +1,34 @@
+from benchmarks.run import compare, median_results, percentile
+
+
+def test_percentile():
+    samples = list(range(1, 101))
+    assert 50 == percentile(samples, 50)
+    assert 95 == percentile(samples, 95)
+    assert 100 == percentile(samples, 100)
+    assert 7 == percentile([7], 99)
+
+
+def test_median_results():
+    runs = [{"get": {"p50_ms": value}} for value in (3.0, 1.0, 2.0)]
+    assert {"get": {"p50_ms": 2.0}} == median_results(runs)
+
+
+def test_compare_regressions():
+    baseline = {"get": {"requests_per_second": 100.0, "p99_ms": 10.0},
+                "upload": {"bytes_per_second": 100.0}}
+    results = {"get": {"requests_per_second": 70.0, "p99_ms": 11.0},
+               "upload": {"bytes_per_second": 200.0},
+               "new": {"p50_ms": 1.0}}
+    rows = {(name, metric): regression
+            for name, metric, _, _, _, regression in compare(results, baseline, 0.2)}
+    assert {("get", "requests_per_second"): True,
+            ("get", "p99_ms"): False,
+            ("upload", "bytes_per_second"): False} == rows
+
+
+def test_compare_lower_is_better():
+    [(name, metric, previous, value, change, regression)] = compare(
+        {"get": {"p95_ms": 13.0}}, {"get": {"p95_ms": 10.0}}, 0.2)
+    assert ("get", "p95_ms", 10.0, 13.0, True) == (name, metric, previous, value, regression)
+    assert abs(change - 0.3) < 1e-9
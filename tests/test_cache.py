@@ -0,0 +1,189 @@
+import os
+import tempfile
+import time
+
+import pytest
+
+from bintray.bintray import Bintray
+from bintray.cache import Cache, DiskCache, MemoryCache, related_paths
+from bintray.fake_server import FakeBintray
+from bintray.requester import Requester
+from tests.conftest import FakeSession
+
+
+def _entry(path, content=b"{}", ttl=60):
+    return {"path": path, "expires": time.time() + ttl, "status_code": 200, "headers": {},
+            "content": content}
+
+
+def test_cache_ttl_per_prefix():
+    cache = MemoryCache(ttl=10, ttls={"/repos": 300, "/repos/uilianries/generic": 5})
+    assert 10 == cache.get_ttl("https://api.bintray.com/packages/uilianries/generic/statistics")
+    assert 300 == cache.get_ttl("https://api.bintray.com/repos/uilianries/conan")
+    assert 5 == cache.get_ttl("https://api.bintray.com/repos/uilianries/generic/packages")
+
+
+def test_cache_expiration():
+    cache = MemoryCache()
+    cache.set("foo", _entry("/users/uilianries", ttl=-1))
+    assert cache.get("foo") is None
+    assert cache.get("foo", stale=True) is not None
+
+
+def test_cache_lru_eviction():
+    cache = MemoryCache(max_entries=2, max_bytes=10)
+    cache.set("foo", _entry("/users/foo", b"12345"))
+    cache.set("bar", _entry("/users/bar", b"12345"))
+    cache.get("foo")
+    cache.set("baz", _entry("/users/baz", b"1"))
+    assert cache.get("bar") is None
+    assert cache.get("foo") is not None
+    cache.set("qux", _entry("/users/qux", b"123456"))
+    assert cache.get("foo") is None
+
+
+def test_cache_invalidation():
+    cache = MemoryCache()
+    cache.set("package", _entry("/packages/uilianries/generic/statistics"))
+    cache.set("version", _entry("/packages/uilianries/generic/statistics/versions/test"))
+    cache.set("packages", _entry("/repos/uilianries/generic/packages"))
+    cache.set("search", _entry("/search/file"))
+    cache.invalidate("https://api.bintray.com/content/uilianries/generic/statistics/test/f.txt")
+    assert cache.get("version") is None
+    assert cache.get("package") is None
+    assert cache.get("search") is None
+    assert cache.get("packages") is not None
+    cache.set("other", _entry("/packages/uilianries/generic/statistics2"))
+    cache.invalidate("https://api.bintray.com/packages/uilianries/generic/statistics")
+    assert cache.get("packages") is None
+    assert cache.get("other") is not None
+
+
+def test_related_paths():
+    assert ["/users/foo"] == related_paths("/users/foo")
+    assert ["/content/foo/bar/f.txt", "/packages/foo/bar", "/search/file"] == \
+        related_paths("/content/foo/bar/f.txt")
+
+
+def test_requester_cache():
+    requester = Requester(cache=MemoryCache())
+    requester._session = FakeSession(etag='"v1"')
+    url = "https://api.bintray.com/packages/uilianries/generic/statistics"
+    for _ in range(2):
+        response = requester.get(url, {"attribute_values": 1})
+        assert {"name": "statistics", "error": False, "statusCode": 200} == response
+    assert ["GET"] == requester._session.methods
+    requester.patch(url, json={})
+    requester.get(url, {"attribute_values": 1})
+    assert ["GET", "PATCH", "GET"] == requester._session.methods
+
+
+def test_requester_revalidation():
+    requester = Requester(cache=MemoryCache(ttl=0))
+    requester._session = FakeSession(etag='"v1"')
+    url = "https://api.bintray.com/packages/uilianries/generic/statistics"
+    for _ in range(3):
+        response = requester.get(url)
+        assert {"name": "statistics", "error": False, "statusCode": 200} == response
+    assert ["GET", "GET", "GET"] == requester._session.methods
+    entry = requester._cache.get(requester._cache_key(url), stale=True)
+    assert '"v1"' == entry["headers"]["ETag"]
+
+
+def test_disk_cache_shared():
+    path = os.path.join(tempfile.mkdtemp(), "cache.sqlite3")
+    writer = DiskCache(path)
+    writer.set("package", _entry("/packages/uilianries/generic/statistics", b'{"name": "foo"}'))
+    reader = DiskCache(path)
+    assert b'{"name": "foo"}' == reader.get("package")["content"]
+    reader.invalidate("https://api.bintray.com/packages/uilianries/generic/statistics/versions/1")
+    assert writer.get("package") is None
+
+
+def test_disk_cache_eviction():
+    cache = DiskCache(os.path.join(tempfile.mkdtemp(), "cache.sqlite3"), max_entries=2,
+                      max_bytes=10)
+    cache.set("foo", _entry("/users/foo", b"12345"))
+    cache.set("bar", _entry("/users/bar", b"12345"))
+    cache.get("foo")
+    cache.set("baz", _entry("/users/baz", b"1"))
+    assert cache.get("bar") is None
+    assert cache.get("foo") is not None
+    assert cache.get("baz") is not None
+
+
+def test_requester_disk_cache():
+    path = os.path.join(tempfile.mkdtemp(), "cache.sqlite3")
+    url = "https://api.bintray.com/packages/uilianries/generic/statistics"
+    for _ in range(2):
+        requester = Requester(cache=DiskCache(path))
+        requester._session = FakeSession(etag='"v1"')
+        assert "statistics" == requester.get(url)["name"]
+    assert [] == requester._session.methods
+
+
+def test_delete_content_invalidates_listings():
+    with FakeBintray() as server:
+        server.add_file("uilianries", "generic", "statistics", "1.0", "dir/a.txt", b"a")
+        bintray = Bintray(configuration=server.get_configuration(cache=MemoryCache(ttl=300)))
+
+        def listed():
+            return [[item.get("path") for item in response if "path" in item]
+                    for response in (bintray.get_package_files("uilianries", "generic",
+                                                               "statistics"),
+                                     bintray.get_version_files("uilianries", "generic",
+                                                               "statistics", "1.0"),
+                                     bintray.search_file_by_name("a.txt"))]
+
+        assert [["dir/a.txt"]] * 3 == listed()
+        bintray.delete_content("uilianries", "generic", "dir/a.txt")
+        assert [[]] * 3 == listed()
+
+
+def test_skip_unchanged_bypasses_cache(tmp_path):
+    (tmp_path / "a.txt").write_bytes(b"a")
+    with FakeBintray() as server:
+        bintray = Bintray(configuration=server.get_configuration(cache=MemoryCache(ttl=300)))
+        bintray.create_package("uilianries", "generic", "statistics")
+        bintray.upload_content_bulk("uilianries", "generic", "statistics", "1.0",
+                                    str(tmp_path))
+        bintray.get_version_files("uilianries", "generic", "statistics", "1.0",
+                                  include_unpublished=True)
+
+        other_bintray = Bintray(configuration=server.get_configuration())
+        other_bintray.delete_content("uilianries", "generic", "a.txt")
+        response = bintray.upload_content_bulk("uilianries", "generic", "statistics", "1.0",
+                                               str(tmp_path), skip_unchanged=True)
+        assert 0 == response["summary"]["skipped"]
+        assert 1 == response["summary"]["uploaded"]
+
+
+def test_requester_revalidation_without_entry():
+    requester = Requester(cache=MemoryCache(ttl=0))
+    session = FakeSession(etag='"v1"')
+    request = session.request
+
+    def evict_and_request(method, url, headers=None, **kwargs):
+        if headers:
+            requester._cache.clear()
+        return request(method, url, headers=headers, **kwargs)
+
+    session.request = evict_and_request
+    requester._session = session
+    url = "https://api.bintray.com/packages/uilianries/generic/statistics"
+    requester.get(url)
+    response = requester.get(url)
+    assert {"name": "statistics", "error": False, "statusCode": 200} == response
+    assert ["GET", "GET", "GET"] == session.methods
+    entry = requester._cache.get(requester._cache_key(url), stale=True)
+    assert 200 == entry["status_code"]
+
+
+def test_incomplete_cache():
+    class IncompleteCache(Cache):
+
+        def get(self, key, stale=False):
+            return None
+
+    with pytest.raises(TypeError):
+        IncompleteCache()
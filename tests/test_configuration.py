@@ -0,0 +1,79 @@
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+from bintray.bintray import Bintray
+from bintray.configuration import Configuration
+from bintray.fake_server import FakeBintray
+from bintray.retry import RetryPolicy
+
+
+def test_default_configuration():
+    bintray = Bintray()
+    assert Bintray.BINTRAY_URL == bintray._api_url
+    assert Bintray.DOWNLOAD_URL == bintray._download_url
+    assert 10 == bintray.configuration.pool_maxsize
+    assert (10, 60) == bintray._requester._get_timeout()
+    assert bintray.configuration.deadline is None
+
+
+def test_arguments_override_configuration():
+    retry = RetryPolicy()
+    configuration = Configuration(api_url="https://mirror.example.com/", pool_maxsize=20,
+                                  coalesce=True, connect_timeout=3, read_timeout=30)
+    bintray = Bintray(configuration=configuration, pool_maxsize=5, retry=retry,
+                      coalesce=False)
+    assert "https://mirror.example.com" == bintray._api_url
+    assert 5 == bintray.configuration.pool_maxsize
+    assert retry is bintray.configuration.retry
+    assert not bintray.configuration.coalesce
+    assert bintray._requester._single_flight is None
+    assert (3, 30) == bintray._requester._get_timeout()
+    assert 20 == configuration.pool_maxsize
+    assert configuration.coalesce
+
+
+def test_replace_unknown_setting():
+    with pytest.raises(Exception) as error:
+        Configuration().replace(base_url="https://mirror.example.com")
+    assert "Unknown configuration setting: base_url" == str(error.value)
+
+
+def test_clients_use_own_urls():
+    with FakeBintray() as server, FakeBintray() as other_server:
+        bintray = Bintray(configuration=server.get_configuration())
+        other_bintray = Bintray(configuration=other_server.get_configuration())
+        bintray.create_package("uilianries", "generic", "statistics")
+        other_bintray.create_package("uilianries", "generic", "statistics")
+        server.add_file("uilianries", "generic", "statistics", "1.0", "file.txt", b"content")
+
+        temp_dir = tempfile.mkdtemp()
+        local_file_path = os.path.join(temp_dir, "file.txt")
+        response = bintray.download_content("uilianries", "generic", "file.txt", local_file_path)
+        assert not response["error"]
+        with open(local_file_path, 'rb') as local_fd:
+            assert b"content" == local_fd.read()
+        with pytest.raises(Exception):
+            other_bintray.download_content("uilianries", "generic", "file.txt",
+                                           local_file_path)
+        assert ("POST", "/packages/uilianries/generic") in server.requests
+        assert ("POST", "/packages/uilianries/generic") in other_server.requests
+
+
+def test_async_configuration():
+    pytest.importorskip("aiohttp")
+    from bintray.async_bintray import AsyncBintray
+
+    async def run(bintray):
+        async with bintray:
+            return await bintray.get_package("uilianries", "generic", "statistics")
+
+    assert 100 == AsyncBintray().configuration.pool_maxsize
+    with FakeBintray() as server:
+        bintray = AsyncBintray(configuration=server.get_configuration(read_timeout=10))
+        assert 10 == bintray._requester._get_timeout().sock_read
+        Bintray(configuration=server.get_configuration()).create_package(
+            "uilianries", "generic", "statistics")
+        assert "statistics" == asyncio.run(run(bintray))["name"]
@@ -10,6 +10,36 @@ def test_download_content():
     assert False == response["error"]
 
 
+def test_download_content_stream():
+    json_file = "packages.json"
+    bintray = Bintray()
+    response = bintray.download_content("uilianries", "generic", json_file, json_file,
+                                        stream=True, chunk_size=16)
+    assert os.path.exists(json_file)
+    assert {'error': False, 'statusCode': 200} == response
+
+
+def test_download_content_segments():
+    json_file = "packages.json"
+    bintray = Bintray()
+    response = bintray.download_content("uilianries", "generic", json_file, json_file,
+                                        segments=4)
+    assert os.path.exists(json_file)
+    assert False == response["error"]
+
+
+def test_download_content_resume():
+    json_file = "packages.json"
+    bintray = Bintray()
+    with open(json_file, 'wb') as partial_fd:
+        partial_fd.write(b"{")
+    response = bintray.download_content("uilianries", "generic", json_file, json_file,
+                                        resume=True)
+    assert os.path.exists(json_file)
+    assert not os.path.exists(json_file + Bintray.RESUME_STATE_SUFFIX)
+    assert False == response["error"]
+
+
 def test_bad_credentials_for_download_content():
     json_file = "packages.json"
     bintray = Bintray("foobar", "85abc6aece02515e8bd87b9754a18af697527d88")
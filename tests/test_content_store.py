@@ -0,0 +1,75 @@
+import os
+import tempfile
+
+from bintray.bintray import Bintray
+from bintray.content_store import ContentStore
+
+
+def _create_file(content):
+    _, temp_path = tempfile.mkstemp()
+    with open(temp_path, 'wb') as temp_fd:
+        temp_fd.write(content)
+    return temp_path
+
+
+def test_content_store_add_fetch():
+    store = ContentStore(tempfile.mkdtemp())
+    sha1 = store.add(_create_file(b"bintray"))
+    assert "4182b3664bdfca2834c5a00fb63d45e5dc7cd5de" == sha1
+    assert sha1 in store
+    local_file_path = os.path.join(tempfile.mkdtemp(), "bintray.txt")
+    assert store.fetch(sha1, local_file_path)
+    with open(local_file_path, 'rb') as local_fd:
+        assert b"bintray" == local_fd.read()
+    assert not store.fetch("0" * 40, local_file_path)
+
+
+def test_content_store_without_link():
+    store = ContentStore(tempfile.mkdtemp(), link=False)
+    sha1 = store.add(_create_file(b"bintray"))
+    local_file_path = os.path.join(tempfile.mkdtemp(), "bintray.txt")
+    store.fetch(sha1, local_file_path)
+    with open(local_file_path, 'wb') as local_fd:
+        local_fd.write(b"modified")
+    with open(store.get_path(sha1), 'rb') as object_fd:
+        assert b"bintray" == object_fd.read()
+
+
+def test_content_store_checksum_mismatch():
+    store = ContentStore(tempfile.mkdtemp())
+    error_message = ""
+    try:
+        store.add(_create_file(b"bintray"), sha1="0" * 40)
+    except Exception as error:
+        error_message = str(error)
+    assert "Checksum mismatch" in error_message
+
+
+def test_download_content_from_store():
+    store = ContentStore(tempfile.mkdtemp())
+    sha1 = store.add(_create_file(b"bintray"))
+    bintray = Bintray(content_store=store)
+    local_file_path = os.path.join(tempfile.mkdtemp(), "packages.json")
+    response = bintray.download_content("uilianries", "generic", "packages.json",
+                                        local_file_path, sha1=sha1)
+    assert False == response["error"]
+    assert os.path.exists(local_file_path)
+
+
+def test_content_store_add_trusted_checksum():
+    store = ContentStore(tempfile.mkdtemp())
+    sha1 = store.add(_create_file(b"bintray"), sha1="4182B3664BDFCA2834C5A00FB63D45E5DC7CD5DE",
+                     verify=False)
+    assert "4182b3664bdfca2834c5a00fb63d45e5dc7cd5de" == sha1
+    assert sha1 in store
+
+
+def test_download_content_from_store_checksums():
+    store = ContentStore(tempfile.mkdtemp())
+    sha1 = store.add(_create_file(b"bintray"))
+    bintray = Bintray(content_store=store)
+    local_file_path = os.path.join(tempfile.mkdtemp(), "packages.json")
+    response = bintray.download_content("uilianries", "generic", "packages.json",
+                                        local_file_path, sha1=sha1, checksums=True)
+    assert sha1 == response["checksums"]["sha1"]
+    assert "sha256" in response["checksums"]
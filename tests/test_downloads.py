@@ -0,0 +1,112 @@
+import hashlib
+import os
+
+import pytest
+
+from bintray.bintray import Bintray
+from bintray.content_store import ContentStore
+from bintray.response import Response
+
+
+def test_download_segments(fake_bintray, fake_file, tmp_path):
+    bintray = Bintray(configuration=fake_bintray.get_configuration())
+    local_file_path = str(tmp_path / "file.bin")
+    response = bintray.download_content("uilianries", "generic", "file.bin", local_file_path,
+                                        segments=3, checksums=True)
+    assert 200 == response["statusCode"]
+    assert not response["error"]
+    with open(local_file_path, 'rb') as local_fd:
+        assert fake_file == local_fd.read()
+    assert ["file.bin"] == os.listdir(str(tmp_path))
+
+
+def test_download_segments_failure(fake_bintray, fake_file, tmp_path):
+    bintray = Bintray(configuration=fake_bintray.get_configuration())
+    download_file = bintray._requester.download_file
+
+    def fail_first_segment(url, local_file_path, offset=None, **kwargs):
+        if offset == 0:
+            raise Exception("Could not GET (503): Service Unavailable")
+        return download_file(url, local_file_path, offset=offset, **kwargs)
+
+    bintray._requester.download_file = fail_first_segment
+    local_file_path = str(tmp_path / "file.bin")
+    with pytest.raises(Exception):
+        bintray.download_content("uilianries", "generic", "file.bin", local_file_path,
+                                 segments=3)
+    assert [] == os.listdir(str(tmp_path))
+
+
+def test_download_resume_empty_file(fake_bintray, tmp_path):
+    fake_bintray.add_file("uilianries", "generic", "statistics", "1.0", "empty.bin", b"")
+    bintray = Bintray(configuration=fake_bintray.get_configuration())
+    local_file_path = str(tmp_path / "empty.bin")
+    response = bintray.download_content("uilianries", "generic", "empty.bin", local_file_path,
+                                        resume=True)
+    assert not response["error"]
+    assert 0 == os.path.getsize(local_file_path)
+    assert ["empty.bin"] == os.listdir(str(tmp_path))
+
+
+def test_download_resume_larger_local_file(fake_bintray, fake_file, tmp_path):
+    bintray = Bintray(configuration=fake_bintray.get_configuration())
+    url = "{}/uilianries/generic/file.bin".format(bintray._download_url)
+    local_file_path = str(tmp_path / "file.bin")
+    bintray._plan_resume(url, bintray._requester.head(url), local_file_path)
+    with open(local_file_path, 'wb') as local_fd:
+        local_fd.write(fake_file + b"stale")
+
+    response = bintray.download_content("uilianries", "generic", "file.bin", local_file_path,
+                                        resume=True)
+    assert 200 == response["statusCode"]
+    with open(local_file_path, 'rb') as local_fd:
+        assert fake_file == local_fd.read()
+    assert ["file.bin"] == os.listdir(str(tmp_path))
+
+
+def test_download_package_download_log_file(tmp_path):
+    bintray = Bintray()
+    urls = []
+
+    def download(url, params=None, add_status_code=True):
+        urls.append(url)
+        return b"log"
+
+    bintray._requester.download = download
+    local_log_name = str(tmp_path / "download.log")
+    assert bintray.download_package_download_log_file(
+        "uilianries", "generic", "statistics", "download.log", local_log_name) is None
+    assert ["https://api.bintray.com/packages/uilianries/generic/statistics/logs/"
+            "download.log"] == urls
+    with open(local_log_name, 'rb') as local_fd:
+        assert b"log" == local_fd.read()
+
+
+def test_wrap_responses_downloads(fake_bintray, fake_file, tmp_path):
+    store = ContentStore(str(tmp_path / "store"))
+    bintray = Bintray(configuration=fake_bintray.get_configuration(wrap_responses=True),
+                      content_store=store)
+    local_file_path = str(tmp_path / "file.bin")
+    responses = [bintray.download_content("uilianries", "generic", "file.bin", local_file_path,
+                                          checksums=True, **options)
+                 for options in ({"stream": True}, {"segments": 3}, {"resume": True})]
+
+    # A complete local copy left by a previous attempt is not downloaded again
+    url = "{}/uilianries/generic/file.bin".format(bintray._download_url)
+    bintray._plan_resume(url, bintray._requester.head(url), local_file_path)
+    with open(local_file_path, 'wb') as local_fd:
+        local_fd.write(fake_file)
+    responses.append(bintray.download_content("uilianries", "generic", "file.bin",
+                                              local_file_path, checksums=True, resume=True))
+    for response in responses:
+        assert isinstance(response, Response)
+        assert 200 == response.status_code
+        assert not response.error
+        assert hashlib.sha1(fake_file).hexdigest() == response["checksums"]["sha1"]
+
+    sha1 = store.add(local_file_path)
+    response = bintray.download_content("uilianries", "generic", "file.bin",
+                                        str(tmp_path / "stored.bin"), sha1=sha1)
+    assert isinstance(response, Response)
+    assert 200 == response.status_code
+    assert "content store" == response["message"]
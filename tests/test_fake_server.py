@@ -0,0 +1,91 @@
+import os
+import tempfile
+
+from bintray.bintray import Bintray
+from bintray.fake_server import FakeBintray
+from bintray.retry import RetryPolicy
+
+
+def test_patch_urls():
+    with FakeBintray() as server:
+        with server.patch():
+            assert server.url == Bintray.BINTRAY_URL
+            assert server.url + "/dl" == Bintray.DOWNLOAD_URL
+        assert server.url != Bintray.BINTRAY_URL
+
+
+def test_upload_publish_download(fake_bintray):
+    bintray = Bintray()
+    assert 201 == bintray.create_package("uilianries", "generic", "statistics")["statusCode"]
+    response = bintray.upload_content("uilianries", "generic", "statistics", "test",
+                                      "dir/packages.json", iter([b"{}"]), publish=False)
+    assert {'error': False, 'message': 'success', 'statusCode': 201} == response
+
+    files = bintray.get_version_files("uilianries", "generic", "statistics", "test",
+                                      include_unpublished=True)
+    assert "dir/packages.json" == files[0]["path"]
+    assert {'files': 1, 'error': False, 'statusCode': 200} == \
+        bintray.publish_uploaded_content("uilianries", "generic", "statistics", "test")
+
+    local_file_path = os.path.join(tempfile.mkdtemp(), "packages.json")
+    response = bintray.download_content("uilianries", "generic", "dir/packages.json",
+                                        local_file_path, stream=True, sha1=files[0]["sha1"])
+    assert {'error': False, 'statusCode': 200} == response
+    with open(local_file_path, 'rb') as local_fd:
+        assert b"{}" == local_fd.read()
+
+
+def test_upload_conflict(fake_bintray):
+    fake_bintray.add_file("uilianries", "generic", "statistics", "test", "foo.txt", b"foo")
+    bintray = Bintray()
+    error_message = ""
+    try:
+        bintray.upload_content("uilianries", "generic", "statistics", "test", "foo.txt",
+                               iter([b"bar"]))
+    except Exception as error:
+        error_message = str(error)
+    assert "Could not PUT (409): Unable to upload files: An artifact with the path 'foo.txt' " \
+           "already exists" == error_message
+
+
+def test_pagination_and_search(fake_bintray):
+    for name in ["foo.txt", "bar.txt", "baz.bin"]:
+        fake_bintray.add_file("uilianries", "generic", name, "test", name, name.encode())
+    bintray = Bintray()
+    assert ["bar.txt", "baz.bin", "foo.txt"] == \
+        [package["name"] for package in bintray.iter_packages("uilianries", "generic")]
+    assert ["bar.txt", "foo.txt"] == \
+        [entry["name"] for entry in bintray.iter_search_file_by_name("*.txt")]
+
+
+def test_attributes(fake_bintray):
+    fake_bintray.add_file("uilianries", "generic", "statistics", "test", "foo.txt", b"foo")
+    bintray = Bintray()
+    attributes = [{"name": "att1", "values": ["val1"], "type": "string"}]
+    bintray.set_attributes("uilianries", "generic", "statistics", "test", attributes)
+    response = bintray.get_attributes("uilianries", "generic", "statistics", "test")
+    assert [{'name': 'att1', 'type': 'string', 'values': ['val1']},
+            {'error': False, 'statusCode': 200}] == response
+
+
+def test_error_injection(fake_bintray):
+    fake_bintray.add_file("uilianries", "generic", "statistics", "test", "foo.txt", b"foo")
+    fake_bintray.fail_next(503)
+    bintray = Bintray(retry=RetryPolicy(backoff_base=0, jitter=False))
+    assert "statistics" == bintray.get_package("uilianries", "generic", "statistics")["name"]
+    assert 2 == len(fake_bintray.requests)
+
+
+def test_dropped_connection_not_reported(capsys):
+    with FakeBintray() as server:
+        try:
+            raise BrokenPipeError()
+        except BrokenPipeError:
+            server._server.handle_error(None, ("127.0.0.1", 0))
+        try:
+            raise ValueError()
+        except ValueError:
+            server._server.handle_error(None, ("127.0.0.1", 0))
+    stderr = capsys.readouterr().err
+    assert "BrokenPipeError" not in stderr
+    assert "ValueError" in stderr
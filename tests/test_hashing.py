@@ -0,0 +1,78 @@
+import hashlib
+import os
+import tempfile
+import time
+
+from bintray.bintray import Bintray
+from bintray.hashing import DiskHashIndex, HashIndex, Hasher, hash_file
+
+
+def _create_file(content, age=60):
+    _, temp_path = tempfile.mkstemp()
+    with open(temp_path, 'wb') as temp_fd:
+        temp_fd.write(content)
+    timestamp = time.time() - age
+    os.utime(temp_path, (timestamp, timestamp))
+    return temp_path
+
+
+def test_hash_file():
+    assert "4182b3664bdfca2834c5a00fb63d45e5dc7cd5de" == hash_file(_create_file(b"bintray"))
+    assert hashlib.sha256(b"").hexdigest() == hash_file(_create_file(b""), "sha256")
+
+
+def test_hash_index():
+    index = HashIndex()
+    temp_path = _create_file(b"bintray")
+    signature = index.get_signature(temp_path)
+    index.set(temp_path, "sha1", signature, "cafe")
+    assert "cafe" == index.get(temp_path, "sha1", signature)
+    assert index.get(temp_path, "sha256", signature) is None
+    with open(temp_path, 'ab') as temp_fd:
+        temp_fd.write(b"!")
+    assert index.get(temp_path, "sha1", index.get_signature(temp_path)) is None
+
+
+def test_hash_index_racy_file():
+    index = HashIndex()
+    temp_path = _create_file(b"bintray", age=0)
+    signature = index.get_signature(temp_path)
+    index.set(temp_path, "sha1", signature, "cafe")
+    assert index.get(temp_path, "sha1", signature) is None
+
+
+def test_disk_hash_index():
+    path = os.path.join(tempfile.mkdtemp(), "hashes.sqlite3")
+    temp_path = _create_file(b"bintray")
+    index = DiskHashIndex(path)
+    signature = index.get_signature(temp_path)
+    index.set(temp_path, "sha1", signature, "cafe")
+    index.close()
+    assert "cafe" == DiskHashIndex(path).get(temp_path, "sha1", signature)
+
+
+def test_hasher_checksums():
+    index = HashIndex()
+    hasher = Hasher(max_workers=2, index=index)
+    files = [_create_file(b"foo"), _create_file(b"bar"), "/path/not/found"]
+    checksums = hasher.checksums(files)
+    assert {files[0]: hashlib.sha1(b"foo").hexdigest(),
+            files[1]: hashlib.sha1(b"bar").hexdigest()} == checksums
+    index.set(files[0], "sha1", index.get_signature(files[0]), "cafe")
+    assert "cafe" == hasher.checksum(files[0])
+    assert "cafe" == hasher.checksums(files)[files[0]]
+
+
+def test_hasher_processes():
+    temp_path = _create_file(b"bintray")
+    checksums = Hasher(processes=True).checksums([temp_path], "sha256")
+    assert {temp_path: hashlib.sha256(b"bintray").hexdigest()} == checksums
+
+
+def test_is_unchanged():
+    local_checksums = {"/tmp/foo.txt": "cafe"}
+    assert Bintray._is_unchanged("/tmp/foo.txt", "foo.txt", local_checksums,
+                                 {"foo.txt": "cafe"})
+    assert not Bintray._is_unchanged("/tmp/foo.txt", "foo.txt", local_checksums,
+                                     {"foo.txt": "beef"})
+    assert not Bintray._is_unchanged("/tmp/bar.txt", "bar.txt", local_checksums, {})
@@ -0,0 +1,97 @@
+import asyncio
+import urllib.request
+
+import pytest
+
+from bintray.bintray import Bintray
+from bintray.metrics import Metrics, get_url_template
+from bintray.retry import RetryPolicy
+
+
+def test_get_url_template():
+    assert "/packages/{subject}/{repo}/{package}" == \
+        get_url_template("https://api.bintray.com/packages/uilianries/generic/statistics")
+    assert "/packages/{subject}/{repo}/{package}/versions/{version}/files" == \
+        get_url_template("https://api.bintray.com/packages/u/generic/p/versions/1.0/files")
+    assert "/content/{subject}/{repo}/{path}/publish" == \
+        get_url_template("https://api.bintray.com/content/u/generic/p/1.0/publish")
+    assert "/content/{subject}/{repo}/{path}" == \
+        get_url_template("https://api.bintray.com/content/u/generic/p/1.0/dir/file.txt")
+    assert "/search/file" == get_url_template("https://api.bintray.com/search/file")
+    assert "/{subject}/{repo}/{path}" == \
+        get_url_template("https://dl.bintray.com/u/generic/dir/file.txt")
+
+
+def test_record_and_export():
+    events = []
+    metrics = Metrics(buckets=(0.1, 1.0), callback=events.append)
+    url = "https://api.bintray.com/repos/uilianries/generic"
+    metrics.record("GET", url, 0.05, status_code=200, bytes_received=10)
+    metrics.record("GET", url, 0.5, status_code=404, bytes_received=5, retries=2)
+    metrics.record("GET", url, 2.0, error=ConnectionError())
+
+    stats = metrics.snapshot()[("GET", "/repos/{subject}/{repo}")]
+    assert 3 == stats["count"]
+    assert 2 == stats["retries"]
+    assert 15 == stats["bytes_received"]
+    assert {"200": 1, "404": 1, "ConnectionError": 1} == stats["statuses"]
+    assert {0.1: 1, 1.0: 2, float("inf"): 3} == stats["latency_histogram"]
+    assert [False, True, True] == [event["error"] for event in events]
+
+    text = metrics.to_prometheus()
+    assert 'bintray_requests_total{method="GET",endpoint="/repos/{subject}/{repo}",' \
+           'status="404"} 1' in text
+    assert 'bintray_request_duration_seconds_bucket{method="GET",' \
+           'endpoint="/repos/{subject}/{repo}",le="+Inf"} 3' in text
+    assert 'bintray_retries_total{method="GET",endpoint="/repos/{subject}/{repo}"} 2' in text
+
+    metrics.reset()
+    assert {} == metrics.snapshot()
+
+
+def test_serve():
+    metrics = Metrics()
+    metrics.record("GET", "https://api.bintray.com/repos/u", 0.01, status_code=200)
+    server = metrics.serve()
+    try:
+        url = "http://127.0.0.1:{}/metrics".format(server.server_port)
+        with urllib.request.urlopen(url) as response:
+            assert metrics.to_prometheus() == response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_requester_metrics(fake_bintray):
+    metrics = Metrics()
+    bintray = Bintray(metrics=metrics, retry=RetryPolicy(backoff_base=0, jitter=False))
+    bintray.create_package("uilianries", "generic", "statistics")
+    fake_bintray.fail_next(503)
+    bintray.get_package("uilianries", "generic", "statistics")
+    with pytest.raises(Exception):
+        bintray.get_package("uilianries", "generic", "missing")
+
+    stats = metrics.snapshot()
+    created = stats[("POST", "/packages/{subject}/{repo}")]
+    assert 1 == created["count"] and created["bytes_sent"] > 0
+    fetched = stats[("GET", "/packages/{subject}/{repo}/{package}")]
+    assert 2 == fetched["count"]
+    assert 1 == fetched["retries"]
+    assert {"200": 1, "404": 1} == fetched["statuses"]
+    assert fetched["bytes_received"] > 0
+
+
+def test_async_requester_metrics(fake_bintray):
+    pytest.importorskip("aiohttp")
+    from bintray.async_bintray import AsyncBintray
+
+    async def run():
+        async with AsyncBintray(metrics=metrics) as bintray:
+            await bintray.create_package("uilianries", "generic", "statistics")
+            await bintray.get_package("uilianries", "generic", "statistics")
+
+    metrics = Metrics()
+    asyncio.run(run())
+    stats = metrics.snapshot()
+    assert {"201": 1} == stats[("POST", "/packages/{subject}/{repo}")]["statuses"]
+    assert {"200": 1} == stats[("GET", "/packages/{subject}/{repo}/{package}")]["statuses"]
@@ -17,6 +17,22 @@ def test_get_packages():
     assert {'error': False, 'statusCode': 200} in response
 
 
+def test_iter_packages():
+    bintray = Bintray()
+    packages = list(bintray.iter_packages("uilianries", "conan", prefetch=True))
+    assert len(packages) > 0
+    assert all("name" in package for package in packages)
+
+
+def test_next_position():
+    headers = {"X-RangeLimit-Total": "120", "X-RangeLimit-StartPos": "50",
+               "X-RangeLimit-EndPos": "99"}
+    assert 100 == Bintray._next_position([{}], headers)
+    headers["X-RangeLimit-EndPos"] = "119"
+    assert Bintray._next_position([{}], headers) is None
+    assert Bintray._next_position([], {}) is None
+
+
 def test_get_package():
     bintray = Bintray()
     response = bintray.get_package("uilianries", "generic", "statistics")
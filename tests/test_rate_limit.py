@@ -0,0 +1,47 @@
+import time
+
+import pytest
+
+from bintray.ratelimit import RateLimiter, TokenBucket
+
+
+def test_token_bucket_burst():
+    bucket = TokenBucket(rate=1000, burst=5)
+    for _ in range(5):
+        assert 0 == bucket._try_acquire(1)
+    assert 0 < bucket._try_acquire(1)
+
+
+def test_token_bucket_rate():
+    bucket = TokenBucket(rate=50, burst=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_rate_limiter_family():
+    assert "search" == RateLimiter.get_family("https://api.bintray.com/search/file?name=x")
+    limiter = RateLimiter(families={"search": (1000, 2)})
+    limiter.acquire("https://api.bintray.com/search/file")
+    limiter.acquire("https://api.bintray.com/search/file")
+    assert 0 < limiter._families["search"]._try_acquire(1)
+    limiter.acquire("https://api.bintray.com/packages/uilianries/generic/statistics")
+
+
+def test_token_bucket_timeout():
+    bucket = TokenBucket(rate=0.25, burst=1)
+    assert bucket.acquire(timeout=0)
+    start = time.monotonic()
+    assert not bucket.acquire(timeout=0.5)
+    assert time.monotonic() - start < 0.1
+    limiter = RateLimiter(rate=0.25, burst=1)
+    assert limiter.acquire("https://api.bintray.com/repos/uilianries", timeout=0.5)
+    assert not limiter.acquire("https://api.bintray.com/repos/uilianries", timeout=0.5)
+
+
+def test_token_bucket_invalid_burst():
+    with pytest.raises(Exception, match="Burst"):
+        TokenBucket(rate=10, burst=0.5)
+    with pytest.raises(Exception, match="burst"):
+        TokenBucket(rate=10, burst=2).acquire(tokens=3)
@@ -0,0 +1,59 @@
+import time
+
+from bintray.bintray import Bintray
+from bintray.cache import MemoryCache
+from bintray.configuration import Configuration
+from bintray.metrics import Metrics
+from bintray.ratelimit import RateLimiter
+from bintray.requester import Requester
+from tests.conftest import FakeSession
+
+
+def test_session_pool_size():
+    requester = Requester(pool_connections=2, pool_maxsize=32)
+    adapter = requester._session.get_adapter("https://api.bintray.com")
+    assert 2 == adapter._pool_connections
+    assert 32 == adapter._pool_maxsize
+    requester.close()
+
+
+def test_session_without_keep_alive():
+    requester = Requester(keep_alive=False)
+    assert "close" == requester._session.headers["Connection"]
+    requester.close()
+
+
+def test_bintray_shares_session():
+    with Bintray(pool_maxsize=4) as bintray:
+        adapter = bintray._requester._session.get_adapter("https://dl.bintray.com")
+        assert 4 == adapter._pool_maxsize
+
+
+def test_base_url_with_path():
+    cache = MemoryCache(ttls={"/repos": 300})
+    rate_limiter = RateLimiter(families={"search": (1000, 1)})
+    metrics = Metrics()
+    configuration = Configuration(api_url="https://proxy.example.com/bintray/",
+                                  download_url="https://proxy.example.com/dl", cache=cache,
+                                  rate_limiter=rate_limiter, metrics=metrics)
+    bintray = Bintray(configuration=configuration)
+    bintray._requester._session = FakeSession()
+
+    bintray.get_repository("uilianries", "generic")
+    entry = cache.get(bintray._requester._cache_key(
+        "https://proxy.example.com/bintray/repos/uilianries/generic"))
+    assert "/repos/uilianries/generic" == entry["path"]
+    assert entry["expires"] > time.time() + 200
+
+    bintray.delete_package("uilianries", "generic", "statistics")
+    bintray.get_repository("uilianries", "generic")
+    assert ["GET", "DELETE", "GET"] == [method for method, _ in
+                                        bintray._requester._session.requests]
+    assert "https://proxy.example.com/bintray/repos/uilianries/generic" == \
+        bintray._requester._session.requests[0][1]
+
+    bintray.search_file_by_name("*.txt")
+    assert 0 < rate_limiter._families["search"]._try_acquire(1)
+
+    assert {("GET", "/repos/{subject}/{repo}"), ("DELETE", "/packages/{subject}/{repo}/{package}"),
+            ("GET", "/search/file")} == set(metrics.snapshot())
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from bintray import json_backend
+from bintray.requester import Requester
+from bintray.response import Response
+from tests.conftest import create_response
+
+
+def test_json_backend():
+    assert json_backend.get_backend() in json_backend.BACKENDS
+    try:
+        assert "json" == json_backend.set_backend("json")
+        assert {"name": "zlib"} == json_backend.loads(b'{"name": "zlib"}')
+        with pytest.raises(ValueError):
+            json_backend.loads(b"not json")
+        with pytest.raises(Exception):
+            json_backend.set_backend("simdjson")
+    finally:
+        json_backend.set_backend()
+
+
+def test_add_status_code():
+    requester = Requester()
+    response = requester._add_status_code(create_response(200, b'[{"name": "zlib"}]'))
+    assert [{"name": "zlib"}, {"statusCode": 200, "error": False}] == response
+    response = requester._add_status_code(create_response(404, b'Not Found'))
+    assert {"message": "Not Found", "statusCode": 404, "error": True} == response
+
+
+def test_wrap_responses():
+    requester = Requester(wrap_responses=True)
+    response = requester._add_status_code(create_response(200, b'[{"name": "zlib"}]'))
+    assert isinstance(response, Response)
+    assert [{"name": "zlib"}] == response.json
+    assert 200 == response.status_code
+    assert not response.error
+    assert 200 == response["statusCode"]
+    assert [{"name": "zlib"}] == list(response)
+    assert 1 == len(response)
+
+    response = requester._add_status_code(create_response(201, b'{"message": "success"}'))
+    assert "success" == response["message"]
+    assert False == response["error"]
+    assert "error" in response
+    assert response.get("missing") is None
+    assert {"message": "success", "statusCode": 201, "error": False} == dict(response)
+
+
+class _CountingBackend(object):
+
+    __name__ = "counting"
+
+    def __init__(self):
+        self.calls = 0
+
+    def loads(self, content):
+        self.calls += 1
+        return json.loads(content)
+
+
+def test_lazy_response():
+    backend = _CountingBackend()
+    json_backend.set_backend(backend)
+    try:
+        response = Requester(wrap_responses=True)._add_status_code(
+            create_response(200, b'{"message": "success"}'))
+        assert not response.error
+        assert 200 == response["statusCode"]
+        assert 0 == backend.calls
+        assert "success" == response["message"]
+        assert "success" == response.json["message"]
+        assert 1 == backend.calls
+    finally:
+        json_backend.set_backend()
+
+
+def test_lazy_response_not_json():
+    response = Response(b"Not Found", 404, True)
+    assert {"message": "Not Found"} == response.json
+    assert response.error
@@ -0,0 +1,43 @@
+from bintray.requester import Requester
+from bintray.retry import RetryPolicy
+from tests.conftest import FakeSession
+
+
+def test_retry_policy_methods():
+    policy = RetryPolicy(max_attempts=3)
+    assert policy.can_retry("GET", 1)
+    assert policy.can_retry("put", 2)
+    assert not policy.can_retry("POST", 1)
+    assert not policy.can_retry("GET", 3)
+
+
+def test_retry_policy_backoff():
+    policy = RetryPolicy(backoff_base=1, backoff_max=5, jitter=False)
+    assert 1 == policy.get_delay(1)
+    assert 4 == policy.get_delay(3)
+    assert 5 == policy.get_delay(10)
+
+
+def test_retry_policy_retry_after():
+    policy = RetryPolicy(backoff_max=60)
+    assert 7 == policy.get_delay(1, {"Retry-After": "7"})
+
+
+def test_requester_retries_temporary_failures():
+    requester = Requester(retry=RetryPolicy(max_attempts=3, backoff_base=0))
+    requester._session = FakeSession([503, 502, 200], content=b'{"message": "done"}')
+    response = requester.get("https://api.bintray.com/repos/uilianries")
+    assert {'error': False, 'message': 'done', 'statusCode': 200} == response
+    assert ["GET", "GET", "GET"] == requester._session.methods
+
+
+def test_requester_does_not_replay_post():
+    requester = Requester(retry=RetryPolicy(max_attempts=3, backoff_base=0))
+    requester._session = FakeSession([503, 200], content=b'{"message": "done"}')
+    error_message = ""
+    try:
+        requester.post("https://api.bintray.com/repos/uilianries/generic")
+    except Exception as error:
+        error_message = str(error)
+    assert "Could not POST (503): done" == error_message
+    assert ["POST"] == requester._session.methods
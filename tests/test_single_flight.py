@@ -0,0 +1,44 @@
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from bintray.requester import Requester
+from bintray.singleflight import SingleFlight
+from tests.conftest import FakeSession
+
+
+def test_single_flight_shares_error():
+    single_flight = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.2)
+        raise Exception("failed")
+
+    def call():
+        try:
+            single_flight.do("foo", fail)
+        except Exception as error:
+            return str(error)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(call)
+        started.wait()
+        follower = executor.submit(call)
+        assert "failed" == leader.result()
+        assert "failed" == follower.result()
+
+
+def test_requester_coalesce():
+    requester = Requester(coalesce=True)
+    requester._session = FakeSession(delay=0.2)
+    url = "https://api.bintray.com/packages/uilianries/generic/statistics"
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(lambda _: requester.get(url), range(8)))
+    assert ["GET"] == requester._session.methods
+    for response in responses:
+        assert {"name": "statistics", "error": False, "statusCode": 200} == response
+    responses[0]["name"] = "modified"
+    assert "statistics" == responses[1]["name"]
@@ -0,0 +1,167 @@
+import hashlib
+import io
+import os
+import tempfile
+import threading
+
+from bintray.bintray import Bintray
+from bintray.fake_server import FakeBintray
+from bintray.streams import Digest, ProgressMeter, ProgressReader, get_file_size, iter_progress
+from tests.conftest import FakeSession
+
+
+def test_progress_meter():
+    reports = []
+    meter = ProgressMeter(lambda sent, total, rate: reports.append((sent, total)), total=10)
+    meter.update(4)
+    meter.update(6)
+    assert [(4, 10), (10, 10)] == reports
+    assert meter.rate >= 0
+    meter.reset()
+    assert 0 == meter.transferred
+
+
+def test_progress_reader():
+    reports = []
+    meter = ProgressMeter(lambda sent, total, rate: reports.append(sent), total=7)
+    reader = ProgressReader(io.BytesIO(b"bintray"), meter, chunk_size=3)
+    assert 7 == reader.len
+    assert [b"bin", b"tra", b"y"] == list(reader)
+    assert [3, 6, 7] == reports
+    reader.seek(0)
+    assert b"bintray" == reader.read()
+    assert 7 == meter.transferred
+
+
+def test_digest():
+    digest = Digest()
+    digest.update(b"bin")
+    digest.update(b"tray")
+    assert {"sha1": hashlib.sha1(b"bintray").hexdigest(),
+            "sha256": hashlib.sha256(b"bintray").hexdigest()} == digest.hexdigests()
+    digest.reset()
+    assert hashlib.sha1(b"").hexdigest() == digest.hexdigests()["sha1"]
+
+
+def test_digest_file():
+    with tempfile.NamedTemporaryFile() as temp_fd:
+        temp_fd.write(b"bintray")
+        temp_fd.flush()
+        digest = Digest(algorithms=("sha1",))
+        digest.update_file(temp_fd.name, size=3)
+        assert {"sha1": hashlib.sha1(b"bin").hexdigest()} == digest.hexdigests()
+        digest.update_file(temp_fd.name, chunk_size=2)
+        assert {"sha1": hashlib.sha1(b"binbintray").hexdigest()} == digest.hexdigests()
+
+
+def test_progress_reader_digest():
+    digest = Digest()
+    reader = ProgressReader(io.BytesIO(b"bintray"), ProgressMeter(total=7), digest=digest)
+    reader.read(3)
+    reader.seek(0)
+    reader.read()
+    assert hashlib.sha256(b"bintray").hexdigest() == digest.hexdigests()["sha256"]
+
+
+def test_iter_progress():
+    meter = ProgressMeter(total=None)
+    assert [b"bin", b"tray"] == list(iter_progress([b"bin", b"", b"tray"], meter))
+    assert 7 == meter.transferred
+
+
+def test_get_file_size():
+    with tempfile.TemporaryFile() as temp_fd:
+        temp_fd.write(b"bintray")
+        temp_fd.flush()
+        assert 7 == get_file_size(temp_fd)
+    assert 3 == get_file_size(io.BytesIO(b"abc"))
+    assert get_file_size(iter([b"abc"])) is None
+
+
+def test_upload_stream_with_progress():
+    bintray = Bintray()
+    session = FakeSession(status_codes=(201,), content=b'{"message": "success"}')
+    bintray._requester._session = session
+    reports = []
+    callback = lambda sent, total, rate: reports.append((sent, total))
+
+    response = bintray.upload_content("uilianries", "generic", "statistics", "test", "file.txt",
+                                      io.BytesIO(b"bintray"), progress_callback=callback)
+    assert {'error': False, 'message': 'success', 'statusCode': 201} == response
+    assert (7, 7) == reports[-1]
+
+    chunks = (chunk for chunk in [b"bin", b"tray"])
+    response = bintray.upload_content("uilianries", "generic", "statistics", "test", "file.txt",
+                                      chunks, progress_callback=callback)
+    assert 201 == response["statusCode"]
+    assert (7, None) == reports[-1]
+    assert [b"bintray", b"bintray"] == session.bodies
+
+
+def test_upload_checksums():
+    bintray = Bintray()
+    bintray._requester._session = FakeSession(status_codes=(201,),
+                                              content=b'{"message": "success"}')
+    expected = {"sha1": hashlib.sha1(b"bintray").hexdigest(),
+                "sha256": hashlib.sha256(b"bintray").hexdigest()}
+
+    response = bintray.upload_content("uilianries", "generic", "statistics", "test", "file.txt",
+                                      io.BytesIO(b"bintray"), checksums=True)
+    assert expected == response["checksums"]
+
+    response = bintray.upload_content("uilianries", "generic", "statistics", "test", "file.txt",
+                                      iter([b"bin", b"tray"]), checksums=True)
+    assert expected == response["checksums"]
+
+
+def test_upload_file_object_from_offset(tmp_path):
+    body = bytes(range(70))
+    local_file_path = tmp_path / "upload.bin"
+    local_file_path.write_bytes(b"header" + body)
+    reports = []
+    with FakeBintray() as server:
+        bintray = Bintray(configuration=server.get_configuration())
+        bintray.create_package("uilianries", "generic", "statistics")
+        with open(str(local_file_path), 'rb') as local_fd:
+            local_fd.seek(6)
+            response = bintray.upload_content(
+                "uilianries", "generic", "statistics", "1.0", "file.bin", local_fd,
+                progress_callback=lambda sent, total, rate: reports.append((sent, total)),
+                checksums=True)
+        assert 201 == response["statusCode"]
+        assert hashlib.sha1(body).hexdigest() == response["checksums"]["sha1"]
+        assert (70, 70) == reports[-1]
+
+        download_path = str(tmp_path / "download.bin")
+        bintray.download_content("uilianries", "generic", "file.bin", download_path)
+        with open(download_path, 'rb') as download_fd:
+            assert body == download_fd.read()
+
+
+def test_upload_pipe_with_progress(tmp_path):
+    body = os.urandom(200000)
+    read_fd, write_fd = os.pipe()
+    writer = threading.Thread(target=lambda: _write_pipe(write_fd, body))
+    writer.start()
+    reports = []
+    with FakeBintray() as server, open(read_fd, 'rb') as pipe:
+        assert get_file_size(pipe) is None
+        bintray = Bintray(configuration=server.get_configuration())
+        bintray.create_package("uilianries", "generic", "statistics")
+        response = bintray.upload_content(
+            "uilianries", "generic", "statistics", "1.0", "file.bin", pipe,
+            progress_callback=lambda sent, total, rate: reports.append((sent, total)))
+        writer.join()
+        assert 201 == response["statusCode"]
+        assert (200000, None) == reports[-1]
+
+        download_path = str(tmp_path / "download.bin")
+        bintray.download_content("uilianries", "generic", "file.bin", download_path,
+                                 stream=True)
+        with open(download_path, 'rb') as download_fd:
+            assert body == download_fd.read()
+
+
+def _write_pipe(write_fd, content):
+    with open(write_fd, 'wb') as pipe:
+        pipe.write(content)
@@ -0,0 +1,129 @@
+import asyncio
+import time
+
+import pytest
+import requests
+
+from bintray.bintray import Bintray
+from bintray.fake_server import FakeBintray
+from bintray.ratelimit import RateLimiter
+from bintray.requester import Requester, deadline
+from bintray.retry import RetryPolicy
+
+
+def test_timeout_shortened_by_deadline():
+    requester = Requester(connect_timeout=5, read_timeout=None)
+    expires = time.monotonic() + 1
+    connect_timeout, read_timeout = requester._get_timeout(expires)
+    assert 0.9 < connect_timeout <= 1
+    assert 0.9 < read_timeout <= 1
+    assert (5, None) == requester._get_timeout()
+    with pytest.raises(requests.exceptions.Timeout):
+        requester._get_timeout(time.monotonic() - 1)
+    assert Requester(connect_timeout=None, read_timeout=None)._get_timeout() is None
+
+
+def test_nested_deadlines():
+    requester = Requester()
+    assert requester._get_expiry() is None
+    with deadline(10):
+        outer = requester._get_expiry()
+        with deadline(1):
+            assert requester._get_expiry() < outer
+        with deadline(60):
+            assert outer == requester._get_expiry()
+    assert requester._get_expiry() is None
+    assert Requester(deadline=5)._get_expiry() is not None
+
+
+def test_read_timeout():
+    with FakeBintray(latency=1) as server:
+        bintray = Bintray(configuration=server.get_configuration(read_timeout=0.1))
+        start = time.monotonic()
+        with pytest.raises(requests.exceptions.Timeout):
+            bintray.get_repository("uilianries", "generic")
+        assert time.monotonic() - start < 0.9
+
+
+def test_deadline_bounds_retries():
+    retry = RetryPolicy(max_attempts=10, backoff_base=0.2, jitter=False)
+    with FakeBintray() as server:
+        server.fail_next(503, count=10)
+        bintray = Bintray(configuration=server.get_configuration(retry=retry, deadline=0.5))
+        start = time.monotonic()
+        with pytest.raises(Exception) as error:
+            bintray.get_repository("uilianries", "generic")
+        assert "Could not GET (503)" in str(error.value)
+        assert time.monotonic() - start < 0.5
+        # Attempts at 0s and 0.2s, since waiting 0.4s more would pass the deadline
+        assert 2 == len(server.requests)
+
+
+def test_context_deadline():
+    with FakeBintray(latency=0.3) as server:
+        bintray = Bintray(configuration=server.get_configuration())
+        with deadline(0.5):
+            bintray.get_repository("uilianries", "generic")
+            with pytest.raises(requests.exceptions.Timeout):
+                bintray.get_repository("uilianries", "generic")
+
+
+def test_async_deadline():
+    pytest.importorskip("aiohttp")
+    from bintray.async_bintray import AsyncBintray
+
+    async def run(bintray):
+        async with bintray:
+            with deadline(0.2):
+                await bintray.get_repository("uilianries", "generic")
+
+    with FakeBintray(latency=1) as server:
+        bintray = AsyncBintray(configuration=server.get_configuration())
+        start = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(run(bintray))
+        assert time.monotonic() - start < 0.9
+
+
+def test_deadline_reaches_worker_threads(tmp_path):
+    with FakeBintray(latency=0.3) as server:
+        server.add_file("uilianries", "generic", "statistics", "1.0", "file.bin",
+                        b"x" * 2 * Bintray.MIN_SEGMENT_SIZE)
+        bintray = Bintray(configuration=server.get_configuration())
+        with deadline(0.45):
+            with pytest.raises(requests.exceptions.Timeout):
+                bintray.download_content("uilianries", "generic", "file.bin",
+                                         str(tmp_path / "file.bin"), segments=2)
+
+
+def test_deadline_bounds_rate_limiter():
+    with FakeBintray() as server:
+        rate_limiter = RateLimiter(rate=0.25, burst=1)
+        bintray = Bintray(configuration=server.get_configuration(rate_limiter=rate_limiter))
+        start = time.monotonic()
+        with deadline(0.5):
+            bintray.get_repository("uilianries", "generic")
+            with pytest.raises(requests.exceptions.Timeout):
+                bintray.get_repository("uilianries", "generic")
+        assert time.monotonic() - start < 0.5
+        assert 1 == len(server.requests)
+
+
+def test_async_deadline_bounds_rate_limiter():
+    pytest.importorskip("aiohttp")
+    from bintray.async_bintray import AsyncBintray
+
+    async def run(bintray):
+        async with bintray:
+            with deadline(0.5):
+                await bintray.get_repository("uilianries", "generic")
+                await bintray.get_repository("uilianries", "generic")
+
+    with FakeBintray() as server:
+        rate_limiter = RateLimiter(rate=0.25, burst=1)
+        bintray = AsyncBintray(configuration=server.get_configuration(rate_limiter=rate_limiter))
+        start = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(run(bintray))
+        assert time.monotonic() - start < 0.5
+        assert 1 == len(server.requests)
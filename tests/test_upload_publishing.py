@@ -1,3 +1,4 @@
+import os
 import tempfile
 
 from bintray.bintray import Bintray
@@ -65,3 +66,38 @@ def test_delete_content():
 
     response = bintray.delete_content("uilianries", "generic", "test.txt")
     assert {'error': False, 'message': 'success', 'statusCode': 200} == response
+
+
+def test_upload_content_bulk():
+    bintray = Bintray()
+    temp_dir = tempfile.mkdtemp()
+    for name in ["foo.txt", "bar.txt"]:
+        with open(os.path.join(temp_dir, name), 'w') as temp_fd:
+            temp_fd.write(name)
+    response = bintray.upload_content_bulk("uilianries", "generic", "statistics", "test",
+                                           temp_dir, remote_prefix="bulk", max_workers=2,
+                                           override=True)
+    assert ["bulk/bar.txt", "bulk/foo.txt"] == [result["remoteFilePath"]
+                                                for result in response["files"]]
+    assert 2 == response["summary"]["uploaded"]
+    assert 0 == response["summary"]["failed"]
+    assert False == response["publish"]["error"]
+
+
+def test_collect_upload_files():
+    files = Bintray._collect_upload_files([("/tmp/foo.txt", "foo.txt")], remote_prefix="/bar/")
+    assert [("/tmp/foo.txt", "bar/foo.txt")] == files
+
+
+def test_upload_content_bulk_skip_unchanged():
+    bintray = Bintray()
+    temp_dir = tempfile.mkdtemp()
+    with open(os.path.join(temp_dir, "foo.txt"), 'w') as temp_fd:
+        temp_fd.write("foo.txt")
+    bintray.upload_content_bulk("uilianries", "generic", "statistics", "test", temp_dir,
+                                remote_prefix="bulk", override=True)
+    response = bintray.upload_content_bulk("uilianries", "generic", "statistics", "test",
+                                           temp_dir, remote_prefix="bulk", override=True,
+                                           skip_unchanged=True)
+    assert 1 == response["summary"]["skipped"]
+    assert 0 == response["summary"]["uploaded"]
@@ -0,0 +1,16 @@
+import os
+import tempfile
+
+from bintray.utils import bool_to_number, remove_file
+
+
+def test_bool_to_number():
+    assert 1 == bool_to_number(True)
+    assert 0 == bool_to_number(False)
+
+
+def test_remove_file():
+    _, temp_path = tempfile.mkstemp()
+    remove_file(temp_path)
+    assert not os.path.exists(temp_path)
+    remove_file(temp_path)